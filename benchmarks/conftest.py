@@ -0,0 +1,206 @@
+"""Fixtures for benchmarking the DRS endpoints.
+
+The app is set up from the shipped configuration by
+`drs_filer.app.create_app()`, as by `init_app()`, but with its collections
+backed by `mongomock` or, if the environment variable
+`DRS_BENCHMARK_MONGO_URI` is set, by a dedicated database
+(`drsStoreBenchmark`) of a local `mongod`, which is dropped afterwards. If
+`DRS_BENCHMARK_STORAGE` is set to `sqlite`, objects and service info are
+instead stored with the embedded storage backend, in a temporary database
+file.
+
+Every benchmark round is a single request, so that the latency percentiles
+reported at the end of the session, and stored in the `extra_info` of saved
+benchmark runs, are per request.
+"""
+
+from contextlib import contextmanager
+import os
+import sys
+from typing import (Callable, Dict, Iterator, List, Optional)
+
+from connexion import App
+from foca.config.config_parser import ConfigParser
+import mongomock
+from pymongo import MongoClient
+import pytest
+
+from drs_filer.app import create_app
+
+PACKAGE_DIR = os.path.join(os.path.dirname(__file__), '..', 'drs_filer')
+BASE_PATH = '/ga4gh/drs/v1'
+DB_NAME = 'drsStoreBenchmark'
+MONGO_URI = os.environ.get('DRS_BENCHMARK_MONGO_URI')
+STORAGE = os.environ.get('DRS_BENCHMARK_STORAGE', 'mongo')
+ROUNDS = int(os.environ.get('DRS_BENCHMARK_ROUNDS', 500))
+SEED_OBJECTS = int(os.environ.get('DRS_BENCHMARK_SEED_OBJECTS', 1000))
+PERCENTILES = (50, 95, 99)
+
+# operation identifiers in the API specs are relative to the package
+# directory, from which the app is run in production
+sys.path.insert(0, PACKAGE_DIR)
+
+# latency percentiles and throughput of each benchmark, in seconds and
+# requests per second, respectively
+RESULTS: Dict[str, Dict[str, float]] = {}
+
+
+@contextmanager
+def package_dir() -> Iterator[None]:
+    """Change into the package directory, relative to which the API specs
+    are configured."""
+    cwd = os.getcwd()
+    os.chdir(PACKAGE_DIR)
+    try:
+        yield
+    finally:
+        os.chdir(cwd)
+
+
+def create_benchmark_app(db_client, spec_dir: str) -> App:
+    """Create app with the given database client.
+
+    Args:
+        db_client: `pymongo.MongoClient` or `mongomock.MongoClient`.
+        spec_dir: Directory to which modified API specs and the database
+            file of the embedded storage backend are written.
+
+    Returns:
+        Connexion app instance.
+    """
+    db_name = os.environ.get('MONGO_DBNAME')
+    os.environ['MONGO_DBNAME'] = DB_NAME
+    try:
+        with package_dir():
+            conf = ConfigParser('config.yaml', format_logs=False).config
+            for index, spec in enumerate(conf.api.specs):
+                spec.path_out = os.path.join(spec_dir, f"spec{index}.yaml")
+            if STORAGE == 'sqlite':
+                conf.storage = {
+                    'backend': 'sqlite',
+                    'sqlite': {'path': os.path.join(spec_dir, 'drs.sqlite')},
+                }
+            return create_app(conf=conf, db_client=db_client)
+    finally:
+        if db_name is None:
+            del os.environ['MONGO_DBNAME']
+        else:
+            os.environ['MONGO_DBNAME'] = db_name
+
+
+def create_object(index: int) -> Dict:
+    """Create DRS object for registration.
+
+    Args:
+        index: Number used to make the object unique.
+
+    Returns:
+        Object of type `DrsObjectRegister`, with two access methods.
+    """
+    return {
+        'name': f"benchmark_{index}.fa",
+        'size': 1024 + index,
+        'created_time': '2021-01-01T00:00:00Z',
+        'mime_type': 'text/plain',
+        'checksums': [{'type': 'md5', 'checksum': f"{index:032x}"}],
+        'access_methods': [
+            {
+                'type': scheme,
+                'access_url': {
+                    'url': f"{scheme}://example.org/benchmark_{index}.fa",
+                },
+            }
+            for scheme in ('https', 'ftp')
+        ],
+    }
+
+
+@pytest.fixture(scope='session')
+def app(tmp_path_factory) -> Iterator[App]:
+    """App backed by `mongomock` or a local `mongod`."""
+    db_client = (
+        MongoClient(MONGO_URI) if MONGO_URI else mongomock.MongoClient()
+    )
+    try:
+        yield create_benchmark_app(
+            db_client=db_client,
+            spec_dir=str(tmp_path_factory.mktemp('specs')),
+        )
+    finally:
+        if MONGO_URI:
+            db_client.drop_database(DB_NAME)
+        db_client.close()
+
+
+@pytest.fixture(scope='session')
+def client(app):
+    """Test client of the app."""
+    return app.app.test_client()
+
+
+@pytest.fixture(scope='session')
+def object_ids(client) -> List[str]:
+    """Identifiers of objects registered before the benchmarks."""
+    response = client.post(
+        f"{BASE_PATH}/bulk/objects",
+        json={'drs_objects': [create_object(i) for i in range(SEED_OBJECTS)]},
+    )
+    assert response.status_code == 200, response.get_data(as_text=True)
+    return [
+        item['object_id'] for item in response.get_json()['registered_objects']
+    ]
+
+
+@pytest.fixture
+def measure(benchmark, request) -> Callable:
+    """Benchmark a function with one request per round.
+
+    Yields a function taking the function to benchmark and, optionally, a
+    setup function returning its positional arguments; after the benchmark,
+    latency percentiles and throughput are recorded.
+    """
+    def run(
+        func: Callable,
+        setup: Optional[Callable] = None,
+    ) -> None:
+        benchmark.pedantic(
+            func,
+            setup=(lambda: (setup(), {})) if setup else None,
+            rounds=ROUNDS,
+            iterations=1,
+            warmup_rounds=min(ROUNDS, 10),
+        )
+
+    yield run
+
+    if not benchmark.stats or not benchmark.stats.stats.data:
+        return
+    data = sorted(benchmark.stats.stats.data)
+    results = {
+        f"p{percentile}": data[
+            min(len(data) - 1, int(len(data) * percentile / 100))
+        ]
+        for percentile in PERCENTILES
+    }
+    results['throughput'] = len(data) / sum(data)
+    benchmark.extra_info.update(results)
+    RESULTS[request.node.name] = results
+
+
+def pytest_terminal_summary(terminalreporter) -> None:
+    """Report latency percentiles and throughput of all benchmarks."""
+    if not RESULTS:
+        return
+    terminalreporter.section('latency percentiles (ms) and throughput (rps)')
+    width = max(len(name) for name in RESULTS)
+    columns = [f"p{percentile}" for percentile in PERCENTILES]
+    terminalreporter.write_line(
+        f"{'name':<{width}} " + ''.join(f"{c:>10}" for c in columns) +
+        f"{'rps':>10}"
+    )
+    for name, results in sorted(RESULTS.items()):
+        terminalreporter.write_line(
+            f"{name:<{width}} " +
+            ''.join(f"{results[c] * 1000:>10.3f}" for c in columns) +
+            f"{results['throughput']:>10.1f}"
+        )
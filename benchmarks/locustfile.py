@@ -0,0 +1,160 @@
+"""Load test of a running DRS-filer instance.
+
+Run, e.g., with:
+
+    locust -f benchmarks/locustfile.py --host http://localhost:8080 \
+        --headless --users 50 --spawn-rate 10 --run-time 2m \
+        --csv benchmarks/results
+
+Locust reports throughput and latency percentiles, including p50, p95 and
+p99, per endpoint. Every simulated user registers its own objects when it
+starts, so that the mix of reads, writes and deletes does not depend on
+existing data.
+"""
+
+from itertools import count
+import random
+from typing import (Dict, List)
+
+from locust import (between, HttpUser, task)
+
+BASE_PATH = '/ga4gh/drs/v1'
+SEED_OBJECTS = 20
+NAMES = count()
+
+
+def create_object() -> Dict:
+    """Create DRS object for registration.
+
+    Returns:
+        Object of type `DrsObjectRegister`, with two access methods.
+    """
+    index = next(NAMES)
+    return {
+        'name': f"load_test_{index}.fa",
+        'size': 1024 + index,
+        'created_time': '2021-01-01T00:00:00Z',
+        'mime_type': 'text/plain',
+        'checksums': [{'type': 'md5', 'checksum': f"{index:032x}"}],
+        'access_methods': [
+            {
+                'type': scheme,
+                'access_url': {
+                    'url': f"{scheme}://example.org/load_test_{index}.fa",
+                },
+            }
+            for scheme in ('https', 'ftp')
+        ],
+    }
+
+
+class DrsUser(HttpUser):
+    """Client mostly reading objects and access URLs, and occasionally
+    registering, replacing and deleting objects."""
+
+    wait_time = between(0, 0.1)
+
+    def on_start(self) -> None:
+        """Register objects to work with."""
+        response = self.client.post(
+            f"{BASE_PATH}/bulk/objects",
+            json={'drs_objects': [
+                create_object() for __ in range(SEED_OBJECTS)
+            ]},
+            name='PostBulkObjects',
+        )
+        self.objects: List[Dict] = [
+            self.get_object(item['object_id'])
+            for item in response.json()['registered_objects']
+        ]
+
+    def get_object(self, object_id: str) -> Dict:
+        """Get DRS object."""
+        return self.client.get(
+            f"{BASE_PATH}/objects/{object_id}",
+            name='GetObject',
+        ).json()
+
+    @task(20)
+    def get_random_object(self) -> None:
+        """Get one of the user's objects."""
+        self.get_object(random.choice(self.objects)['id'])
+
+    @task(10)
+    def get_access_url(self) -> None:
+        """Get access URL of one of the user's objects."""
+        obj = random.choice(self.objects)
+        self.client.get(
+            f"{BASE_PATH}/objects/{obj['id']}/access/"
+            f"{obj['access_methods'][0]['access_id']}",
+            name='GetAccessURL',
+        )
+
+    @task(2)
+    def get_bulk_access_urls(self) -> None:
+        """Get access URLs of all of the user's objects."""
+        self.client.post(
+            f"{BASE_PATH}/bulk/objects/access",
+            json={'bulk_access_ids': [
+                {
+                    'object_id': obj['id'],
+                    'access_id': obj['access_methods'][0]['access_id'],
+                }
+                for obj in self.objects
+            ]},
+            name='GetBulkAccessURLs',
+        )
+
+    @task(5)
+    def get_service_info(self) -> None:
+        """Get service info."""
+        self.client.get(f"{BASE_PATH}/service-info", name='getServiceInfo')
+
+    @task(2)
+    def post_object(self) -> None:
+        """Register object."""
+        self.client.post(
+            f"{BASE_PATH}/objects",
+            json=create_object(),
+            name='PostObject',
+        )
+
+    @task(2)
+    def put_object(self) -> None:
+        """Replace one of the user's objects."""
+        index = random.randrange(len(self.objects))
+        object_id = self.objects[index]['id']
+        self.client.put(
+            f"{BASE_PATH}/objects/{object_id}",
+            json=create_object(),
+            name='PutObject',
+        )
+        self.objects[index] = self.get_object(object_id)
+
+    @task(1)
+    def delete_access_method(self) -> None:
+        """Delete an access method of a new object."""
+        obj = self.register()
+        self.client.delete(
+            f"{BASE_PATH}/objects/{obj['id']}/access/"
+            f"{obj['access_methods'][0]['access_id']}",
+            name='DeleteAccessMethod',
+        )
+
+    @task(1)
+    def delete_object(self) -> None:
+        """Delete a new object."""
+        obj = self.register()
+        self.client.delete(
+            f"{BASE_PATH}/objects/{obj['id']}",
+            name='DeleteObject',
+        )
+
+    def register(self) -> Dict:
+        """Register object and get it."""
+        object_id = self.client.post(
+            f"{BASE_PATH}/objects",
+            json=create_object(),
+            name='PostObject',
+        ).json()
+        return self.get_object(object_id)
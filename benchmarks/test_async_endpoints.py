@@ -0,0 +1,104 @@
+"""Benchmarks of the read endpoints in the asynchronous serving mode.
+
+Motor cannot be backed by `mongomock`; the benchmarks are therefore skipped
+unless `DRS_BENCHMARK_MONGO_URI` is set and objects are stored in MongoDB.
+Compare their results with those of the same endpoints in
+`test_endpoints.py`.
+"""
+
+import asyncio
+from itertools import cycle
+import os
+from typing import (Dict, Iterator, List, Tuple)
+
+import pytest
+
+from conftest import (BASE_PATH, DB_NAME, MONGO_URI, STORAGE)
+from drs_filer.asgi import ASGIApp
+
+motor_asyncio = pytest.importorskip('motor.motor_asyncio')
+
+pytestmark = pytest.mark.skipif(
+    not MONGO_URI or STORAGE != 'mongo',
+    reason="requires DRS_BENCHMARK_MONGO_URI and MongoDB storage",
+)
+
+
+@pytest.fixture(scope='module')
+def loop() -> Iterator[asyncio.AbstractEventLoop]:
+    """Event loop on which requests are served."""
+    loop = asyncio.new_event_loop()
+    asyncio.set_event_loop(loop)
+    yield loop
+    loop.close()
+    asyncio.set_event_loop(None)
+
+
+@pytest.fixture(scope='module')
+def asgi_app(app, loop) -> Iterator[ASGIApp]:
+    """ASGI app with an asynchronous client of the benchmark database."""
+    db_name = os.environ.get('MONGO_DBNAME')
+    os.environ['MONGO_DBNAME'] = DB_NAME
+    client = motor_asyncio.AsyncIOMotorClient(MONGO_URI, io_loop=loop)
+    app.app.extensions['drs_filer_motor_client'] = client
+    yield ASGIApp(app=app)
+    app.app.extensions.pop('drs_filer_motor_client')
+    client.close()
+    if db_name is None:
+        del os.environ['MONGO_DBNAME']
+    else:
+        os.environ['MONGO_DBNAME'] = db_name
+
+
+def call(
+    asgi_app: ASGIApp,
+    loop: asyncio.AbstractEventLoop,
+    path: str,
+) -> Tuple[int, bytes]:
+    """Send `GET` request and check its status code."""
+    messages: List[Dict] = []
+
+    async def receive() -> Dict:
+        return {'type': 'http.request', 'body': b'', 'more_body': False}
+
+    async def send(message: Dict) -> None:
+        messages.append(message)
+
+    loop.run_until_complete(asgi_app(
+        {
+            'type': 'http',
+            'http_version': '1.1',
+            'method': 'GET',
+            'path': f"{BASE_PATH}{path}",
+            'query_string': b'',
+            'headers': [(b'host', b'localhost')],
+        },
+        receive,
+        send,
+    ))
+    assert messages[0]['status'] == 200, messages
+    return messages[0]['status'], messages[1]['body']
+
+
+def test_get_object_async(asgi_app, loop, object_ids, measure):
+    """Benchmark asynchronous `GetObject`."""
+    ids = cycle(object_ids)
+    measure(lambda: call(asgi_app, loop, f"/objects/{next(ids)}"))
+
+
+def test_get_access_url_async(asgi_app, loop, client, object_ids, measure):
+    """Benchmark asynchronous `GetAccessURL`."""
+    paths = cycle([
+        f"/objects/{obj['id']}/access/"
+        f"{obj['access_methods'][0]['access_id']}"
+        for obj in (
+            client.get(f"{BASE_PATH}/objects/{object_id}").get_json()
+            for object_id in object_ids[:100]
+        )
+    ])
+    measure(lambda: call(asgi_app, loop, next(paths)))
+
+
+def test_get_service_info_async(asgi_app, loop, measure):
+    """Benchmark asynchronous `getServiceInfo`."""
+    measure(lambda: call(asgi_app, loop, '/service-info'))
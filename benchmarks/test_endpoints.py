@@ -0,0 +1,122 @@
+"""Benchmarks of the DRS endpoints."""
+
+from itertools import (count, cycle)
+from typing import (Dict, Tuple)
+
+from conftest import (BASE_PATH, create_object)
+
+NAMES = count()
+
+
+def call(client, method: str, path: str, status: int = 200, **kwargs):
+    """Send request and check its status code."""
+    response = getattr(client, method)(f"{BASE_PATH}{path}", **kwargs)
+    assert response.status_code == status, response.get_data(as_text=True)
+    return response
+
+
+def register(client) -> Dict:
+    """Register new object and return it."""
+    object_id = call(
+        client, 'post', '/objects', json=create_object(next(NAMES)),
+    ).get_json()
+    return call(client, 'get', f"/objects/{object_id}").get_json()
+
+
+def test_get_object(client, object_ids, measure):
+    """Benchmark `GetObject`."""
+    ids = cycle(object_ids)
+    measure(lambda: call(client, 'get', f"/objects/{next(ids)}"))
+
+
+def test_get_access_url(client, object_ids, measure):
+    """Benchmark `GetAccessURL`."""
+    objs = cycle([
+        call(client, 'get', f"/objects/{object_id}").get_json()
+        for object_id in object_ids[:100]
+    ])
+
+    def setup() -> Tuple[str]:
+        obj = next(objs)
+        return (
+            f"/objects/{obj['id']}/access/"
+            f"{obj['access_methods'][0]['access_id']}",
+        )
+
+    measure(lambda path: call(client, 'get', path), setup=setup)
+
+
+def test_get_bulk_access_urls(client, object_ids, measure):
+    """Benchmark `GetBulkAccessURLs`, resolving an access URL of each of up
+    to 100 objects."""
+    data = {
+        'bulk_access_ids': [
+            {'object_id': object_id} for object_id in object_ids[:100]
+        ],
+    }
+    measure(lambda: call(client, 'post', '/bulk/objects/access', json=data))
+
+
+def test_get_service_info(client, measure):
+    """Benchmark `getServiceInfo`."""
+    measure(lambda: call(client, 'get', '/service-info'))
+
+
+def test_list_objects(client, object_ids, measure):
+    """Benchmark `ListObjects`, paging through all objects repeatedly."""
+    page_token = [None]
+
+    def list_page() -> None:
+        query = '?page_size=10'
+        if page_token[0] is not None:
+            query += f"&page_token={page_token[0]}"
+        response = call(client, 'get', f"/objects{query}").get_json()
+        page_token[0] = response.get('next_page_token')
+
+    measure(list_page)
+
+
+def test_post_object(client, measure):
+    """Benchmark `PostObject`."""
+    measure(
+        lambda obj: call(client, 'post', '/objects', json=obj),
+        setup=lambda: (create_object(next(NAMES)),),
+    )
+
+
+def test_put_object(client, object_ids, measure):
+    """Benchmark `PutObject`, replacing existing objects."""
+    ids = cycle(object_ids)
+    measure(
+        lambda object_id, obj: call(
+            client, 'put', f"/objects/{object_id}", json=obj,
+        ),
+        setup=lambda: (next(ids), create_object(next(NAMES))),
+    )
+
+
+def test_put_object_unchanged(client, measure):
+    """Benchmark `PutObject`, re-registering unchanged objects."""
+    obj = create_object(next(NAMES))
+    call(client, 'put', '/objects/unchanged', status=201, json=obj)
+    measure(lambda: call(client, 'put', '/objects/unchanged', json=obj))
+
+
+def test_delete_object(client, measure):
+    """Benchmark `DeleteObject`."""
+    measure(
+        lambda object_id: call(client, 'delete', f"/objects/{object_id}"),
+        setup=lambda: (register(client)['id'],),
+    )
+
+
+def test_delete_access_method(client, measure):
+    """Benchmark `DeleteAccessMethod`."""
+    def setup() -> Tuple[str]:
+        obj = register(client)
+        return (
+            f"/objects/{obj['id']}/access/"
+            f"{obj['access_methods'][0]['access_id']}",
+        )
+
+    measure(lambda path: call(client, 'delete', path), setup=setup)
@@ -1,21 +1,115 @@
 """Main app module."""
 
 import logging
+from typing import Optional
 
-from foca.foca import foca
+from connexion import App
+from foca.api.register_openapi import register_openapi
+from foca.config.config_parser import ConfigParser
+from foca.database.register_mongodb import register_mongodb
+from foca.errors.exceptions import register_exception_handler
+from foca.factories.celery_app import create_celery_app
+from foca.factories.connexion_app import create_connexion_app
+from foca.models.config import Config
+from foca.security.cors import enable_cors
+from pymongo import MongoClient
 
+from drs_filer.database.backends import (
+    create_storage,
+    uses_mongo,
+)
+from drs_filer.database.mongo_client import create_mongo_client
+from drs_filer.database.sessions import register_sessions
+from drs_filer.ga4gh.drs.endpoints.id_generator import create_id_generators
 from drs_filer.ga4gh.drs.endpoints.service_info import RegisterServiceInfo
+from drs_filer.metrics import register_metrics
+from drs_filer.serialization import (
+    register_json_library,
+    register_response_validator,
+)
+from drs_filer.tracing import register_tracing
+from drs_filer.traffic_logging import register_traffic_logging
+from drs_filer.validation import register_request_validator
 
 logger = logging.getLogger(__name__)
 
 
-def main():
-    app = foca("config.yaml")
+def init_app() -> App:
+    """Create app from `config.yaml`, set up database client and register
+    service info.
+
+    Returns:
+        Connexion app instance.
+    """
+    return create_app(
+        conf=ConfigParser('config.yaml', format_logs=True).config,
+    )
+
+
+def create_app(
+    conf: Config,
+    db_client: Optional[MongoClient] = None,
+) -> App:
+    """Create app, set up database client and register service info.
+
+    The app is set up as by FOCA, with the additions of this service.
+
+    Args:
+        conf: App configuration, as parsed by FOCA's `ConfigParser`.
+        db_client: Database client used for all configured collections
+            instead of one created from the configuration, e.g., a
+            `mongomock.MongoClient`.
+
+    Returns:
+        Connexion app instance.
+    """
+    # validate requests with precompiled validators and validate only a
+    # sample of responses
+    register_request_validator()
+    register_response_validator()
+
+    # create app as FOCA does, using the configured JSON library; MongoDB,
+    # which FOCA connects to in order to create indexes, is only registered
+    # if data is stored there
+    app = create_connexion_app(conf)
+    app = register_exception_handler(app)
+    enable_cors(app.app)
+    if conf.api.specs:
+        app = register_openapi(app=app, specs=conf.api.specs)
+    if conf.db and db_client is None and uses_mongo(app=app.app):
+        app.app.config['FOCA'].db = register_mongodb(
+            app=app.app,
+            conf=conf.db,
+        )
+    if conf.jobs:
+        create_celery_app(app.app)
+    register_json_library(app=app.app)
+
+    # collect metrics and traces, including those of the database client
+    # created below, and log a summary of every request
+    register_metrics(app=app.app)
+    register_tracing(app=app.app)
+    register_traffic_logging(app=app.app)
+
+    # replace FOCA's database clients with a single, configurable one, unless
+    # data is stored in an embedded database
+    if uses_mongo(app=app.app):
+        create_mongo_client(app=app.app, client=db_client)
+        register_sessions(app=app.app)
+    create_storage(app=app.app)
+
+    # parse identifier character sets once and estimate collision risk
+    create_id_generators(app=app.app)
 
     # register service info
     with app.app.app_context():
         service_info = RegisterServiceInfo()
         service_info.set_service_info_from_config()
+    return app
+
+
+def main():
+    app = init_app()
     # start app
     app.run(port=app.port)
 
@@ -0,0 +1,266 @@
+"""Production server with an event loop serving read-only endpoints
+asynchronously."""
+
+from io import BytesIO
+import logging
+from time import perf_counter
+from typing import (Any, Awaitable, Callable, Dict, Tuple)
+
+from connexion import App
+from connexion.apis.flask_api import FlaskApi
+from flask import Response
+from foca.config.config_parser import ConfigParser
+from foca.models.config import Config
+from werkzeug.exceptions import HTTPException
+from werkzeug.wrappers import Request
+
+from drs_filer.app import init_app
+from drs_filer.database.backends import uses_mongo
+from drs_filer.database.motor_client import (
+    close_motor_client,
+    create_motor_client,
+)
+from drs_filer.database.sessions import TOKEN_HEADER
+from drs_filer.ga4gh.drs import async_server
+from drs_filer.metrics import (
+    clear_metrics,
+    get_exception_label,
+    get_metrics,
+)
+
+try:
+    import uvicorn
+    from uvicorn.middleware.wsgi import (build_environ, WSGIMiddleware)
+except ImportError:
+    uvicorn = None
+
+logger = logging.getLogger(__name__)
+
+# operations served by asynchronous controllers, by `operationId`
+ASYNC_CONTROLLERS: Dict[str, Callable[..., Awaitable[Tuple]]] = {
+    'GetObject': async_server.GetObject,
+    'GetAccessURL': async_server.GetAccessURL,
+    'getServiceInfo': async_server.getServiceInfo,
+}
+
+
+class ASGIApp:
+    """ASGI app serving read-only endpoints on an event loop.
+
+    `GET` requests for the operations in `ASYNC_CONTROLLERS` are served by
+    asynchronous controllers, which do not block a thread while waiting for
+    the database. All other requests, as well as requests with query
+    parameters, e.g., `expand=true`, or causal consistency tokens, which need
+    features only the synchronous controllers implement, are passed to the
+    WSGI app, which runs in a pool of threads.
+
+    Asynchronous controllers read from MongoDB; with other storage backends,
+    all requests are passed to the WSGI app.
+
+    Exceptions raised by asynchronous controllers are handled by the error
+    handlers of the WSGI app, so that error responses are the same in both
+    paths. Asynchronously served requests are recorded in the app's metrics,
+    if registered, but bypass the WSGI app's request hooks, e.g., traffic
+    logging, and response validation.
+
+    Args:
+        app: Connexion app instance.
+        threads: Number of threads running the WSGI app.
+
+    Attributes:
+        application: Connexion app instance.
+        wsgi: ASGI wrapper of the WSGI app.
+        serve_async: Whether reads are served by asynchronous controllers.
+    """
+
+    def __init__(self, app: App, threads: int = 10) -> None:
+        """Class constructor.
+
+        Raises:
+            RuntimeError: Uvicorn is not installed.
+        """
+        if uvicorn is None:
+            raise RuntimeError(
+                "asynchronous serving requires Uvicorn; install "
+                "'drs-filer[asgi]'"
+            )
+        self.application = app
+        self.wsgi = WSGIMiddleware(app.app, workers=threads)
+        self.serve_async = uses_mongo(app=app.app)
+
+    async def __call__(self, scope: Dict, receive: Callable, send: Callable):
+        """Handle connection."""
+        if scope['type'] == 'lifespan':
+            await self._lifespan(receive, send)
+            return
+        if (
+            scope['type'] == 'http'
+            and self.serve_async
+            and scope['method'] == 'GET'
+            and not scope['query_string']
+        ):
+            environ = build_environ(
+                scope,
+                {'type': 'http.request', 'body': b''},
+                BytesIO(),
+            )
+            # WSGI requires the port as a string
+            environ['SERVER_PORT'] = str(environ['SERVER_PORT'])
+            request = Request(environ)
+            if TOKEN_HEADER not in request.headers:
+                try:
+                    endpoint, view_args = self.application.app.url_map. \
+                        bind_to_environ(request.environ).match()
+                except HTTPException:
+                    endpoint = None
+                operation = getattr(
+                    self.application.app.view_functions.get(endpoint),
+                    '__name__',
+                    None,
+                )
+                if operation in ASYNC_CONTROLLERS:
+                    response = await self._serve(
+                        operation=operation,
+                        request=request,
+                        view_args=view_args,
+                    )
+                    await _send_response(response, send)
+                    return
+        await self.wsgi(scope, receive, send)
+
+    async def _serve(
+        self,
+        operation: str,
+        request: Request,
+        view_args: Dict,
+    ) -> Response:
+        """Serve request with asynchronous controller."""
+        app = self.application.app
+        start = perf_counter()
+        exception = ''
+        try:
+            body, status, headers = await ASYNC_CONTROLLERS[operation](
+                app=app,
+                request=request,
+                **view_args,
+            )
+            response = Response(status=status, headers=headers)
+            if body is not None:
+                response.set_data(FlaskApi.jsonifier.dumps(body))
+                response.mimetype = 'application/json'
+        except Exception as e:
+            exception = get_exception_label(app=app, exception=e)
+            with app.request_context(request.environ):
+                response = app.make_response(app.handle_user_exception(e))
+        metrics = get_metrics(app)
+        if metrics is not None:
+            metrics.record_request(
+                operation=operation,
+                method=request.method,
+                status=response.status_code,
+                duration=perf_counter() - start,
+                exception=exception,
+            )
+            if metrics.multiprocess:
+                metrics.update(app=app)
+        return response
+
+    async def _lifespan(self, receive: Callable, send: Callable) -> None:
+        """Create and close asynchronous database client on startup and
+        shutdown, and discard shared live gauges on shutdown."""
+        while True:
+            message = await receive()
+            if message['type'] == 'lifespan.startup':
+                if not self.serve_async:
+                    await send({'type': 'lifespan.startup.complete'})
+                    continue
+                try:
+                    create_motor_client(app=self.application.app)
+                except RuntimeError as e:
+                    await send({
+                        'type': 'lifespan.startup.failed',
+                        'message': str(e),
+                    })
+                    return
+                await send({'type': 'lifespan.startup.complete'})
+            elif message['type'] == 'lifespan.shutdown':
+                close_motor_client(app=self.application.app)
+                metrics = get_metrics(self.application.app)
+                if metrics is not None:
+                    metrics.close()
+                await send({'type': 'lifespan.shutdown.complete'})
+                return
+
+
+def create_app() -> ASGIApp:
+    """Create app and wrap it for serving on an event loop.
+
+    The number of threads running the WSGI app is set via `threads` in the
+    custom `asgi` section of the app configuration.
+
+    Returns:
+        ASGI app.
+    """
+    app = init_app()
+    app.app.debug = False
+    conf = getattr(app.app.config['FOCA'], 'asgi', None) or {}
+    return ASGIApp(app=app, threads=conf.get('threads', 10))
+
+
+def get_options(conf: Config) -> Dict[str, Any]:
+    """Get server settings from app configuration.
+
+    Settings are read from the custom `asgi` section of the app
+    configuration, which takes any Uvicorn setting, e.g., `workers`; host
+    and port are taken from the `server` section.
+
+    Args:
+        conf: App configuration.
+
+    Returns:
+        Uvicorn settings.
+    """
+    options = {'host': conf.server.host, 'port': conf.server.port}
+    options.update(getattr(conf, 'asgi', None) or {})
+    options.pop('threads', None)
+    return options
+
+
+def main() -> None:
+    """Serve app with Uvicorn.
+
+    Every worker process creates its own app. Metrics shared by the workers
+    of a previous run are removed first.
+
+    Raises:
+        RuntimeError: Uvicorn is not installed.
+    """
+    if uvicorn is None:
+        raise RuntimeError(
+            "asynchronous serving requires Uvicorn; install "
+            "'drs-filer[asgi]'"
+        )
+    conf = ConfigParser('config.yaml', format_logs=False).config
+    clear_metrics()
+    uvicorn.run(
+        'drs_filer.asgi:create_app',
+        factory=True,
+        **get_options(conf=conf),
+    )
+
+
+async def _send_response(response: Response, send: Callable) -> None:
+    """Send response to client."""
+    await send({
+        'type': 'http.response.start',
+        'status': response.status_code,
+        'headers': [
+            (name.lower().encode('latin-1'), value.encode('latin-1'))
+            for name, value in response.headers.items()
+        ],
+    })
+    await send({'type': 'http.response.body', 'body': response.get_data()})
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,341 @@
+"""Command line interface for bulk import and export of DRS objects."""
+
+import argparse
+from itertools import islice
+import json
+import logging
+import os
+import sys
+from time import monotonic
+from typing import (Dict, Iterable, Iterator, List, Optional, TextIO)
+
+from flask import Flask
+from foca.config.config_parser import ConfigParser
+from foca.database.register_mongodb import register_mongodb
+from pymongo import (InsertOne, ReplaceOne)
+from pymongo.errors import BulkWriteError
+
+from drs_filer.database.backends import (
+    create_storage,
+    uses_mongo,
+)
+from drs_filer.database.mongo_client import (
+    create_mongo_client,
+    get_collection,
+)
+from drs_filer.errors.exceptions import BundleAggregatesMismatch
+from drs_filer.ga4gh.drs.endpoints.bundles import update_parent_aggregates
+from drs_filer.ga4gh.drs.endpoints.conditional import INTERNAL_FIELDS
+from drs_filer.ga4gh.drs.endpoints.id_generator import (
+    create_id_generators,
+    get_id_generator,
+)
+from drs_filer.ga4gh.drs.endpoints.register_objects import (
+    prepare_objects,
+    set_object_id,
+)
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_CONFIG = os.path.join(os.path.dirname(__file__), 'config.yaml')
+
+
+def main(args: Optional[List[str]] = None) -> None:
+    """Entry point for the `drs-filer` command.
+
+    Args:
+        args: Command line arguments. Taken from `sys.argv` if not provided.
+    """
+    parser = argparse.ArgumentParser(
+        prog='drs-filer',
+        description='Bulk import and export of DRS objects.',
+    )
+    parser.add_argument(
+        '-c', '--config',
+        default=DEFAULT_CONFIG,
+        help='path to app configuration file (default: %(default)s)',
+    )
+    parser.add_argument(
+        '-b', '--batch-size',
+        type=int,
+        default=1000,
+        help='number of objects per database round trip (default: '
+             '%(default)s)',
+    )
+    subparsers = parser.add_subparsers(dest='command')
+    subparsers.required = True
+    parser_import = subparsers.add_parser(
+        'import',
+        help='import objects from newline-delimited JSON',
+        description=(
+            'Import objects from newline-delimited JSON. Objects with an '
+            '`id` replace any existing object with the same identifier; '
+            'objects without an `id` are assigned a new identifier.'
+        ),
+    )
+    parser_import.add_argument(
+        'input',
+        nargs='?',
+        type=argparse.FileType('r'),
+        default=sys.stdin,
+        help='input file (default: standard input)',
+    )
+    parser_export = subparsers.add_parser(
+        'export',
+        help='export objects to newline-delimited JSON',
+    )
+    parser_export.add_argument(
+        'output',
+        nargs='?',
+        type=argparse.FileType('w'),
+        default=sys.stdout,
+        help='output file (default: standard output)',
+    )
+    parsed = parser.parse_args(args)
+
+    app = create_app(config=parsed.config)
+    if not uses_mongo(app=app):
+        logger.error(
+            f"{parsed.command.capitalize()} failed: only supported for "
+            "storage backend 'mongo'"
+        )
+        sys.exit(1)
+    with app.app_context():
+        try:
+            if parsed.command == 'import':
+                import_objects(
+                    stream=parsed.input,
+                    batch_size=parsed.batch_size,
+                )
+            else:
+                export_objects(
+                    stream=parsed.output,
+                    batch_size=parsed.batch_size,
+                )
+        except BundleAggregatesMismatch:
+            logger.error(
+                f"{parsed.command.capitalize()} failed: size or checksums of "
+                "a bundle do not match its contents"
+            )
+            sys.exit(1)
+        except (BulkWriteError, RuntimeError, ValueError) as e:
+            logger.error(f"{parsed.command.capitalize()} failed: {e}")
+            sys.exit(1)
+
+
+def create_app(config: str) -> Flask:
+    """Create Flask app with database access, but without API endpoints.
+
+    Args:
+        config: Path to app configuration file.
+
+    Returns:
+        Flask app.
+    """
+    conf = ConfigParser(config, format_logs=True).config
+    app = Flask(__name__)
+    app.config['FOCA'] = conf
+    app.config['FOCA'].db = register_mongodb(app=app, conf=conf.db)
+    create_mongo_client(app=app)
+    create_storage(app=app)
+    create_id_generators(app=app)
+    return app
+
+
+def import_objects(
+    stream: TextIO,
+    batch_size: int = 1000,
+) -> int:
+    """Import objects from newline-delimited JSON.
+
+    Objects are read, prepared and written in batches, so that memory usage
+    is bounded by the batch size rather than by the size of the input. Access
+    identifiers are added to access methods that do not have one yet;
+    existing access identifiers are kept, so that exported objects can be
+    imported without changes.
+
+    Args:
+        stream: Newline-delimited JSON input.
+        batch_size: Number of objects written per database round trip.
+
+    Returns:
+        Number of imported objects.
+    """
+    count = 0
+    start = monotonic()
+    for batch in batched(read_objects(stream), size=batch_size):
+        write_objects(batch)
+        count += len(batch)
+        log_progress(action='Imported', count=count, start=start)
+    logger.info(f"Import finished: {count} objects.")
+    return count
+
+
+def export_objects(
+    stream: TextIO,
+    batch_size: int = 1000,
+) -> int:
+    """Export objects to newline-delimited JSON.
+
+    Args:
+        stream: Newline-delimited JSON output.
+        batch_size: Number of objects fetched per database round trip.
+
+    Returns:
+        Number of exported objects.
+    """
+    db_collection = get_collection('objects')
+    count = 0
+    start = monotonic()
+    cursor = db_collection.find(
+        {},
+        {field: False for field in INTERNAL_FIELDS},
+    ).batch_size(batch_size)
+    for obj in cursor:
+        stream.write(json.dumps(obj) + '\n')
+        count += 1
+        if count % batch_size == 0:
+            log_progress(action='Exported', count=count, start=start)
+    stream.flush()
+    logger.info(f"Export finished: {count} objects.")
+    return count
+
+
+def read_objects(stream: TextIO) -> Iterator[Dict]:
+    """Parse newline-delimited JSON.
+
+    Args:
+        stream: Newline-delimited JSON input. Empty lines are skipped.
+
+    Yields:
+        Parsed objects.
+
+    Raises:
+        ValueError: A line is not a valid JSON object.
+    """
+    for line_number, line in enumerate(stream, start=1):
+        line = line.strip()
+        if not line:
+            continue
+        try:
+            obj = json.loads(line)
+        except ValueError as e:
+            raise ValueError(f"invalid JSON in line {line_number}: {e}")
+        if not isinstance(obj, dict):
+            raise ValueError(f"line {line_number} is not a JSON object")
+        yield obj
+
+
+def write_objects(
+    objects: List[Dict],
+    retries: int = 9,
+) -> None:
+    """Prepare objects as the API does and write them with an unordered bulk
+    write.
+
+    Objects with an identifier replace existing objects with the same
+    identifier (or are inserted if no such object exists). Objects without an
+    identifier are inserted with a generated identifier; only objects whose
+    identifier collided with an existing one are assigned a new identifier and
+    written again. Afterwards, the size and checksums of bundles containing
+    any of the objects are updated.
+
+    Args:
+        objects: Objects of type `DrsObjectRegister`, optionally with `id`
+            and access identifiers; modified in place.
+        retries: How many times should the generation of random identifiers
+            and insertion into the database be retried for objects whose
+            identifiers collided with existing ones.
+
+    Raises:
+        drs_filer.errors.exceptions.BundleAggregatesMismatch: The size or any
+            checksum supplied for a bundle does not match the one computed
+            from its contents.
+        pymongo.errors.BulkWriteError: Objects could not be written.
+        RuntimeError: No unique identifiers could be generated.
+    """
+    db_collection = get_collection('objects')
+    id_generator = get_id_generator('objects')
+
+    for obj in objects:
+        obj.pop('_id', None)
+    prepare_objects(objects=objects)
+    operations: List = []
+    for obj in objects:
+        if obj.get('id') is not None:
+            set_object_id(obj=obj, object_id=obj['id'])
+            operations.append(ReplaceOne(
+                filter={'id': obj['id']},
+                replacement=obj,
+                upsert=True,
+            ))
+    pending = [obj for obj in objects if obj.get('id') is None]
+    for i in range(retries + 1):
+        for obj, object_id in zip(
+            pending,
+            id_generator.generate(count=len(pending)),
+        ):
+            set_object_id(obj=obj, object_id=object_id)
+        offset = len(operations)
+        operations.extend(InsertOne(obj) for obj in pending)
+        try:
+            db_collection.bulk_write(operations, ordered=False)
+            update_parent_aggregates(object_ids=[obj['id'] for obj in objects])
+            return
+        except BulkWriteError as e:
+            errors = e.details['writeErrors']
+            if any(
+                error['code'] != 11000 or error['index'] < offset
+                for error in errors
+            ):
+                raise
+            pending = [pending[error['index'] - offset] for error in errors]
+            operations = []
+    raise RuntimeError(
+        f"could not generate unique identifiers for {len(pending)} objects; "
+        f"tried {retries + 1} times"
+    )
+
+
+def batched(
+    iterable: Iterable,
+    size: int,
+) -> Iterator[List]:
+    """Split iterable into lists of a given size.
+
+    Args:
+        iterable: Items to be split.
+        size: Maximum number of items per list.
+
+    Yields:
+        Lists of consecutive items; only the last list may be shorter.
+    """
+    iterator = iter(iterable)
+    while True:
+        batch = list(islice(iterator, size))
+        if not batch:
+            return
+        yield batch
+
+
+def log_progress(
+    action: str,
+    count: int,
+    start: float,
+) -> None:
+    """Log number of processed objects and throughput.
+
+    Args:
+        action: Description of what was done with the objects.
+        count: Number of processed objects.
+        start: Start time as returned by `time.monotonic()`.
+    """
+    elapsed = monotonic() - start
+    rate = count / elapsed if elapsed else float('inf')
+    logger.info(
+        f"{action} {count} objects in {elapsed:.1f}s ({rate:.0f} objects/s)."
+    )
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,92 @@
+"""Selection of the storage backend."""
+
+import logging
+from typing import (Callable, Dict, Optional)
+
+from flask import (current_app, Flask)
+
+from drs_filer.database.mongo_storage import MongoStorage
+from drs_filer.database.sqlite_storage import SQLiteStorage
+from drs_filer.database.storage import StorageBackend
+
+logger = logging.getLogger(__name__)
+
+# storage backends by name, mapped to factories taking the backend's section
+# of the `storage` configuration
+BACKENDS: Dict[str, Callable[[Dict], StorageBackend]] = {
+    'mongo': lambda conf: MongoStorage(),
+    'sqlite': lambda conf: SQLiteStorage(**conf),
+}
+
+
+def create_storage(app: Flask) -> StorageBackend:
+    """Create storage backend of an app.
+
+    The backend is selected via `backend` in the custom `storage` section of
+    the app configuration, one of `BACKENDS`, and configured via the section
+    of the same name; `mongo` is used if the section is missing.
+
+    Args:
+        app: Flask app.
+
+    Returns:
+        Storage backend.
+
+    Raises:
+        ValueError: The configured backend is not known.
+    """
+    conf = getattr(app.config['FOCA'], 'storage', None) or {}
+    name = conf.get('backend', 'mongo')
+    if name not in BACKENDS:
+        raise ValueError(
+            f"Unknown storage backend '{name}'; use one of: "
+            f"{', '.join(BACKENDS)}"
+        )
+    storage = BACKENDS[name](conf.get(name) or {})
+    app.extensions['drs_filer_storage'] = storage
+    logger.info(f"Using storage backend '{name}'.")
+    return storage
+
+
+def close_storage(app: Flask) -> None:
+    """Close storage backend created by `create_storage()`, if any.
+
+    Args:
+        app: Flask app.
+    """
+    storage = app.extensions.pop('drs_filer_storage', None)
+    if storage is not None:
+        storage.close()
+
+
+def get_storage(app: Optional[Flask] = None) -> StorageBackend:
+    """Get storage backend of an app.
+
+    Args:
+        app: Flask app; defaults to the current app.
+
+    Returns:
+        Storage backend created by `create_storage()` or, if none was
+        created, one backed by the app's MongoDB collections.
+    """
+    app = app or current_app
+    storage = app.extensions.get('drs_filer_storage')
+    if storage is None:
+        storage = app.extensions.setdefault(
+            'drs_filer_storage',
+            MongoStorage(),
+        )
+    return storage
+
+
+def uses_mongo(app: Flask) -> bool:
+    """Check whether an app stores its data in MongoDB.
+
+    Args:
+        app: Flask app.
+
+    Returns:
+        `True` if the app's storage backend is `mongo`.
+    """
+    conf = getattr(app.config['FOCA'], 'storage', None) or {}
+    return conf.get('backend', 'mongo') == 'mongo'
@@ -0,0 +1,333 @@
+"""MongoDB client handling."""
+
+import logging
+import os
+from threading import (local, Lock)
+from time import monotonic
+from typing import (Dict, List, Optional)
+
+from flask import (current_app, Flask)
+from pymongo import MongoClient
+from pymongo.collection import Collection
+from pymongo.monitoring import ConnectionPoolListener
+from pymongo.read_concern import ReadConcern
+from pymongo.read_preferences import (
+    make_read_preference,
+    ReadPreference,
+    read_pref_mode_from_name,
+)
+
+logger = logging.getLogger(__name__)
+
+
+class PoolWaitMonitor(ConnectionPoolListener):
+    """Connection pool listener recording how long requests wait for a
+    connection.
+
+    Args:
+        warning_threshold: Time in seconds; checkouts that take longer are
+            logged as warnings. `0` disables warnings.
+
+    Attributes:
+        warning_threshold: Time in seconds; checkouts that take longer are
+            logged as warnings.
+        checkouts: Number of successful connection checkouts.
+        failures: Number of failed connection checkouts, e.g., because
+            `waitQueueTimeoutMS` was exceeded.
+        wait_total: Total time in seconds spent waiting for connections.
+        wait_max: Longest time in seconds spent waiting for a connection.
+        connections: Number of currently open connections.
+    """
+
+    def __init__(self, warning_threshold: float = 0) -> None:
+        """Class constructor."""
+        self.warning_threshold = warning_threshold
+        self.checkouts = 0
+        self.failures = 0
+        self.wait_total = 0.0
+        self.wait_max = 0.0
+        self.connections = 0
+        self._lock = Lock()
+        self._local = local()
+
+    def stats(self) -> Dict:
+        """Get connection pool statistics.
+
+        Returns:
+            Number of checkouts, failed checkouts and open connections, as
+            well as total and maximum time spent waiting for connections.
+        """
+        with self._lock:
+            return {
+                'checkouts': self.checkouts,
+                'failures': self.failures,
+                'wait_total': self.wait_total,
+                'wait_max': self.wait_max,
+                'connections': self.connections,
+            }
+
+    def connection_check_out_started(self, event) -> None:
+        """Record start of checkout."""
+        self._local.start = monotonic()
+
+    def connection_checked_out(self, event) -> None:
+        """Record duration of successful checkout."""
+        wait = monotonic() - getattr(self._local, 'start', monotonic())
+        with self._lock:
+            self.checkouts += 1
+            self.wait_total += wait
+            self.wait_max = max(self.wait_max, wait)
+        if self.warning_threshold and wait > self.warning_threshold:
+            logger.warning(
+                f"Waited {wait * 1000:.0f}ms for a database connection to "
+                f"'{event.address[0]}:{event.address[1]}'."
+            )
+
+    def connection_check_out_failed(self, event) -> None:
+        """Record failed checkout."""
+        with self._lock:
+            self.failures += 1
+        logger.warning(
+            "Could not get a database connection to "
+            f"'{event.address[0]}:{event.address[1]}': {event.reason}"
+        )
+
+    def connection_created(self, event) -> None:
+        """Count opened connection."""
+        with self._lock:
+            self.connections += 1
+
+    def connection_closed(self, event) -> None:
+        """Count closed connection."""
+        with self._lock:
+            self.connections -= 1
+
+    def pool_created(self, event) -> None:
+        """Ignore event."""
+
+    def pool_cleared(self, event) -> None:
+        """Ignore event."""
+
+    def pool_closed(self, event) -> None:
+        """Ignore event."""
+
+    def connection_ready(self, event) -> None:
+        """Ignore event."""
+
+    def connection_checked_in(self, event) -> None:
+        """Ignore event."""
+
+
+def create_mongo_client(
+    app: Flask,
+    close_previous: bool = True,
+    client: Optional[MongoClient] = None,
+) -> MongoClient:
+    """Create a database client and attach it to all configured collections.
+
+    A single client, and thus a single connection pool, is shared by all
+    databases and collections configured in `db.dbs`. The client is
+    configured with the options in the custom `db_client` section of the app
+    configuration, which takes any `pymongo.MongoClient` option, e.g.,
+    `maxPoolSize`, `waitQueueTimeoutMS`, `readPreference`, `w` or
+    `compressors`; in addition, `pool_wait_warning_ms` sets the time after
+    which waiting for a connection is logged as a warning. If metrics are
+    registered for the app, the durations of database commands are recorded;
+    if tracing is registered, database commands are traced.
+    The client connects lazily, so that it can be created in a process that
+    forks afterwards.
+
+    Host, port, database names and credentials are set as for FOCA's
+    `register_mongodb()`, including the environment variable overrides.
+
+    Args:
+        app: Flask app whose configuration is updated.
+        close_previous: Whether clients attached to the configuration before
+            should be closed. Set to `False` in forked processes, which must
+            not use clients inherited from their parent.
+        client: Database client to attach instead of creating one, e.g., a
+            `mongomock.MongoClient`; the configured indexes are created, as
+            `register_mongodb()` does for the clients it creates. Neither
+            metrics nor traces are recorded for its commands.
+
+    Returns:
+        Database client.
+    """
+    conf = app.config['FOCA'].db
+    options = dict(getattr(app.config['FOCA'], 'db_client', None) or {})
+    monitor = PoolWaitMonitor(
+        warning_threshold=options.pop('pool_wait_warning_ms', 0) / 1000,
+    )
+
+    if close_previous:
+        previous = {
+            id(db_conf.client.client): db_conf.client.client
+            for db_conf in (conf.dbs or {}).values()
+            if db_conf.client is not None
+        }
+        for previous_client in previous.values():
+            if previous_client is not client:
+                previous_client.close()
+    injected = client is not None
+    if client is None:
+        listeners: List = [monitor]
+        metrics = app.extensions.get('drs_filer_metrics')
+        if metrics is not None:
+            listeners.append(metrics.command_listener)
+        tracing = app.extensions.get('drs_filer_tracing')
+        if tracing is not None:
+            listeners.append(tracing.command_listener)
+        client = MongoClient(
+            get_mongo_uri(app=app),
+            connect=False,
+            event_listeners=listeners,
+            **options,
+        )
+        app.extensions['drs_filer_pool_monitor'] = monitor
+    app.extensions['drs_filer_mongo_client'] = client
+
+    for db_name, db_conf in (conf.dbs or {}).items():
+        db_conf.client = client[os.environ.get('MONGO_DBNAME', db_name)]
+        for coll_name, coll_conf in (db_conf.collections or {}).items():
+            coll_conf.client = db_conf.client[coll_name]
+            if injected:
+                for index in coll_conf.indexes or []:
+                    coll_conf.client.create_index(
+                        index.keys,
+                        **(index.options or {}),
+                    )
+    if injected:
+        logger.info("Attached injected database client.")
+    else:
+        logger.info(
+            f"Created database client for '{_get_address(app=app)}' with "
+            f"options: {options}"
+        )
+    return client
+
+
+def get_mongo_uri(app: Flask) -> str:
+    """Get URI of the database server.
+
+    Host and port are taken from the `db` section of the app configuration
+    and credentials from environment variables, as for FOCA's
+    `register_mongodb()`; `MONGO_HOST` and `MONGO_PORT` override the
+    configured host and port.
+
+    Args:
+        app: Flask app.
+
+    Returns:
+        Database server URI.
+    """
+    auth = ''
+    user = os.environ.get('MONGO_USERNAME')
+    if user is not None and user != "":
+        auth = f"{user}:{os.environ.get('MONGO_PASSWORD')}@"
+    return f"mongodb://{auth}{_get_address(app=app)}/"
+
+
+def close_mongo_client(app: Flask) -> None:
+    """Close database client created by `create_mongo_client()`, if any.
+
+    Args:
+        app: Flask app.
+    """
+    client = app.extensions.pop('drs_filer_mongo_client', None)
+    monitor = app.extensions.pop('drs_filer_pool_monitor', None)
+    if monitor is not None:
+        logger.info(f"Database connection pool statistics: {monitor.stats()}")
+    if client is not None:
+        client.close()
+        logger.info("Closed database client.")
+
+
+def get_pool_monitor(
+    app: Optional[Flask] = None,
+) -> Optional[PoolWaitMonitor]:
+    """Get connection pool monitor of an app.
+
+    Args:
+        app: Flask app; defaults to the current app.
+
+    Returns:
+        Connection pool monitor, or `None` if the database client was not
+        created with `create_mongo_client()`.
+    """
+    app = app or current_app
+    return app.extensions.get('drs_filer_pool_monitor')
+
+
+def get_collection(
+    name: str,
+    read: bool = False,
+) -> Collection:
+    """Get client for collection of the DRS store.
+
+    Writes, and reads that writes depend on, always go to the primary. Reads
+    serving `GET` requests may instead be routed as configured in the custom
+    `db_reads` section of the app configuration: `read_preference` takes a
+    read preference mode, e.g., `secondaryPreferred`, and
+    `max_staleness_seconds` the maximum replication lag of secondaries that
+    are read from. If `causal_consistency` is set, reads use majority read
+    concern, as required for causally consistent sessions (see
+    `drs_filer.database.sessions`).
+
+    Args:
+        name: Name of the collection.
+        read: Whether the client is only used to serve reads.
+
+    Returns:
+        Collection client.
+    """
+    collection = (
+        current_app.config['FOCA'].db.dbs['drsStore'].
+        collections[name].client
+    )
+    if read:
+        options = get_read_options(app=current_app)
+        if options:
+            collection = collection.with_options(**options)
+    return collection
+
+
+def get_read_options(app: Flask) -> Dict:
+    """Get collection options for serving reads, as configured in the custom
+    `db_reads` section of the app configuration.
+
+    Args:
+        app: Flask app.
+
+    The maximum staleness only applies to modes reading from secondaries;
+    it is ignored for `primary`, which does not accept it.
+
+    Returns:
+        Read preference and read concern, to be passed to
+        `Collection.with_options()`; empty if reads are not configured.
+    """
+    conf = getattr(app.config['FOCA'], 'db_reads', None)
+    if not conf:
+        return {}
+    mode = read_pref_mode_from_name(conf.get('read_preference', 'primary'))
+    return {
+        'read_preference': make_read_preference(
+            mode,
+            None,
+            (
+                conf.get('max_staleness_seconds', -1)
+                if mode != ReadPreference.PRIMARY.mode else -1
+            ),
+        ),
+        'read_concern': (
+            ReadConcern('majority')
+            if conf.get('causal_consistency', False) else None
+        ),
+    }
+
+
+def _get_address(app: Flask) -> str:
+    """Get host and port of the database server."""
+    conf = app.config['FOCA'].db
+    host = os.environ.get('MONGO_HOST', conf.host)
+    port = os.environ.get('MONGO_PORT', conf.port)
+    return f"{host}:{port}"
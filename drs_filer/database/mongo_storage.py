@@ -0,0 +1,354 @@
+"""MongoDB storage backend."""
+
+import logging
+from typing import (Dict, Iterable, List, Optional, Tuple)
+
+from bson import ObjectId
+from pymongo.errors import (BulkWriteError, DuplicateKeyError)
+
+from drs_filer.database.mongo_client import get_collection
+from drs_filer.database.sessions import get_session
+from drs_filer.database.storage import (
+    CREATED,
+    ObjectExists,
+    REPLACED,
+    StorageBackend,
+    UNCHANGED,
+)
+from drs_filer.errors.exceptions import (
+    BadRequest,
+    InternalServerError,
+)
+from drs_filer.ga4gh.drs.endpoints.access_urls import (
+    access_methods_pipeline,
+    bulk_access_methods_pipeline,
+)
+from drs_filer.ga4gh.drs.endpoints.conditional import pop_content_hash
+
+logger = logging.getLogger(__name__)
+
+
+class MongoStorage(StorageBackend):
+    """Storage backend keeping objects and service info in the `objects`
+    and `service_info` collections of the `drsStore` database.
+
+    Collection clients are looked up for every operation, in the context of
+    the current app (see `drs_filer.database.mongo_client.get_collection`),
+    so that reads are routed as configured and operations are part of the
+    causally consistent session of the current request, if any.
+    """
+
+    def get_object(
+        self,
+        object_id: str,
+        for_update: bool = False,
+    ) -> Optional[Dict]:
+        """Get object."""
+        return get_collection('objects', read=not for_update).find_one(
+            {'id': object_id},
+            {'_id': False},
+            session=get_session(),
+        )
+
+    def get_objects(
+        self,
+        object_ids: Iterable[str],
+        for_update: bool = False,
+        fields: Optional[Iterable[str]] = None,
+    ) -> List[Dict]:
+        """Get multiple objects with a single query."""
+        projection = {'_id': False}
+        if fields is not None:
+            projection.update((field, True) for field in fields)
+        return list(get_collection('objects', read=not for_update).find(
+            {'id': {'$in': list(object_ids)}},
+            projection,
+            session=get_session(),
+        ))
+
+    def get_access_method(
+        self,
+        object_id: str,
+        access_id: str,
+    ) -> Optional[Dict]:
+        """Get object reduced to its content hash and the access methods
+        matching `access_id`; objects without stored content hash are
+        returned whole, so that it can be computed."""
+        try:
+            obj = get_collection('objects', read=True).aggregate(
+                access_methods_pipeline(
+                    object_id=object_id,
+                    access_id=access_id,
+                ),
+                session=get_session(),
+            ).next()
+        except StopIteration:
+            return None
+        if '_hash' not in obj:
+            return self.get_object(object_id)
+        return obj
+
+    def get_access_methods(
+        self,
+        object_ids: Iterable[str],
+        access_ids: Optional[Iterable[str]] = None,
+    ) -> List[Dict]:
+        """Get objects reduced to their identifiers and the access methods
+        matching `access_ids`, with a single aggregation."""
+        return list(get_collection('objects', read=True).aggregate(
+            bulk_access_methods_pipeline(
+                object_ids=object_ids,
+                access_ids=access_ids,
+            ),
+            session=get_session(),
+        ))
+
+    def get_bundles(self, object_ids: Iterable[str]) -> List[Dict]:
+        """Get bundles directly containing any of the given objects."""
+        return list(get_collection('objects').find(
+            {'contents.id': {'$in': list(object_ids)}},
+            {'_id': False},
+            session=get_session(),
+        ))
+
+    def list_objects(
+        self,
+        page_size: int,
+        page_token: Optional[str] = None,
+        name: Optional[str] = None,
+        mime_type: Optional[str] = None,
+        checksum: Optional[str] = None,
+        access_type: Optional[str] = None,
+        created_after: Optional[str] = None,
+        created_before: Optional[str] = None,
+    ) -> Tuple[List[Dict], Optional[str]]:
+        """List objects in the order of their `_id`s, which serve as page
+        tokens, so that every page is retrieved with a single index range
+        scan."""
+        query: Dict = {}
+        if page_token is not None:
+            if not ObjectId.is_valid(page_token):
+                logger.error(f"Invalid page token: '{page_token}'")
+                raise BadRequest
+            query['_id'] = {'$gt': ObjectId(page_token)}
+        if name is not None:
+            query['name'] = name
+        if mime_type is not None:
+            query['mime_type'] = mime_type
+        if checksum is not None:
+            query['checksums.checksum'] = checksum
+        if access_type is not None:
+            query['access_methods.type'] = access_type
+        if created_after is not None or created_before is not None:
+            query['created_time'] = {}
+            if created_after is not None:
+                query['created_time']['$gte'] = created_after
+            if created_before is not None:
+                query['created_time']['$lt'] = created_before
+
+        # Fetch one object more than requested to tell if there is a next
+        # page
+        objs = list(
+            get_collection('objects', read=True)
+            .find(query, session=get_session())
+            .sort('_id', 1)
+            .limit(page_size + 1)
+        )
+        next_page_token = None
+        if len(objs) > page_size:
+            objs = objs[:page_size]
+            next_page_token = str(objs[-1]['_id'])
+        for obj in objs:
+            del obj['_id']
+        return objs, next_page_token
+
+    def count_objects(self) -> int:
+        """Estimate number of objects from collection metadata."""
+        return get_collection('objects').estimated_document_count()
+
+    def insert_object(self, obj: Dict) -> None:
+        """Insert new object."""
+        try:
+            get_collection('objects').insert_one(obj, session=get_session())
+        except DuplicateKeyError:
+            raise ObjectExists
+        finally:
+            obj.pop('_id', None)
+
+    def insert_objects(self, objs: List[Dict]) -> List[int]:
+        """Insert multiple new objects with a single unordered bulk insert.
+
+        Raises:
+            drs_filer.errors.exceptions.InternalServerError: Objects could
+                not be inserted for reasons other than duplicate identifiers.
+        """
+        try:
+            get_collection('objects').insert_many(
+                objs,
+                ordered=False,
+                session=get_session(),
+            )
+            return []
+        except BulkWriteError as e:
+            errors = e.details['writeErrors']
+            if any(error['code'] != 11000 for error in errors):
+                logger.error(f"Could not insert objects: {errors}")
+                raise InternalServerError
+            return [error['index'] for error in errors]
+        finally:
+            for obj in objs:
+                obj.pop('_id', None)
+
+    def upsert_object(
+        self,
+        obj: Dict,
+        create: bool = True,
+        hashes: Optional[Iterable[str]] = None,
+    ) -> Optional[str]:
+        """Replace object or create it, with a single `find_one_and_replace`
+        that only returns the internal identifier of the replaced object.
+
+        Objects with the same registration hash are not matched, so that
+        they are not written. Upserting an object that exists but was not
+        matched fails on the unique index on `id`, without writing. Only then,
+        or if nothing was matched without `create`, the object is read to
+        find out why: it is unchanged, does not exist, does not match
+        `hashes`, has no stored content hash or was written concurrently.
+        In the last two cases, it is replaced once more, unless modified
+        since it was read.
+        """
+        query: Dict = {'id': obj['id']}
+        if obj.get('_register_hash') is not None:
+            query['_register_hash'] = {'$ne': obj['_register_hash']}
+        if hashes is not None:
+            hashes = set(hashes)
+            query['_hash'] = {'$in': list(hashes)}
+        db_collection = get_collection('objects')
+        try:
+            replaced = db_collection.find_one_and_replace(
+                filter=query,
+                replacement=obj,
+                projection={'_id': True},
+                upsert=create,
+                session=get_session(),
+            )
+            if replaced is not None:
+                return REPLACED
+            if create:
+                return CREATED
+        except DuplicateKeyError:
+            pass
+
+        # find out why the object was not matched
+        existing = db_collection.find_one(
+            {'id': obj['id']},
+            {'_id': False},
+            session=get_session(),
+        )
+        query = {'id': obj['id']}
+        if existing is not None:
+            register_hash = existing.get('_register_hash')
+            stored_hash = existing.get('_hash')
+            if hashes is not None:
+                if pop_content_hash(existing) not in hashes:
+                    return None
+                query['_hash'] = (
+                    stored_hash if stored_hash is not None
+                    else {'$exists': False}
+                )
+            if (
+                register_hash is not None
+                and register_hash == obj.get('_register_hash')
+            ):
+                return UNCHANGED
+        elif not create:
+            return None
+
+        # replace object created concurrently or without stored content hash
+        result = db_collection.replace_one(
+            filter=query,
+            replacement=obj,
+            upsert=create and '_hash' not in query,
+            session=get_session(),
+        )
+        if result.matched_count:
+            return REPLACED
+        return CREATED if result.upserted_id is not None else None
+
+    def update_object(self, object_id: str, fields: Dict) -> None:
+        """Set fields of existing object."""
+        get_collection('objects').update_one(
+            filter={'id': object_id},
+            update={
+                '$set': fields,
+                '$unset': {'_register_hash': ''},
+            },
+            session=get_session(),
+        )
+
+    def delete_object(self, object_id: str) -> bool:
+        """Delete object."""
+        result = get_collection('objects').delete_one(
+            {'id': object_id},
+            session=get_session(),
+        )
+        return bool(result.deleted_count)
+
+    def pull_access_method(self, object_id: str, access_id: str) -> bool:
+        """Remove access method from object with a single conditional
+        `update_one`.
+
+        The content hash of the object cannot be computed by the database and
+        is removed, rather than stored with a second write; readers compute
+        it from the object until the object is written again.
+        """
+        result = get_collection('objects').update_one(
+            filter={
+                'id': object_id,
+                'access_methods.access_id': access_id,
+                'access_methods.1': {'$exists': True},
+            },
+            update={
+                '$pull': {
+                    'access_methods': {'access_id': access_id},
+                },
+                '$unset': {
+                    '_hash': '',
+                    '_register_hash': '',
+                },
+            },
+            session=get_session(),
+        )
+        return bool(result.modified_count)
+
+    def get_service_info(self, for_update: bool = False) -> Optional[Dict]:
+        """Get most recently added service info."""
+        try:
+            return get_collection('service_info', read=not for_update).find(
+                {},
+                {'_id': False, '_version': False},
+                session=get_session(),
+            ).sort([('_id', -1)]).limit(1).next()
+        except StopIteration:
+            return None
+
+    def get_service_info_version(self) -> Optional[str]:
+        """Get version of most recently added service info, projected to
+        that field."""
+        data = get_collection('service_info', read=True).find_one(
+            {},
+            {'_id': False, '_version': True},
+            sort=[('_id', -1)],
+            session=get_session(),
+        )
+        return None if data is None else data.get('_version')
+
+    def upsert_service_info(self, data: Dict) -> None:
+        """Replace service info with the same identifier or add it, with a
+        unique version."""
+        get_collection('service_info').replace_one(
+            filter={'id': data['id']},
+            replacement=dict(data, _version=str(ObjectId())),
+            upsert=True,
+            session=get_session(),
+        )
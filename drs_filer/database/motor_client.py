@@ -0,0 +1,92 @@
+"""Asynchronous MongoDB client handling, for the asynchronous serving mode."""
+
+import logging
+import os
+from typing import Any
+
+from flask import Flask
+
+from drs_filer.database.mongo_client import (
+    get_mongo_uri,
+    get_read_options,
+)
+
+try:
+    from motor.motor_asyncio import AsyncIOMotorClient
+except ImportError:
+    AsyncIOMotorClient = None
+
+logger = logging.getLogger(__name__)
+
+
+def create_motor_client(app: Flask) -> Any:
+    """Create an asynchronous database client for the DRS store.
+
+    The client is configured like the one created by `create_mongo_client()`,
+    i.e., with the server address and credentials set in the `db` section of
+    the app configuration and environment variables and with the options in
+    the custom `db_client` section. If metrics are registered for the app,
+    the durations of database commands are recorded. The client is bound to
+    the event loop that is running when it is created and must only be used
+    on that loop.
+
+    Args:
+        app: Flask app.
+
+    Returns:
+        Asynchronous database client.
+
+    Raises:
+        RuntimeError: Motor is not installed.
+    """
+    if AsyncIOMotorClient is None:
+        raise RuntimeError(
+            "asynchronous serving requires Motor; install "
+            "'drs-filer[asgi]'"
+        )
+    options = dict(getattr(app.config['FOCA'], 'db_client', None) or {})
+    options.pop('pool_wait_warning_ms', None)
+    metrics = app.extensions.get('drs_filer_metrics')
+    if metrics is not None:
+        options['event_listeners'] = [metrics.command_listener]
+    client = AsyncIOMotorClient(get_mongo_uri(app=app), **options)
+    app.extensions['drs_filer_motor_client'] = client
+    logger.info("Created asynchronous database client.")
+    return client
+
+
+def close_motor_client(app: Flask) -> None:
+    """Close database client created by `create_motor_client()`, if any.
+
+    Args:
+        app: Flask app.
+    """
+    client = app.extensions.pop('drs_filer_motor_client', None)
+    if client is not None:
+        client.close()
+        logger.info("Closed asynchronous database client.")
+
+
+def get_motor_collection(app: Flask, name: str, read: bool = True) -> Any:
+    """Get asynchronous client for collection of the DRS store, for serving
+    reads.
+
+    Reads are routed as configured in the custom `db_reads` section of the
+    app configuration (see `drs_filer.database.mongo_client.get_collection`),
+    unless a cache depends on them.
+
+    Args:
+        app: Flask app.
+        name: Name of the collection.
+        read: Whether reads may be routed as configured; if not, they go to
+            the primary.
+
+    Returns:
+        Asynchronous collection client.
+    """
+    client = app.extensions['drs_filer_motor_client']
+    collection = client[os.environ.get('MONGO_DBNAME', 'drsStore')][name]
+    options = get_read_options(app=app) if read else {}
+    if options:
+        collection = collection.with_options(**options)
+    return collection
@@ -0,0 +1,135 @@
+"""Causally consistent database sessions for read-your-writes semantics."""
+
+from base64 import (urlsafe_b64decode, urlsafe_b64encode)
+import binascii
+import logging
+from typing import Optional
+
+import bson
+from bson.errors import BSONError
+from flask import (
+    current_app,
+    Flask,
+    g,
+    has_request_context,
+    request,
+    Response,
+)
+from pymongo.client_session import ClientSession
+
+from drs_filer.errors.exceptions import BadRequest
+
+logger = logging.getLogger(__name__)
+
+# header in which clients receive and pass back causal consistency tokens
+TOKEN_HEADER = 'X-Causal-Token'
+
+
+def register_sessions(app: Flask) -> None:
+    """Register request hooks handling causally consistent sessions.
+
+    Args:
+        app: Flask app.
+    """
+    app.after_request(_set_token)
+    app.teardown_request(_end_session)
+
+
+def causal_consistency_enabled() -> bool:
+    """Check whether causally consistent sessions are enabled.
+
+    Returns:
+        `True` if `causal_consistency` is set in the custom `db_reads` section
+        of the app configuration.
+    """
+    conf = getattr(current_app.config['FOCA'], 'db_reads', None) or {}
+    return bool(conf.get('causal_consistency', False))
+
+
+def read_your_writes() -> bool:
+    """Check whether the current request asks to read its earlier writes.
+
+    Caches that may hold data older than the client's earlier writes need to
+    be bypassed for such requests.
+
+    Returns:
+        `True` if causally consistent sessions are enabled and the client
+        passed a causal consistency token.
+    """
+    return (
+        has_request_context()
+        and TOKEN_HEADER in request.headers
+        and causal_consistency_enabled()
+    )
+
+
+def get_session() -> Optional[ClientSession]:
+    """Get causally consistent database session of the current request.
+
+    Each request gets its own session. If the client passes the token it
+    received with the response to an earlier request in header
+    `X-Causal-Token`, the session is advanced to the cluster and operation
+    time of that request, so that reads reflect the client's earlier writes,
+    even if they are served by a secondary or by another worker. Tokens are
+    returned with every response for which a session was used.
+
+    Returns:
+        Session, or `None` if causally consistent sessions are not enabled or
+        if called outside of a request.
+
+    Raises:
+        drs_filer.errors.exceptions.BadRequest: The token passed by the client
+            is invalid.
+    """
+    if not has_request_context() or not causal_consistency_enabled():
+        return None
+    if 'drs_filer_session' not in g:
+        client = current_app.extensions['drs_filer_mongo_client']
+        g.drs_filer_session = client.start_session(causal_consistency=True)
+        token = request.headers.get(TOKEN_HEADER)
+        if token is not None:
+            try:
+                times = bson.decode(urlsafe_b64decode(token.encode()))
+                g.drs_filer_session.advance_cluster_time(times['clusterTime'])
+                g.drs_filer_session.advance_operation_time(
+                    times['operationTime']
+                )
+            except (
+                binascii.Error, BSONError, KeyError, TypeError, ValueError
+            ):
+                logger.error(f"Invalid causal consistency token: {token}")
+                raise BadRequest
+    return g.drs_filer_session
+
+
+def _set_token(response: Response) -> Response:
+    """Add causal consistency token to response, if a session was used.
+
+    Args:
+        response: Response to current request.
+
+    Returns:
+        Response to current request.
+    """
+    session = g.get('drs_filer_session')
+    if (
+        session is not None
+        and session.cluster_time is not None
+        and session.operation_time is not None
+    ):
+        response.headers[TOKEN_HEADER] = urlsafe_b64encode(bson.encode({
+            'clusterTime': session.cluster_time,
+            'operationTime': session.operation_time,
+        })).decode()
+    return response
+
+
+def _end_session(exception: Optional[BaseException] = None) -> None:
+    """End session of current request, if any.
+
+    Args:
+        exception: Exception raised during request, if any.
+    """
+    session = g.pop('drs_filer_session', None)
+    if session is not None:
+        session.end_session()
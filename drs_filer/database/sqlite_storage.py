@@ -0,0 +1,420 @@
+"""Embedded SQLite storage backend, for single-host deployments and local
+testing."""
+
+from contextlib import contextmanager
+import json
+import logging
+import os
+import sqlite3
+from threading import (local, Lock)
+from typing import (Dict, Iterable, Iterator, List, Optional, Tuple)
+from uuid import uuid4
+
+from drs_filer.database.storage import (
+    CREATED,
+    ObjectExists,
+    REPLACED,
+    StorageBackend,
+    UNCHANGED,
+)
+from drs_filer.errors.exceptions import BadRequest
+from drs_filer.ga4gh.drs.endpoints.conditional import (
+    pop_content_hash,
+    set_content_hash,
+)
+
+logger = logging.getLogger(__name__)
+
+SCHEMA = [
+    """CREATE TABLE IF NOT EXISTS objects (
+        seq INTEGER PRIMARY KEY AUTOINCREMENT,
+        id TEXT NOT NULL UNIQUE,
+        doc TEXT NOT NULL
+    )""",
+    # direct contents of bundles, for updating the aggregates of bundles
+    # containing a modified object
+    """CREATE TABLE IF NOT EXISTS contents (
+        content_id TEXT NOT NULL,
+        bundle_id TEXT NOT NULL,
+        PRIMARY KEY (content_id, bundle_id)
+    ) WITHOUT ROWID""",
+    "CREATE INDEX IF NOT EXISTS contents_bundle ON contents (bundle_id)",
+    # filters of `ListObjects`, which pages by `seq`
+    """CREATE INDEX IF NOT EXISTS objects_name
+        ON objects (json_extract(doc, '$.name'), seq)""",
+    """CREATE INDEX IF NOT EXISTS objects_mime_type
+        ON objects (json_extract(doc, '$.mime_type'), seq)""",
+    """CREATE INDEX IF NOT EXISTS objects_created_time
+        ON objects (json_extract(doc, '$.created_time'), seq)""",
+    """CREATE TABLE IF NOT EXISTS service_info (
+        seq INTEGER PRIMARY KEY AUTOINCREMENT,
+        id TEXT NOT NULL UNIQUE,
+        doc TEXT NOT NULL
+    )""",
+]
+
+
+class SQLiteStorage(StorageBackend):
+    """Storage backend keeping objects and service info in a local SQLite
+    database file.
+
+    Objects are stored as JSON documents, keyed by their identifiers. The
+    database is run in write-ahead logging (WAL) mode, so that reads are
+    never blocked by writes, and the database file is memory-mapped, so that
+    reads are served from the page cache without copying. Every thread, in
+    every process, uses its own connection; writes of concurrent processes
+    are serialized by SQLite's file locks.
+
+    Args:
+        path: Path to the database file; created if it does not exist.
+        mmap_size: Number of bytes of the database file that are
+            memory-mapped; `0` disables memory-mapped reads.
+        timeout: Time in seconds to wait for locks held by other
+            connections before failing.
+
+    Attributes:
+        path: Path to the database file.
+        mmap_size: Number of bytes of the database file that are
+            memory-mapped.
+        timeout: Time in seconds to wait for locks held by other
+            connections.
+    """
+
+    def __init__(
+        self,
+        path: str,
+        mmap_size: int = 268435456,
+        timeout: float = 5,
+    ) -> None:
+        """Class constructor; creates the database schema if needed."""
+        self.path = path
+        self.mmap_size = mmap_size
+        self.timeout = timeout
+        self._local = local()
+        self._connections: List[Tuple[int, sqlite3.Connection]] = []
+        self._lock = Lock()
+        conn = self._connect()
+        conn.execute('PRAGMA journal_mode = WAL')
+        for statement in SCHEMA:
+            conn.execute(statement)
+        logger.info(f"Using SQLite database '{path}'.")
+
+    def get_object(
+        self,
+        object_id: str,
+        for_update: bool = False,
+    ) -> Optional[Dict]:
+        """Get object."""
+        row = self._connect().execute(
+            'SELECT doc FROM objects WHERE id = ?',
+            (object_id,),
+        ).fetchone()
+        return None if row is None else json.loads(row[0])
+
+    def get_objects(
+        self,
+        object_ids: Iterable[str],
+        for_update: bool = False,
+        fields: Optional[Iterable[str]] = None,
+    ) -> List[Dict]:
+        """Get multiple objects with a single query."""
+        objs = [
+            json.loads(doc) for doc, in self._connect().execute(
+                'SELECT doc FROM objects '
+                'WHERE id IN (SELECT value FROM json_each(?))',
+                (json.dumps(list(object_ids)),),
+            )
+        ]
+        if fields is not None:
+            objs = [
+                {field: obj[field] for field in fields if field in obj}
+                for obj in objs
+            ]
+        return objs
+
+    def get_bundles(self, object_ids: Iterable[str]) -> List[Dict]:
+        """Get bundles directly containing any of the given objects."""
+        return [
+            json.loads(doc) for doc, in self._connect().execute(
+                'SELECT doc FROM objects WHERE id IN ('
+                'SELECT bundle_id FROM contents '
+                'WHERE content_id IN (SELECT value FROM json_each(?)))',
+                (json.dumps(list(object_ids)),),
+            )
+        ]
+
+    def list_objects(
+        self,
+        page_size: int,
+        page_token: Optional[str] = None,
+        name: Optional[str] = None,
+        mime_type: Optional[str] = None,
+        checksum: Optional[str] = None,
+        access_type: Optional[str] = None,
+        created_after: Optional[str] = None,
+        created_before: Optional[str] = None,
+    ) -> Tuple[List[Dict], Optional[str]]:
+        """List objects in insertion order; page tokens are the sequence
+        numbers of the last objects of pages."""
+        conditions = []
+        params: List = []
+        if page_token is not None:
+            if not page_token.isdigit():
+                logger.error(f"Invalid page token: '{page_token}'")
+                raise BadRequest
+            conditions.append('seq > ?')
+            params.append(int(page_token))
+        if name is not None:
+            conditions.append("json_extract(doc, '$.name') = ?")
+            params.append(name)
+        if mime_type is not None:
+            conditions.append("json_extract(doc, '$.mime_type') = ?")
+            params.append(mime_type)
+        if checksum is not None:
+            conditions.append(
+                "EXISTS (SELECT 1 FROM json_each(doc, '$.checksums') "
+                "WHERE json_extract(value, '$.checksum') = ?)"
+            )
+            params.append(checksum)
+        if access_type is not None:
+            conditions.append(
+                "EXISTS (SELECT 1 FROM json_each(doc, '$.access_methods') "
+                "WHERE json_extract(value, '$.type') = ?)"
+            )
+            params.append(access_type)
+        if created_after is not None:
+            conditions.append("json_extract(doc, '$.created_time') >= ?")
+            params.append(created_after)
+        if created_before is not None:
+            conditions.append("json_extract(doc, '$.created_time') < ?")
+            params.append(created_before)
+        where = f"WHERE {' AND '.join(conditions)} " if conditions else ''
+
+        # Fetch one object more than requested to tell if there is a next
+        # page
+        rows = self._connect().execute(
+            f'SELECT seq, doc FROM objects {where}ORDER BY seq LIMIT ?',
+            params + [page_size + 1],
+        ).fetchall()
+        next_page_token = None
+        if len(rows) > page_size:
+            rows = rows[:page_size]
+            next_page_token = str(rows[-1][0])
+        return [json.loads(doc) for __, doc in rows], next_page_token
+
+    def count_objects(self) -> int:
+        """Count objects."""
+        return self._connect().execute(
+            'SELECT count(*) FROM objects'
+        ).fetchone()[0]
+
+    def insert_object(self, obj: Dict) -> None:
+        """Insert new object."""
+        with self._transaction() as conn:
+            if not self._insert(conn=conn, obj=obj):
+                raise ObjectExists
+
+    def insert_objects(self, objs: List[Dict]) -> List[int]:
+        """Insert multiple new objects in a single transaction."""
+        with self._transaction() as conn:
+            return [
+                index for index, obj in enumerate(objs)
+                if not self._insert(conn=conn, obj=obj)
+            ]
+
+    def upsert_object(
+        self,
+        obj: Dict,
+        create: bool = True,
+        hashes: Optional[Iterable[str]] = None,
+    ) -> Optional[str]:
+        """Replace object or create it, in a single transaction."""
+        with self._transaction() as conn:
+            row = conn.execute(
+                'SELECT doc FROM objects WHERE id = ?',
+                (obj['id'],),
+            ).fetchone()
+            if row is None:
+                if not create:
+                    return None
+                self._insert(conn=conn, obj=obj)
+                return CREATED
+            existing = json.loads(row[0])
+            register_hash = existing.get('_register_hash')
+            if hashes is not None and pop_content_hash(
+                existing
+            ) not in set(hashes):
+                return None
+            if (
+                register_hash is not None
+                and register_hash == obj.get('_register_hash')
+            ):
+                return UNCHANGED
+            self._update(conn=conn, obj=obj)
+            return REPLACED
+
+    def update_object(self, object_id: str, fields: Dict) -> None:
+        """Set fields of existing object, in a single transaction."""
+        with self._transaction() as conn:
+            row = conn.execute(
+                'SELECT doc FROM objects WHERE id = ?',
+                (object_id,),
+            ).fetchone()
+            if row is not None:
+                obj = json.loads(row[0])
+                obj.update(fields)
+                obj.pop('_register_hash', None)
+                self._update(conn=conn, obj=obj)
+
+    def delete_object(self, object_id: str) -> bool:
+        """Delete object."""
+        with self._transaction() as conn:
+            conn.execute(
+                'DELETE FROM contents WHERE bundle_id = ?',
+                (object_id,),
+            )
+            return conn.execute(
+                'DELETE FROM objects WHERE id = ?',
+                (object_id,),
+            ).rowcount > 0
+
+    def pull_access_method(self, object_id: str, access_id: str) -> bool:
+        """Remove access method from object and update its content hash, in
+        a single transaction."""
+        with self._transaction() as conn:
+            row = conn.execute(
+                'SELECT doc FROM objects WHERE id = ?',
+                (object_id,),
+            ).fetchone()
+            if row is None:
+                return False
+            obj = json.loads(row[0])
+            access_methods = [
+                method for method in obj.get('access_methods', [])
+                if method.get('access_id') != access_id
+            ]
+            if (
+                not access_methods
+                or len(access_methods) == len(obj.get('access_methods', []))
+            ):
+                return False
+            obj['access_methods'] = access_methods
+            obj.pop('_register_hash', None)
+            set_content_hash(obj)
+            self._update(conn=conn, obj=obj)
+            return True
+
+    def get_service_info(self, for_update: bool = False) -> Optional[Dict]:
+        """Get most recently added service info."""
+        row = self._connect().execute(
+            'SELECT doc FROM service_info ORDER BY seq DESC LIMIT 1'
+        ).fetchone()
+        if row is None:
+            return None
+        data = json.loads(row[0])
+        data.pop('_version', None)
+        return data
+
+    def get_service_info_version(self) -> Optional[str]:
+        """Get version of most recently added service info."""
+        row = self._connect().execute(
+            "SELECT json_extract(doc, '$._version') FROM service_info "
+            'ORDER BY seq DESC LIMIT 1'
+        ).fetchone()
+        return None if row is None else row[0]
+
+    def upsert_service_info(self, data: Dict) -> None:
+        """Replace service info with the same identifier or add it, with a
+        unique version."""
+        doc = json.dumps(dict(data, _version=uuid4().hex))
+        with self._transaction() as conn:
+            updated = conn.execute(
+                'UPDATE service_info SET doc = ? WHERE id = ?',
+                (doc, data['id']),
+            ).rowcount > 0
+            if not updated:
+                conn.execute(
+                    'INSERT INTO service_info (id, doc) VALUES (?, ?)',
+                    (data['id'], doc),
+                )
+
+    def close(self) -> None:
+        """Close all connections opened by the current process."""
+        with self._lock:
+            connections = self._connections
+            self._connections = []
+        for pid, conn in connections:
+            if pid == os.getpid():
+                conn.close()
+        self._local = local()
+
+    def _connect(self) -> sqlite3.Connection:
+        """Get connection of the current thread, opening it on first use.
+
+        Connections are not reused across forks.
+        """
+        conn = getattr(self._local, 'connection', None)
+        if conn is None or self._local.pid != os.getpid():
+            conn = sqlite3.connect(
+                self.path,
+                timeout=self.timeout,
+                isolation_level=None,
+            )
+            conn.execute(f'PRAGMA mmap_size = {int(self.mmap_size)}')
+            # durable across application crashes; in WAL mode, only a power
+            # loss may roll back the most recent transactions
+            conn.execute('PRAGMA synchronous = NORMAL')
+            self._local.connection = conn
+            self._local.pid = os.getpid()
+            with self._lock:
+                self._connections.append((os.getpid(), conn))
+        return conn
+
+    @contextmanager
+    def _transaction(self) -> Iterator[sqlite3.Connection]:
+        """Run statements in a write transaction."""
+        conn = self._connect()
+        conn.execute('BEGIN IMMEDIATE')
+        try:
+            yield conn
+        except BaseException:
+            conn.execute('ROLLBACK')
+            raise
+        conn.execute('COMMIT')
+
+    @staticmethod
+    def _insert(conn: sqlite3.Connection, obj: Dict) -> bool:
+        """Insert object unless its identifier exists already.
+
+        Returns:
+            Whether the object was inserted.
+        """
+        inserted = conn.execute(
+            'INSERT OR IGNORE INTO objects (id, doc) VALUES (?, ?)',
+            (obj['id'], json.dumps(obj)),
+        ).rowcount > 0
+        if inserted:
+            SQLiteStorage._set_contents(conn=conn, obj=obj)
+        return inserted
+
+    @staticmethod
+    def _update(conn: sqlite3.Connection, obj: Dict) -> None:
+        """Replace existing object."""
+        conn.execute(
+            'UPDATE objects SET doc = ? WHERE id = ?',
+            (json.dumps(obj), obj['id']),
+        )
+        conn.execute('DELETE FROM contents WHERE bundle_id = ?', (obj['id'],))
+        SQLiteStorage._set_contents(conn=conn, obj=obj)
+
+    @staticmethod
+    def _set_contents(conn: sqlite3.Connection, obj: Dict) -> None:
+        """Record direct contents of bundle."""
+        conn.executemany(
+            'INSERT OR IGNORE INTO contents (content_id, bundle_id) '
+            'VALUES (?, ?)',
+            [
+                (item['id'], obj['id']) for item in obj.get('contents', [])
+                if 'id' in item
+            ],
+        )
@@ -0,0 +1,285 @@
+"""Interface of storage backends for DRS objects and service info."""
+
+from abc import (ABC, abstractmethod)
+import logging
+from typing import (Dict, Iterable, List, Optional, Tuple)
+
+from drs_filer.ga4gh.drs.endpoints.conditional import compute_etag
+
+logger = logging.getLogger(__name__)
+
+# outcomes of `StorageBackend.upsert_object()`
+CREATED = 'created'
+REPLACED = 'replaced'
+UNCHANGED = 'unchanged'
+
+
+class ObjectExists(Exception):
+    """An object with the same identifier exists already."""
+
+
+class StorageBackend(ABC):
+    """Storage backend for DRS objects and service info.
+
+    Objects are stored as passed, including their content hash (`_hash`) and
+    registration hash (`_register_hash`), if any, and returned as stored;
+    internal identifiers of the backend are never returned. Writes other
+    than `insert_object()`, `insert_objects()` and `upsert_object()` remove
+    the registration hash, as the object is no longer as registered.
+
+    Reads take `for_update` to indicate that a write, or a cache that must
+    not be older than the writes of the current process, depends on the
+    result, in which case backends that replicate must not serve the read
+    from a replica that may lag behind.
+    """
+
+    @abstractmethod
+    def get_object(
+        self,
+        object_id: str,
+        for_update: bool = False,
+    ) -> Optional[Dict]:
+        """Get object.
+
+        Args:
+            object_id: Object identifier.
+            for_update: Whether a write or a cache depends on the result.
+
+        Returns:
+            Object, or `None` if it does not exist.
+        """
+
+    @abstractmethod
+    def get_objects(
+        self,
+        object_ids: Iterable[str],
+        for_update: bool = False,
+        fields: Optional[Iterable[str]] = None,
+    ) -> List[Dict]:
+        """Get multiple objects.
+
+        Args:
+            object_ids: Object identifiers.
+            for_update: Whether a write or a cache depends on the result.
+            fields: If given, objects are reduced to these top-level fields.
+
+        Returns:
+            Found objects, in no particular order.
+        """
+
+    def get_access_method(
+        self,
+        object_id: str,
+        access_id: str,
+    ) -> Optional[Dict]:
+        """Get object for resolving one of its access methods.
+
+        Backends may return only the access methods matching `access_id`;
+        by default, the whole object is returned.
+
+        Args:
+            object_id: Object identifier.
+            access_id: Access method identifier.
+
+        Returns:
+            Object, including at least its content hash and matching access
+            methods, or `None` if it does not exist.
+        """
+        return self.get_object(object_id)
+
+    def get_access_methods(
+        self,
+        object_ids: Iterable[str],
+        access_ids: Optional[Iterable[str]] = None,
+    ) -> List[Dict]:
+        """Get multiple objects for resolving their access methods.
+
+        By default, objects are reduced to their identifiers and all their
+        access methods; backends may leave out access methods not matching
+        `access_ids`.
+
+        Args:
+            object_ids: Object identifiers.
+            access_ids: If given, access methods not having any of these
+                identifiers may be left out.
+
+        Returns:
+            Found objects, reduced to their identifiers and access methods,
+            in no particular order.
+        """
+        return self.get_objects(object_ids, fields=['id', 'access_methods'])
+
+    @abstractmethod
+    def get_bundles(self, object_ids: Iterable[str]) -> List[Dict]:
+        """Get bundles directly containing any of the given objects.
+
+        Args:
+            object_ids: Object identifiers.
+
+        Returns:
+            Found bundles, in no particular order.
+        """
+
+    @abstractmethod
+    def list_objects(
+        self,
+        page_size: int,
+        page_token: Optional[str] = None,
+        name: Optional[str] = None,
+        mime_type: Optional[str] = None,
+        checksum: Optional[str] = None,
+        access_type: Optional[str] = None,
+        created_after: Optional[str] = None,
+        created_before: Optional[str] = None,
+    ) -> Tuple[List[Dict], Optional[str]]:
+        """List objects matching all given filters, in a stable order.
+
+        See `drs_filer.ga4gh.drs.endpoints.list_objects.list_objects()` for
+        the filters.
+
+        Args:
+            page_size: Maximum number of objects per page.
+            page_token: Token returned with the previous page, if any.
+
+        Returns:
+            Page of found objects and the token of the next page, or `None`
+            if this is the last page.
+
+        Raises:
+            drs_filer.errors.exceptions.BadRequest: The page token is
+                invalid.
+        """
+
+    @abstractmethod
+    def count_objects(self) -> int:
+        """Count objects, possibly estimating.
+
+        Returns:
+            Number of objects.
+        """
+
+    @abstractmethod
+    def insert_object(self, obj: Dict) -> None:
+        """Insert new object.
+
+        Args:
+            obj: Object.
+
+        Raises:
+            ObjectExists: An object with the same identifier exists.
+        """
+
+    @abstractmethod
+    def insert_objects(self, objs: List[Dict]) -> List[int]:
+        """Insert multiple new objects.
+
+        Objects whose identifiers exist already are skipped; all others are
+        inserted.
+
+        Args:
+            objs: Objects.
+
+        Returns:
+            Positions of skipped objects in `objs`.
+        """
+
+    @abstractmethod
+    def upsert_object(
+        self,
+        obj: Dict,
+        create: bool = True,
+        hashes: Optional[Iterable[str]] = None,
+    ) -> Optional[str]:
+        """Replace object or, if it does not exist, create it.
+
+        An existing object with the same registration hash as `obj` is left
+        untouched, without any write.
+
+        Args:
+            obj: Object.
+            create: Whether the object is created if it does not exist.
+            hashes: If given, the existing object is only replaced if its
+                content hash is one of them; for objects without a stored
+                content hash, it is computed.
+
+        Returns:
+            `REPLACED` if an existing object was replaced, `UNCHANGED` if it
+            was left untouched, `CREATED` if the object was created, and
+            `None` if neither, i.e., if it does not exist and `create` is not
+            set, or if it does not match `hashes`.
+        """
+
+    @abstractmethod
+    def update_object(self, object_id: str, fields: Dict) -> None:
+        """Set fields of existing object.
+
+        Args:
+            object_id: Object identifier.
+            fields: Top-level fields to set.
+        """
+
+    @abstractmethod
+    def delete_object(self, object_id: str) -> bool:
+        """Delete object.
+
+        Args:
+            object_id: Object identifier.
+
+        Returns:
+            Whether the object existed.
+        """
+
+    @abstractmethod
+    def pull_access_method(self, object_id: str, access_id: str) -> bool:
+        """Remove access method from object, unless it is the object's only
+        access method, in a single atomic operation.
+
+        The stored content hash of the object is updated or, if the backend
+        cannot compute it, removed, in which case readers compute it.
+
+        Args:
+            object_id: Object identifier.
+            access_id: Access method identifier.
+
+        Returns:
+            Whether the access method was removed; `False` if the object
+            does not exist, does not have the access method, or has no other
+            access method.
+        """
+
+    @abstractmethod
+    def get_service_info(self, for_update: bool = False) -> Optional[Dict]:
+        """Get latest service info.
+
+        Args:
+            for_update: Whether a write depends on the result.
+
+        Returns:
+            Service info, or `None` if none was registered.
+        """
+
+    def get_service_info_version(self) -> Optional[str]:
+        """Get version of latest service info.
+
+        The version changes with every write of service info, so that
+        processes caching it can check whether it changed. By default, it is
+        the entity tag of the service info; backends may store a version
+        with every write instead, so that it can be read without reading the
+        whole document.
+
+        Returns:
+            Version, or `None` if no service info was registered.
+        """
+        data = self.get_service_info()
+        return None if data is None else compute_etag(data)
+
+    @abstractmethod
+    def upsert_service_info(self, data: Dict) -> None:
+        """Replace service info with the same identifier or add it.
+
+        Args:
+            data: Service info.
+        """
+
+    def close(self) -> None:
+        """Release resources held by the backend."""
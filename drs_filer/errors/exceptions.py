@@ -9,6 +9,7 @@ from werkzeug.exceptions import (
     BadRequest,
     InternalServerError,
     NotFound,
+    PreconditionFailed,
 )
 
 
@@ -18,6 +19,18 @@ class AccessMethodNotFound(NotFound):
     pass
 
 
+class BundleAggregatesMismatch(BadRequest):
+    """Raised when the size or checksums supplied for a bundle do not match
+    those computed from its contents."""
+    pass
+
+
+class BundleTooDeep(BadRequest):
+    """Raised when a bundle is nested too deeply or has too many contents
+    to be expanded."""
+    pass
+
+
 class ObjectNotFound(NotFound):
     """Raised when object with given object identifier was not found."""
     pass
@@ -65,6 +78,20 @@ exceptions = {
         "msg": "The requested access method wasn't found.",
         "status_code": '404',
     },
+    BundleAggregatesMismatch: {
+        "msg": "The size or checksums of the bundle do not match its "
+               "contents.",
+        "status_code": '400',
+    },
+    BundleTooDeep: {
+        "msg": "The requested bundle is nested too deeply or has too many "
+               "contents to be expanded.",
+        "status_code": '400',
+    },
+    PreconditionFailed: {
+        "msg": "The `DrsObject` was changed or does not exist.",
+        "status_code": '412',
+    },
     ObjectNotFound: {
         "msg": "The requested `DrsObject` wasn't found.",
         "status_code": '404',
@@ -0,0 +1,174 @@
+"""Asynchronous controllers for read-only DRS endpoints.
+
+The controllers mirror their synchronous counterparts in
+`drs_filer.ga4gh.drs.server`, but run as coroutines on an event loop and read
+from the database with an asynchronous client. Flask's request and app
+contexts are thread-local and thus not safe to use across `await`s; the app
+and request are therefore passed explicitly.
+"""
+
+import logging
+from typing import (Dict, Optional, Tuple)
+
+from flask import Flask
+from werkzeug.wrappers import Request
+
+from drs_filer.database.motor_client import get_motor_collection
+from drs_filer.errors.exceptions import (
+    NotFound,
+    ObjectNotFound,
+)
+from drs_filer.ga4gh.drs.endpoints.access_urls import (
+    access_methods_pipeline,
+    select_access_url,
+)
+from drs_filer.ga4gh.drs.endpoints.conditional import (
+    compute_etag,
+    etag_header,
+    not_modified,
+    pop_content_hash,
+)
+from drs_filer.ga4gh.drs.endpoints.object_cache import get_object_cache
+from drs_filer.ga4gh.drs.endpoints.service_info import (
+    CACHE_KEY,
+    get_service_info_cache,
+)
+
+logger = logging.getLogger(__name__)
+
+
+async def GetObject(
+    app: Flask,
+    request: Request,
+    object_id: str,
+) -> Tuple[Optional[Dict], int, Dict]:
+    """Get DRS object.
+
+    Args:
+        app: Flask app.
+        request: Request.
+        object_id: Identifier of DRS object to be retrieved.
+
+    Returns:
+        DRS object as dictionary, with its entity tag in the response
+        headers; an empty 304 response if the client's copy, as identified by
+        the `If-None-Match` header, is current.
+    """
+    cache = get_object_cache(app=app)
+    obj = cache.get(object_id)
+    if obj is None:
+        # cached objects are read from the primary, so that they are never
+        # older than the writes of this worker, which invalidate them
+        db_collection = get_motor_collection(
+            app=app,
+            name='objects',
+            read=not cache.enabled,
+        )
+        generation = cache.generation
+        obj = await db_collection.find_one({"id": object_id}, {"_id": False})
+        if not obj:
+            raise ObjectNotFound
+        cache.set(object_id, obj, generation=generation)
+    etag = pop_content_hash(obj)
+    headers = {'ETag': etag_header(etag)}
+    if not_modified(etag, req=request):
+        return None, 304, headers
+    return obj, 200, headers
+
+
+async def GetAccessURL(
+    app: Flask,
+    request: Request,
+    object_id: str,
+    access_id: str,
+) -> Tuple[Optional[Dict], int, Dict]:
+    """Get access URL of DRS object.
+
+    Args:
+        app: Flask app.
+        request: Request.
+        object_id: Identifier of DRS object to be retrieved.
+        access_id: Identifier of method giving access to DRS object.
+
+    Returns:
+        Object with access information for DRS object, containing a URL and
+        any relevant header information. The entity tag of the DRS object is
+        returned in the response headers; an empty 304 response is returned
+        if the client's copy, as identified by the `If-None-Match` header, is
+        current.
+    """
+    obj = get_object_cache(app=app).get(object_id)
+    if obj is None:
+        db_collection = get_motor_collection(app=app, name='objects')
+        objs = await db_collection.aggregate(
+            access_methods_pipeline(object_id=object_id, access_id=access_id),
+        ).to_list(length=1)
+        if not objs:
+            raise ObjectNotFound
+        obj = objs[0]
+        # the content hash of objects without stored one is computed from
+        # the whole object
+        if '_hash' not in obj:
+            obj = await db_collection.find_one(
+                {'id': object_id},
+                {'_id': False},
+            )
+            if obj is None:
+                raise ObjectNotFound
+    etag = pop_content_hash(obj)
+    access_url = select_access_url(obj=obj, access_id=access_id)
+    headers = {'ETag': etag_header(etag)}
+    if not_modified(etag, req=request):
+        return None, 304, headers
+    return access_url, 200, headers
+
+
+async def getServiceInfo(
+    app: Flask,
+    request: Request,
+) -> Tuple[Optional[Dict], int, Dict]:
+    """Show information about this service.
+
+    Args:
+        app: Flask app.
+        request: Request.
+
+    Returns:
+        Service info, with an entity tag and caching directives in the
+        response headers; an empty 304 response if the client's copy, as
+        identified by the `If-None-Match` header, is current.
+    """
+    cache = get_service_info_cache(app=app)
+    db_collection = get_motor_collection(app=app, name='service_info')
+    entry = cache.get(CACHE_KEY)
+    if entry is not None and not cache.ttl:
+        latest = await db_collection.find_one(
+            {},
+            {'_id': False, '_version': True},
+            sort=[('_id', -1)],
+        )
+        if latest is None or latest.get('_version') != entry['version']:
+            entry = None
+    if entry is None:
+        generation = cache.generation
+        found = await db_collection.find(
+            {},
+            {'_id': False},
+        ).sort([('_id', -1)]).limit(1).to_list(length=1)
+        if not found:
+            raise NotFound
+        entry = {
+            'version': found[0].pop('_version', None),
+            'service_info': found[0],
+        }
+        cache.set(CACHE_KEY, entry, generation=generation)
+    data = entry['service_info']
+    etag = compute_etag(data)
+    ttl = cache.ttl
+    headers = {
+        'ETag': etag_header(etag),
+        'Cache-Control': f'max-age={int(ttl)}' if ttl else 'no-cache',
+    }
+    if not_modified(etag, req=request):
+        return None, 304, headers
+    return data, 200, headers
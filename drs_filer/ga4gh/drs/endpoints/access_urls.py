@@ -0,0 +1,143 @@
+"""Helpers for resolving access URLs of DRS objects."""
+
+import logging
+from typing import (Dict, Iterable, List, Optional)
+
+from drs_filer.errors.exceptions import (
+    InternalServerError,
+    URLNotFound,
+)
+
+logger = logging.getLogger(__name__)
+
+
+def access_methods_pipeline(object_id: str, access_id: str) -> List[Dict]:
+    """Get aggregation pipeline retrieving an object's matching access
+    methods.
+
+    Only the content hash and the access methods with the given identifier
+    are retrieved, rather than the whole object. Objects without stored
+    content hash need to be retrieved whole to compute it.
+
+    Args:
+        object_id: Identifier of DRS object.
+        access_id: Identifier of access method.
+
+    Returns:
+        Aggregation pipeline.
+    """
+    return [
+        {'$match': {'id': object_id}},
+        {'$limit': 1},
+        {'$project': {
+            '_id': False,
+            '_hash': True,
+            'access_methods': {'$filter': {
+                'input': '$access_methods',
+                'as': 'method',
+                'cond': {'$eq': ['$$method.access_id', access_id]},
+            }},
+        }},
+    ]
+
+
+def bulk_access_methods_pipeline(
+    object_ids: Iterable[str],
+    access_ids: Optional[Iterable[str]] = None,
+) -> List[Dict]:
+    """Get aggregation pipeline retrieving the access methods of multiple
+    objects.
+
+    Only the identifiers and access methods of the objects are retrieved,
+    rather than the whole objects.
+
+    Args:
+        object_ids: Identifiers of DRS objects.
+        access_ids: If given, only access methods with any of these
+            identifiers are retrieved.
+
+    Returns:
+        Aggregation pipeline.
+    """
+    access_methods: object = '$access_methods'
+    if access_ids is not None:
+        access_methods = {'$filter': {
+            'input': '$access_methods',
+            'as': 'method',
+            'cond': {'$in': ['$$method.access_id', list(access_ids)]},
+        }}
+    return [
+        {'$match': {'id': {'$in': list(object_ids)}}},
+        {'$project': {
+            '_id': False,
+            'id': True,
+            'access_methods': access_methods,
+        }},
+    ]
+
+
+def select_access_id(obj: Dict, access_type: Optional[str] = None) -> str:
+    """Get identifier of an object's access method, preferring one of a
+    given type.
+
+    Args:
+        obj: DRS object, or the part of it retrieved with
+            `bulk_access_methods_pipeline()`.
+        access_type: Preferred type of access method.
+
+    Returns:
+        Identifier of the first access method of type `access_type` or, if
+        there is none or no type is given, of the first access method.
+
+    Raises:
+        drs_filer.errors.exceptions.URLNotFound: The object has no access
+            methods.
+        drs_filer.errors.exceptions.InternalServerError: The access methods
+            of the object are malformed.
+    """
+    try:
+        access_methods = obj.get('access_methods', [])
+        preferred = [
+            method for method in access_methods
+            if method['type'] == access_type
+        ]
+        return (preferred or access_methods)[0]['access_id']
+    except (KeyError, TypeError):
+        raise InternalServerError
+    except IndexError:
+        raise URLNotFound
+
+
+def select_access_url(obj: Dict, access_id: str) -> Dict:
+    """Get access URL of an object's access method.
+
+    Args:
+        obj: DRS object, or the part of it retrieved with
+            `access_methods_pipeline()`.
+        access_id: Identifier of access method.
+
+    Returns:
+        Access URL, with any relevant header information.
+
+    Raises:
+        drs_filer.errors.exceptions.URLNotFound: The object has no access
+            method with the given identifier.
+        drs_filer.errors.exceptions.InternalServerError: The access methods
+            of the object are malformed, or several have the given
+            identifier.
+    """
+    try:
+        access_urls = [
+            d['access_url'] for d in obj['access_methods']
+            if d['access_id'] == access_id
+        ]
+    # An access methods dictionary is required for every object and it needs
+    # to contain a list of dictionaries wth keys `access_url` and `access_id`
+    except (KeyError, TypeError):
+        raise InternalServerError
+    if not access_urls:
+        raise URLNotFound
+    # Access IDs should be unique
+    if len(access_urls) > 1:
+        raise InternalServerError
+    return access_urls[0]
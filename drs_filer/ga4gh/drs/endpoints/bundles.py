@@ -0,0 +1,440 @@
+"""Helpers for handling bundles, i.e., DRS objects with contents."""
+
+import hashlib
+import logging
+from typing import (
+    Dict,
+    FrozenSet,
+    Iterable,
+    Iterator,
+    List,
+    Optional,
+    Tuple,
+)
+
+from drs_filer.database.backends import get_storage
+from drs_filer.errors.exceptions import (
+    BundleAggregatesMismatch,
+    BundleTooDeep,
+)
+from drs_filer.ga4gh.drs.endpoints.conditional import set_content_hash
+from drs_filer.ga4gh.drs.endpoints.get_objects import get_objects
+from drs_filer.ga4gh.drs.endpoints.object_cache import get_object_cache
+
+logger = logging.getLogger(__name__)
+
+# checksum types for which bundle checksums can be computed, mapped to the
+# names of the corresponding `hashlib` algorithms
+CHECKSUM_ALGORITHMS = {
+    'md5': 'md5',
+    'sha1': 'sha1',
+    'sha-1': 'sha1',
+    'sha256': 'sha256',
+    'sha-256': 'sha256',
+    'sha512': 'sha512',
+    'sha-512': 'sha512',
+}
+
+
+def expand_bundle(
+    obj: Dict,
+    max_depth: int,
+    max_nodes: int,
+) -> Dict:
+    """Recursively expand the contents of a bundle.
+
+    Every `ContentsObject` that refers to another bundle registered with this
+    service is populated with the contents of that bundle. Referenced bundles
+    are retrieved level by level, with a single lookup for all bundles of a
+    level that were not retrieved before, and every bundle is expanded only
+    once; all references to a bundle share its expanded contents. Bundles
+    that contain themselves, directly or indirectly, are not expanded again
+    within themselves.
+
+    Args:
+        obj: DRS object; modified in place.
+        max_depth: Maximum number of levels of contents that are expanded.
+        max_nodes: Maximum number of `ContentsObject`s in the expanded
+            bundle, counting every reference to a bundle.
+
+    Returns:
+        DRS object with expanded contents.
+
+    Raises:
+        drs_filer.errors.exceptions.BundleTooDeep: The bundle has more than
+            `max_depth` levels of contents or, expanded, more than
+            `max_nodes` contents.
+    """
+    if 'contents' not in obj:
+        return obj
+    bundles = _get_bundle_contents(obj=obj, max_depth=max_depth)
+    expanded: Dict[str, Tuple[List[Dict], int, int]] = {}
+
+    def expand(
+        items: List[Dict],
+        level: int,
+        path: FrozenSet[str],
+    ) -> Tuple[List[Dict], int, int]:
+        """Expand contents at the given level; returns the expanded contents,
+        their number of levels and their total number of items."""
+        if items and level > max_depth:
+            _raise_too_deep(obj=obj, max_depth=max_depth)
+        res = []
+        height = 0
+        nodes = 0
+        for item in items:
+            contents = None
+            item_height = 0
+            item_nodes = 0
+            if 'id' in item and item['id'] in path:
+                logger.warning(
+                    f"Bundle '{obj['id']}' contains a cycle at object "
+                    f"'{item['id']}'; not expanding further."
+                )
+            elif 'contents' in item:
+                contents, item_height, item_nodes = expand(
+                    items=item['contents'],
+                    level=level + 1,
+                    path=path | {item['id']} if 'id' in item else path,
+                )
+            elif bundles.get(item.get('id')) is not None:
+                if item['id'] not in expanded:
+                    expanded[item['id']] = expand(
+                        items=bundles[item['id']],
+                        level=level + 1,
+                        path=path | {item['id']},
+                    )
+                contents, item_height, item_nodes = expanded[item['id']]
+                if level + item_height > max_depth:
+                    _raise_too_deep(obj=obj, max_depth=max_depth)
+            res.append(item if contents is None else dict(
+                item,
+                contents=contents,
+            ))
+            height = max(height, item_height + 1)
+            nodes += item_nodes + 1
+            if nodes > max_nodes:
+                logger.error(
+                    f"Bundle '{obj['id']}' has more than {max_nodes} "
+                    "contents when expanded."
+                )
+                raise BundleTooDeep
+        return res, height, nodes
+
+    obj['contents'] = expand(
+        items=obj['contents'],
+        level=1,
+        path=frozenset([obj['id']]),
+    )[0]
+    return obj
+
+
+def _get_bundle_contents(
+    obj: Dict,
+    max_depth: int,
+) -> Dict[str, Optional[List[Dict]]]:
+    """Retrieve contents of the bundles referenced by a bundle, level by
+    level, each bundle once.
+
+    Args:
+        obj: DRS object.
+        max_depth: Maximum number of levels of contents that are expanded.
+
+    Returns:
+        Contents of the bundle and of the referenced objects, keyed by their
+        identifiers; `None` for objects that are not bundles or were not
+        found.
+
+    Raises:
+        drs_filer.errors.exceptions.BundleTooDeep: The bundle has more than
+            `max_depth` levels of contents.
+    """
+    bundles: Dict[str, Optional[List[Dict]]] = {obj['id']: obj['contents']}
+    object_ids = list(_get_referenced_ids(obj['contents']))
+    for __ in range(max_depth):
+        missing = [
+            object_id for object_id in dict.fromkeys(object_ids)
+            if object_id not in bundles
+        ]
+        if not missing:
+            return bundles
+        children = get_objects(missing)
+        object_ids = []
+        for object_id in missing:
+            bundles[object_id] = children.get(object_id, {}).get('contents')
+            object_ids.extend(_get_referenced_ids(bundles[object_id] or []))
+    if any(object_id not in bundles for object_id in object_ids):
+        _raise_too_deep(obj=obj, max_depth=max_depth)
+    return bundles
+
+
+def _get_referenced_ids(items: List[Dict]) -> Iterator[str]:
+    """Get identifiers of objects referenced by contents without their own
+    contents."""
+    for item in items:
+        if 'contents' in item:
+            yield from _get_referenced_ids(item['contents'])
+        elif 'id' in item:
+            yield item['id']
+
+
+def _raise_too_deep(obj: Dict, max_depth: int) -> None:
+    """Log and raise that a bundle has too many levels of contents."""
+    logger.error(
+        f"Bundle '{obj['id']}' has more than {max_depth} levels of contents."
+    )
+    raise BundleTooDeep
+
+
+def compute_bundle_aggregates(
+    contents: List[Dict],
+    children: Dict[str, Dict],
+) -> Optional[Dict]:
+    """Compute size and checksums of a bundle from its direct contents.
+
+    The size of a bundle is the sum of the sizes of its contents. For every
+    checksum type that is available for all contents and that is listed in
+    `CHECKSUM_ALGORITHMS`, the checksum of the bundle is computed over the
+    sorted concatenation of the checksums of the contents.
+
+    Args:
+        contents: `ContentsObject`s of a bundle.
+        children: DRS objects referred to by `contents`, keyed by their
+            identifiers; objects need to include at least `size` and
+            `checksums`.
+
+    Returns:
+        Dictionary with the keys `size` and `checksums`, or `None` if not all
+        contents refer to objects in `children`.
+    """
+    objs = []
+    for item in contents:
+        child = children.get(item.get('id'))
+        if child is None:
+            return None
+        objs.append(child)
+
+    child_checksums = [
+        {c['type']: c['checksum'].lower() for c in obj.get('checksums', [])}
+        for obj in objs
+    ]
+    checksums = []
+    if child_checksums:
+        for checksum_type in child_checksums[0]:
+            if checksum_type not in CHECKSUM_ALGORITHMS or not all(
+                checksum_type in c for c in child_checksums
+            ):
+                continue
+            digest = hashlib.new(CHECKSUM_ALGORITHMS[checksum_type])
+            digest.update(''.join(sorted(
+                c[checksum_type] for c in child_checksums
+            )).encode())
+            checksums.append({
+                'type': checksum_type,
+                'checksum': digest.hexdigest(),
+            })
+
+    return {
+        'size': sum(obj.get('size', 0) for obj in objs),
+        'checksums': checksums,
+    }
+
+
+def set_bundle_aggregates(objects: List[Dict]) -> None:
+    """Validate and complete size and checksums of bundles to be registered.
+
+    The direct contents of all bundles in `objects` are retrieved with a
+    single database query; contents that are among `objects` themselves are
+    taken from there instead, with bundles completed before the bundles
+    containing them. Aggregates are only set for bundles whose contents all
+    refer to objects registered with this service or among `objects`.
+
+    Args:
+        objects: Objects of type `DrsObjectRegister`; bundles are modified in
+            place.
+
+    Raises:
+        drs_filer.errors.exceptions.BundleAggregatesMismatch: The size or any
+            checksum supplied for a bundle does not match the one computed
+            from its contents.
+    """
+    bundles = _sort_contents_first(
+        [obj for obj in objects if 'contents' in obj]
+    )
+    if not bundles:
+        return
+    referenced = {
+        item['id'] for obj in bundles for item in obj['contents']
+        if 'id' in item
+    }
+    children = _get_children(referenced)
+    children.update({
+        obj['id']: obj for obj in objects if obj.get('id') in referenced
+    })
+    for obj in bundles:
+        aggregates = compute_bundle_aggregates(
+            contents=obj['contents'],
+            children=children,
+        )
+        if aggregates is None:
+            children.pop(obj.get('id'), None)
+            continue
+        supplied = {
+            c['type']: c['checksum'].lower()
+            for c in obj.get('checksums', [])
+        }
+        if obj.get('size', aggregates['size']) != aggregates['size'] or any(
+            supplied.get(c['type'], c['checksum']) != c['checksum']
+            for c in aggregates['checksums']
+        ):
+            logger.error(
+                "Size or checksums of bundle do not match its contents. "
+                f"Computed: {aggregates}"
+            )
+            raise BundleAggregatesMismatch
+        obj['size'] = aggregates['size']
+        obj['checksums'] = _merge_checksums(
+            computed=aggregates['checksums'],
+            existing=obj.get('checksums', []),
+        )
+
+
+def update_parent_aggregates(object_ids: Iterable[str]) -> None:
+    """Update size and checksums of bundles containing the given objects.
+
+    Only bundles that directly contain any of the given objects are
+    recomputed, each level with one query for the bundles and one for their
+    contents; bundles of a level that contain others of the same level are
+    recomputed after those. If the aggregates of a bundle change, the bundles
+    containing it are updated in turn, as are the content hashes of updated
+    bundles.
+
+    Args:
+        object_ids: Identifiers of objects that were created or updated.
+    """
+    storage = get_storage()
+    cache = get_object_cache()
+    visited = set()
+    level = set(object_ids)
+    while level:
+        parents = _sort_contents_first([
+            parent for parent in storage.get_bundles(level)
+            if parent['id'] not in visited
+        ])
+        children = _get_children(
+            item['id'] for parent in parents for item in parent['contents']
+            if 'id' in item
+        )
+        level = set()
+        for parent in parents:
+            visited.add(parent['id'])
+            aggregates = compute_bundle_aggregates(
+                contents=parent['contents'],
+                children=children,
+            )
+            if aggregates is None:
+                continue
+            checksums = _merge_checksums(
+                computed=aggregates['checksums'],
+                existing=parent.get('checksums', []),
+            )
+            if (
+                parent.get('size') == aggregates['size']
+                and parent.get('checksums') == checksums
+            ):
+                continue
+            parent['size'] = aggregates['size']
+            parent['checksums'] = checksums
+            storage.update_object(
+                object_id=parent['id'],
+                fields={
+                    'size': aggregates['size'],
+                    'checksums': checksums,
+                    '_hash': set_content_hash(parent),
+                },
+            )
+            cache.invalidate(parent['id'])
+            logger.info(
+                f"Updated size and checksums of bundle '{parent['id']}'."
+            )
+            if parent['id'] in children:
+                children[parent['id']].update(
+                    size=aggregates['size'],
+                    checksums=checksums,
+                )
+            level.add(parent['id'])
+
+
+def _sort_contents_first(bundles: List[Dict]) -> List[Dict]:
+    """Sort bundles so that each comes after those among them that it
+    contains; bundles that contain each other are kept in any order.
+
+    Args:
+        bundles: Bundles, with or without identifiers.
+
+    Returns:
+        Sorted bundles.
+    """
+    by_id = {
+        bundle['id']: bundle for bundle in bundles
+        if bundle.get('id') is not None
+    }
+    ordered: List[Dict] = []
+    seen = set()
+    for bundle in bundles:
+        if id(bundle) in seen:
+            continue
+        seen.add(id(bundle))
+        stack = [(bundle, iter(bundle['contents']))]
+        while stack:
+            current, items = stack[-1]
+            for item in items:
+                child = by_id.get(item.get('id'))
+                if child is not None and id(child) not in seen:
+                    seen.add(id(child))
+                    stack.append((child, iter(child['contents'])))
+                    break
+            else:
+                stack.pop()
+                ordered.append(current)
+    return ordered
+
+
+def _get_children(object_ids: Iterable[str]) -> Dict[str, Dict]:
+    """Get size and checksums of objects.
+
+    Args:
+        object_ids: Identifiers of objects.
+
+    Returns:
+        Found objects, reduced to `id`, `size` and `checksums` and keyed by
+        their identifiers.
+    """
+    object_ids = list(set(object_ids))
+    if not object_ids:
+        return {}
+    return {
+        obj['id']: obj for obj in get_storage().get_objects(
+            object_ids,
+            for_update=True,
+            fields=['id', 'size', 'checksums'],
+        )
+    }
+
+
+def _merge_checksums(
+    computed: List[Dict],
+    existing: List[Dict],
+) -> List[Dict]:
+    """Merge computed checksums with existing ones.
+
+    Args:
+        computed: Checksums computed from the contents of a bundle.
+        existing: Checksums supplied for or stored with a bundle.
+
+    Returns:
+        Computed checksums, followed by those existing checksums whose types
+        were not computed.
+    """
+    computed_types = {c['type'] for c in computed}
+    return computed + [c for c in existing if c['type'] not in computed_types]
@@ -0,0 +1,115 @@
+"""Helpers for conditional requests based on entity tags."""
+
+import hashlib
+import json
+from typing import (Dict, Optional)
+
+from flask import request
+from werkzeug.wrappers import Request
+
+# fields of stored DRS objects that are not part of their API representation
+INTERNAL_FIELDS = frozenset(['_id', '_hash', '_register_hash'])
+
+
+def compute_etag(data: Dict) -> str:
+    """Compute entity tag of a JSON document.
+
+    Args:
+        data: JSON document.
+
+    Returns:
+        Hex digest over the canonical JSON serialization of `data`; documents
+        that differ only in the order of their keys have the same tag.
+    """
+    return hashlib.blake2b(
+        json.dumps(data, sort_keys=True, separators=(',', ':')).encode(),
+        digest_size=16,
+    ).hexdigest()
+
+
+def etag_header(etag: str) -> str:
+    """Format entity tag for use in `ETag` response header.
+
+    Args:
+        etag: Entity tag.
+
+    Returns:
+        Quoted entity tag.
+    """
+    return f'"{etag}"'
+
+
+def not_modified(etag: str, req: Optional[Request] = None) -> bool:
+    """Check whether the client's copy of a resource is current.
+
+    Args:
+        etag: Entity tag of the current version of the requested resource.
+        req: Request whose `If-None-Match` header is checked; defaults to the
+            current request.
+
+    Returns:
+        `True` if the `If-None-Match` header of the request matches `etag`.
+    """
+    return (req or request).if_none_match.contains_weak(etag)
+
+
+def set_content_hash(obj: Dict) -> str:
+    """Compute and store the content hash of a DRS object.
+
+    The content hash is stored in the internal field `_hash` and serves as
+    the entity tag of the object.
+
+    Args:
+        obj: DRS object as written to the database; modified in place.
+
+    Returns:
+        Content hash.
+    """
+    obj['_hash'] = compute_etag({
+        key: value for key, value in obj.items()
+        if key not in INTERNAL_FIELDS
+    })
+    return obj['_hash']
+
+
+def set_register_hash(obj: Dict) -> str:
+    """Compute and store the registration hash of a DRS object.
+
+    The registration hash is stored in the internal field `_register_hash`
+    and identifies the object as registered, leaving out the generated
+    identifiers of its access methods, so that registering the same object
+    again yields the same hash.
+
+    Args:
+        obj: DRS object as written to the database; modified in place.
+
+    Returns:
+        Registration hash.
+    """
+    data = {
+        key: value for key, value in obj.items()
+        if key not in INTERNAL_FIELDS
+    }
+    if 'access_methods' in data:
+        data['access_methods'] = [
+            {key: value for key, value in method.items() if key != 'access_id'}
+            for method in data['access_methods']
+        ]
+    obj['_register_hash'] = compute_etag(data)
+    return obj['_register_hash']
+
+
+def pop_content_hash(obj: Dict) -> str:
+    """Remove internal fields from a DRS object and get its content hash.
+
+    Args:
+        obj: DRS object as read from the database; modified in place.
+
+    Returns:
+        Stored content hash or, for objects written before content hashes
+        were stored, one computed from the object.
+    """
+    content_hash = obj.pop('_hash', None)
+    for field in INTERNAL_FIELDS:
+        obj.pop(field, None)
+    return content_hash or compute_etag(obj)
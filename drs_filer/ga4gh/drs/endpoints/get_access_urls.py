@@ -0,0 +1,104 @@
+"""Helpers for resolving access URLs of multiple DRS objects."""
+
+import logging
+from typing import (Dict, List, Optional, Sequence, Tuple)
+
+from werkzeug.exceptions import HTTPException
+
+from drs_filer.database.backends import get_storage
+from drs_filer.database.sessions import read_your_writes
+from drs_filer.errors.exceptions import (
+    exceptions,
+    ObjectNotFound,
+)
+from drs_filer.ga4gh.drs.endpoints.access_urls import (
+    select_access_id,
+    select_access_url,
+)
+from drs_filer.ga4gh.drs.endpoints.object_cache import get_object_cache
+from drs_filer.tracing import set_span_attributes
+
+logger = logging.getLogger(__name__)
+
+
+def get_access_urls(
+    items: Sequence[Tuple[str, Optional[str]]],
+    access_type: Optional[str] = None,
+) -> Tuple[List[Dict], List[Dict]]:
+    """Get access URLs of multiple DRS objects.
+
+    Objects available in the object cache are served from it; the access
+    methods of all other objects are retrieved with a single database query.
+    The cache is bypassed if the client asked to read its own writes.
+
+    Args:
+        items: Pairs of identifiers of DRS objects and of their access
+            methods; if the identifier of an access method is `None`, an
+            access method is selected, preferring those of type
+            `access_type`.
+        access_type: Preferred type of selected access methods.
+
+    Returns:
+        Resolved access URLs, with the identifiers of their objects and
+        access methods, and errors of items that could not be resolved, each
+        in the order of `items`.
+    """
+    cache = get_object_cache()
+    objs = {}
+    missing = []
+    for object_id in dict.fromkeys(object_id for object_id, __ in items):
+        obj = None if read_your_writes() else cache.get(object_id)
+        if obj is None:
+            missing.append(object_id)
+        else:
+            objs[object_id] = obj
+    set_span_attributes({
+        'drs.cache_hits': len(objs),
+        'drs.cache_misses': len(missing),
+    })
+
+    # Retrieve only the requested access methods, unless any are selected
+    if missing:
+        access_ids: Optional[List[str]] = [
+            access_id for object_id, access_id in items
+            if object_id in missing
+        ]
+        if None in access_ids:
+            access_ids = None
+        for obj in get_storage().get_access_methods(
+            object_ids=missing,
+            access_ids=access_ids,
+        ):
+            objs[obj['id']] = obj
+
+    resolved = []
+    unresolved = []
+    for object_id, access_id in items:
+        try:
+            obj = objs.get(object_id)
+            if obj is None:
+                raise ObjectNotFound
+            if access_id is None:
+                access_id = select_access_id(obj=obj, access_type=access_type)
+            access_url = select_access_url(obj=obj, access_id=access_id)
+        except HTTPException as e:
+            error = {'object_id': object_id, 'error': _get_error(e)}
+            if access_id is not None:
+                error['access_id'] = access_id
+            unresolved.append(error)
+            continue
+        resolved.append({
+            'object_id': object_id,
+            'access_id': access_id,
+            'access_url': access_url,
+        })
+    return resolved, unresolved
+
+
+def _get_error(exception: Exception) -> Dict:
+    """Get error message and status code of exception."""
+    error = exceptions.get(type(exception), exceptions[Exception])
+    return {
+        'msg': error['msg'],
+        'status_code': int(error['status_code']),
+    }
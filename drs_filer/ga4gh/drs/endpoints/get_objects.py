@@ -0,0 +1,56 @@
+"""Helpers for retrieving DRS objects."""
+
+import logging
+from typing import (Dict, Iterable)
+
+from drs_filer.database.backends import get_storage
+from drs_filer.database.sessions import read_your_writes
+from drs_filer.ga4gh.drs.endpoints.conditional import pop_content_hash
+from drs_filer.ga4gh.drs.endpoints.object_cache import get_object_cache
+from drs_filer.tracing import set_span_attributes
+
+logger = logging.getLogger(__name__)
+
+
+def get_objects(object_ids: Iterable[str]) -> Dict[str, Dict]:
+    """Get multiple DRS objects.
+
+    Objects not available in the object cache are retrieved with a single
+    database query. The cache is bypassed if the client asked to read its
+    own writes.
+
+    Args:
+        object_ids: Identifiers of DRS objects to be retrieved.
+
+    Returns:
+        Found DRS objects, keyed by their identifiers. Identifiers of objects
+        that were not found are not included.
+    """
+    cache = get_object_cache()
+    objs = {}
+    missing = []
+    for object_id in set(object_ids):
+        obj = None if read_your_writes() else cache.get(object_id)
+        if obj is None:
+            missing.append(object_id)
+        else:
+            objs[object_id] = obj
+    set_span_attributes({
+        'drs.cache_hits': len(objs),
+        'drs.cache_misses': len(missing),
+    })
+
+    # cached objects are read from the primary, so that they are never older
+    # than the writes of this worker, which invalidate them
+    if missing:
+        generation = cache.generation
+        for obj in get_storage().get_objects(
+            missing,
+            for_update=cache.enabled,
+        ):
+            objs[obj['id']] = obj
+            cache.set(obj['id'], obj, generation=generation)
+
+    for obj in objs.values():
+        pop_content_hash(obj)
+    return objs
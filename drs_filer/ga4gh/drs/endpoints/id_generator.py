@@ -0,0 +1,223 @@
+"""Generation of random identifiers for DRS objects and access methods."""
+
+import logging
+import secrets
+import sqlite3
+import string
+from typing import (Dict, List)
+
+from flask import (current_app, Flask)
+from pymongo.errors import PyMongoError
+
+from drs_filer.database.backends import get_storage
+
+logger = logging.getLogger(__name__)
+
+# collision probability above which a warning is logged at startup
+COLLISION_WARNING_THRESHOLD = 0.01
+
+
+class IdGenerator:
+    """Generator of random identifiers from a fixed set of characters.
+
+    Characters are drawn from a cryptographically secure source, in bulk for
+    all identifiers of a call. Random bytes are mapped to characters with a
+    translation table; bytes that would bias the choice of characters are
+    discarded.
+
+    Args:
+        charset: String of allowed characters.
+        length: Length of identifiers.
+
+    Attributes:
+        charset: String of allowed characters, without duplicates.
+        length: Length of identifiers.
+        space: Number of possible identifiers.
+
+    Raises:
+        ValueError: `charset` is empty or `length` is not positive.
+    """
+
+    def __init__(
+        self,
+        charset: str = ''.join([string.ascii_letters, string.digits]),
+        length: int = 6,
+    ) -> None:
+        """Class constructor."""
+        self.charset = ''.join(dict.fromkeys(charset))
+        self.length = length
+        if not self.charset or length < 1:
+            raise ValueError(
+                "identifiers need a non-empty character set and a positive "
+                "length"
+            )
+        self.space = len(self.charset) ** length
+        size = len(self.charset)
+        self._table = None
+        if size <= 256 and all(ord(char) < 128 for char in self.charset):
+            limit = 256 - 256 % size
+            self._table = bytes(
+                ord(self.charset[value % size]) for value in range(256)
+            )
+            self._rejected = bytes(range(limit, 256))
+            self._ratio = 256 / limit
+
+    def generate(self, count: int = 1) -> List[str]:
+        """Generate identifiers that are unique within the call.
+
+        Args:
+            count: Number of identifiers.
+
+        Returns:
+            Random identifiers.
+
+        Raises:
+            ValueError: More identifiers are requested than possible.
+        """
+        if count > self.space:
+            raise ValueError(
+                f"cannot generate {count} unique identifiers; only "
+                f"{self.space} are possible"
+            )
+        ids: Dict[str, None] = {}
+        while len(ids) < count:
+            chars = self._draw((count - len(ids)) * self.length)
+            for start in range(0, len(chars), self.length):
+                ids[chars[start:start + self.length]] = None
+        return list(ids)[:count]
+
+    def collision_probability(self, existing: int) -> float:
+        """Estimate the probability that a new identifier exists already.
+
+        Args:
+            existing: Number of existing identifiers.
+
+        Returns:
+            Probability that a single newly generated identifier collides
+            with one of `existing` identifiers.
+        """
+        return min(existing / self.space, 1.0)
+
+    def _draw(self, count: int) -> str:
+        """Draw random characters.
+
+        Args:
+            count: Number of characters.
+
+        Returns:
+            String of `count` random characters.
+        """
+        if self._table is None:
+            return ''.join(
+                secrets.choice(self.charset) for __ in range(count)
+            )
+        chars = ''
+        while len(chars) < count:
+            needed = count - len(chars)
+            chars += secrets.token_bytes(
+                int(needed * self._ratio) + 8
+            ).translate(self._table, self._rejected).decode()
+        return chars[:count]
+
+
+def parse_charset(charset: str) -> str:
+    """Parse identifier character set from configuration.
+
+    Args:
+        charset: Python expression evaluating to a string of allowed
+            characters, e.g., `string.digits`, or literal string of allowed
+            characters.
+
+    Returns:
+        String of allowed characters.
+    """
+    # evaluate character set expression or interpret literal string as set
+    try:
+        return eval(charset)
+    except Exception:
+        return ''.join(sorted(set(charset)))
+
+
+def generate_id(
+    charset: str = ''.join([string.ascii_letters, string.digits]),
+    length: int = 6
+) -> str:
+    """Generate random string based on allowed set of characters.
+
+    Args:
+        charset: String of allowed characters.
+        length: Length of returned string.
+
+    Returns:
+        Random string of specified length and composed of defined set of
+        allowed characters.
+    """
+    return IdGenerator(charset=charset, length=length).generate()[0]
+
+
+def create_id_generators(app: Flask) -> Dict[str, IdGenerator]:
+    """Create identifier generators for DRS objects and access methods.
+
+    Character sets and lengths are configured via `id_charset` and
+    `id_length` in the `endpoints.objects` and `endpoints.access_methods`
+    sections of the app configuration and are parsed only once. The
+    probability that a new object identifier collides with an existing one
+    is logged; a warning is logged if it is high enough to make retries
+    frequent.
+
+    Args:
+        app: Flask app.
+
+    Returns:
+        Identifier generators, keyed by `objects` and `access_methods`.
+    """
+    generators = _build_id_generators(conf=app.config['FOCA'].endpoints)
+    app.extensions['drs_filer_id_generators'] = generators
+
+    generator = generators['objects']
+    try:
+        with app.app_context():
+            existing = get_storage().count_objects()
+    except (PyMongoError, sqlite3.Error) as e:
+        logger.warning(f"Could not count existing objects: {e}")
+        return generators
+    probability = generator.collision_probability(existing)
+    message = (
+        f"{generator.space} object identifiers are possible; with "
+        f"{existing} existing objects, a new identifier collides with "
+        f"probability {probability:.2e}."
+    )
+    if probability > COLLISION_WARNING_THRESHOLD:
+        logger.warning(f"{message} Consider increasing 'id_length'.")
+    else:
+        logger.info(message)
+    return generators
+
+
+def get_id_generator(name: str) -> IdGenerator:
+    """Get identifier generator of current app, creating it on first use.
+
+    Args:
+        name: Either `objects` or `access_methods`.
+
+    Returns:
+        Identifier generator.
+    """
+    generators = current_app.extensions.get('drs_filer_id_generators')
+    if generators is None:
+        generators = current_app.extensions.setdefault(
+            'drs_filer_id_generators',
+            _build_id_generators(conf=current_app.config['FOCA'].endpoints),
+        )
+    return generators[name]
+
+
+def _build_id_generators(conf: Dict) -> Dict[str, IdGenerator]:
+    """Build identifier generators from endpoint configuration."""
+    return {
+        name: IdGenerator(
+            charset=parse_charset(conf[name]['id_charset']),
+            length=conf[name]['id_length'],
+        )
+        for name in ('objects', 'access_methods')
+    }
@@ -0,0 +1,62 @@
+"""Helpers for listing DRS objects."""
+
+import logging
+from typing import (Dict, List, Optional, Tuple)
+
+from drs_filer.database.backends import get_storage
+from drs_filer.ga4gh.drs.endpoints.conditional import pop_content_hash
+
+logger = logging.getLogger(__name__)
+
+
+def list_objects(
+    page_size: int,
+    page_token: Optional[str] = None,
+    name: Optional[str] = None,
+    mime_type: Optional[str] = None,
+    checksum: Optional[str] = None,
+    access_type: Optional[str] = None,
+    created_after: Optional[str] = None,
+    created_before: Optional[str] = None,
+) -> Tuple[List[Dict], Optional[str]]:
+    """List DRS objects matching all given filters, page by page.
+
+    Objects are listed in the order of their internal storage identifiers
+    and paginated by keyset: the page token is the identifier of the last
+    object of the previous page, so that every page is retrieved with a
+    single index range scan, however deep into the listing it is.
+
+    Creation times are compared as strings and are thus expected to be given
+    in the same format as they were registered in, e.g., as UTC timestamps
+    like `2020-01-31T12:00:00Z`.
+
+    Args:
+        page_size: Maximum number of objects per page.
+        page_token: Token returned with the previous page, if any.
+        name: Name of the objects.
+        mime_type: MIME type of the objects.
+        checksum: Value of any of the objects' checksums.
+        access_type: Type of any of the objects' access methods.
+        created_after: Earliest creation time of the objects, inclusive.
+        created_before: Latest creation time of the objects, exclusive.
+
+    Returns:
+        Page of found DRS objects and the token of the next page, or `None`
+        if this is the last page.
+
+    Raises:
+        drs_filer.errors.exceptions.BadRequest: The page token is invalid.
+    """
+    objs, next_page_token = get_storage().list_objects(
+        page_size=page_size,
+        page_token=page_token,
+        name=name,
+        mime_type=mime_type,
+        checksum=checksum,
+        access_type=access_type,
+        created_after=created_after,
+        created_before=created_before,
+    )
+    for obj in objs:
+        pop_content_hash(obj)
+    return objs, next_page_token
@@ -0,0 +1,163 @@
+"""Process-local cache for DRS objects."""
+
+from collections import OrderedDict
+from copy import deepcopy
+import logging
+from threading import Lock
+from time import monotonic
+from typing import (Dict, Optional, Tuple)
+
+from flask import (current_app, Flask)
+
+logger = logging.getLogger(__name__)
+
+
+class ObjectCache:
+    """Bounded, thread-safe LRU cache with a per-entry time to live.
+
+    Args:
+        size: Maximum number of cached objects. A size of `0` disables the
+            cache.
+        ttl: Time in seconds after which a cached object is considered stale.
+            A value of `0` means that cached objects do not expire.
+
+    Attributes:
+        size: Maximum number of cached objects.
+        ttl: Time in seconds after which a cached object is considered stale.
+        hits: Number of lookups answered from the cache.
+        misses: Number of lookups not answered from the cache.
+        generation: Counter that is increased whenever an entry is
+            invalidated. Callers that populate the cache after a database
+            read pass the value observed before the read to `set()`, so that
+            objects that were changed in the meantime are not cached.
+    """
+
+    def __init__(
+        self,
+        size: int = 0,
+        ttl: float = 0,
+    ) -> None:
+        """Class constructor."""
+        self.size = size
+        self.ttl = ttl
+        self.hits = 0
+        self.misses = 0
+        self.generation = 0
+        self._entries: OrderedDict = OrderedDict()
+        self._lock = Lock()
+
+    @property
+    def enabled(self) -> bool:
+        """Whether objects are cached at all."""
+        return self.size > 0
+
+    def get(self, key: str) -> Optional[Dict]:
+        """Get cached object.
+
+        Args:
+            key: DRS object identifier.
+
+        Returns:
+            Copy of the cached object or `None` if the object is not cached
+            or its entry has expired.
+        """
+        if not self.enabled:
+            return None
+        with self._lock:
+            entry: Optional[Tuple[float, Dict]] = self._entries.get(key)
+            if entry is not None and self.ttl and entry[0] < monotonic():
+                del self._entries[key]
+                entry = None
+            if entry is None:
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+        return deepcopy(entry[1])
+
+    def set(
+        self,
+        key: str,
+        value: Dict,
+        generation: Optional[int] = None,
+    ) -> None:
+        """Cache object, evicting the least recently used entry if full.
+
+        Args:
+            key: DRS object identifier.
+            value: DRS object.
+            generation: Value of `generation` observed before `value` was
+                read from the database. If any entry was invalidated since,
+                `value` is not cached.
+        """
+        if not self.enabled:
+            return
+        expires = monotonic() + self.ttl if self.ttl else 0
+        value = deepcopy(value)
+        with self._lock:
+            if generation is not None and generation != self.generation:
+                return
+            self._entries[key] = (expires, value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.size:
+                self._entries.popitem(last=False)
+
+    def invalidate(self, key: str) -> None:
+        """Remove object from cache.
+
+        Args:
+            key: DRS object identifier.
+        """
+        if not self.enabled:
+            return
+        with self._lock:
+            self.generation += 1
+            self._entries.pop(key, None)
+
+    def clear(self) -> None:
+        """Remove all objects from cache."""
+        with self._lock:
+            self.generation += 1
+            self._entries.clear()
+
+    def stats(self) -> Dict:
+        """Get cache statistics.
+
+        Returns:
+            Number of cached objects, hits and misses.
+        """
+        with self._lock:
+            return {
+                'entries': len(self._entries),
+                'hits': self.hits,
+                'misses': self.misses,
+            }
+
+
+def get_object_cache(app: Optional[Flask] = None) -> ObjectCache:
+    """Get object cache of an app, creating it on first use.
+
+    The cache is configured via `endpoints.objects.cache` in the app
+    configuration; if that section is missing, a disabled cache is returned.
+
+    Args:
+        app: Flask app; defaults to the current app.
+
+    Returns:
+        Object cache of the app.
+    """
+    app = app or current_app
+    cache = app.extensions.get('drs_filer_object_cache')
+    if cache is None:
+        try:
+            conf = app.config['FOCA'].endpoints['objects']['cache']
+        except (AttributeError, KeyError):
+            conf = {}
+        cache = app.extensions.setdefault(
+            'drs_filer_object_cache',
+            ObjectCache(
+                size=conf.get('size', 0),
+                ttl=conf.get('ttl', 0),
+            ),
+        )
+    return cache
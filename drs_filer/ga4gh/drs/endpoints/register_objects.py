@@ -1,101 +1,72 @@
 """Controller for registering new DRS objects."""
 
 import logging
-from random import choice
-import string
 from typing import (Dict, List, Optional)
 
 from flask import current_app
-from pymongo.errors import DuplicateKeyError
+from werkzeug.datastructures import ETags
 
-from drs_filer.errors.exceptions import InternalServerError
+from drs_filer.database.backends import get_storage
+from drs_filer.database.storage import (
+    CREATED,
+    ObjectExists,
+    UNCHANGED,
+)
+from drs_filer.errors.exceptions import (
+    InternalServerError,
+    PreconditionFailed,
+)
+from drs_filer.ga4gh.drs.endpoints.bundles import (
+    set_bundle_aggregates,
+    update_parent_aggregates,
+)
+from drs_filer.ga4gh.drs.endpoints.conditional import (
+    set_content_hash,
+    set_register_hash,
+)
+from drs_filer.ga4gh.drs.endpoints.id_generator import get_id_generator
+from drs_filer.ga4gh.drs.endpoints.object_cache import get_object_cache
+from drs_filer.tracing import set_span_attributes
 
 logger = logging.getLogger(__name__)
 
 
 def register_object(
     data: Dict,
-    object_id: Optional[str] = None,
     retries: int = 9,
 ) -> str:
     """Register data object.
 
     Args:
         data: Request object of type `DrsObjectRegister`.
-        object_id: DRS object identifier. Auto-generated if not provided.
-        retries: If `object_id` is not supplied, how many times should the
-            generation of a random identifier and insertion into the database
-            be retried in case of `DuplicateKeyError`s.
+        retries: How many times should the generation of a random identifier
+            and insertion into the database be retried in case of identifier
+            collisions.
 
     Returns:
         A unique identifier for the object.
     """
     # Set parameters
-    db_collection = (
-        current_app.config['FOCA'].db.dbs['drsStore'].
-        collections['objects'].client
-    )
-    url_prefix = current_app.config['FOCA'].endpoints['url_prefix']
-    external_host = current_app.config['FOCA'].endpoints['external_host']
-    external_port = current_app.config['FOCA'].endpoints['external_port']
-    api_path = current_app.config['FOCA'].endpoints['api_path']
-
-    # Set flags and parameters for POST/PUT routes
-    replace = True
-    was_replaced = False
-    if object_id is None:
-        replace = False
-        id_length = (
-            current_app.config['FOCA'].endpoints['objects']['id_length']
-        )
-        id_charset: str = (
-            current_app.config['FOCA'].endpoints['objects']['id_charset']
-        )
-        # evaluate character set expression or interpret literal string as set
-        try:
-            id_charset = eval(id_charset)
-        except Exception:
-            id_charset = ''.join(sorted(set(id_charset)))
-
-    # Add unique access identifiers for each access method
-    if 'access_methods' in data:
-        data['access_methods'] = __add_access_ids(
-            data=data['access_methods']
-        )
+    storage = get_storage()
+    candidate_ids = get_id_generator('objects').generate(count=retries + 1)
 
-    # Try to generate unique ID and insert object into database
-    for i in range(retries + 1):
-        logger.debug(f"Trying to insert/update object: try {i}")
-
-        # Set or generate object identifier
-        data['id'] = object_id if object_id is not None else generate_id(
-            charset=id_charset,  # type: ignore
-            length=id_length,  # type: ignore
-        )
+    # Add access identifiers and complete size and checksums of bundles
+    prepare_objects(objects=[data])
 
-        # Generate DRS URL
-        data['self_uri'] = (
-            f"{url_prefix}://{external_host}:{external_port}/"
-            f"{api_path}/{data['id']}"
-        )
+    # Try unique candidate IDs until object is inserted into database
+    for i in range(retries + 1):
+        logger.debug(f"Trying to insert object: try {i}")
+        set_span_attributes({'drs.retries': i})
 
-        # Replace or insert object, then return (PUT)
-        if replace:
-            result_object = db_collection.replace_one(
-                filter={'id': data['id']},
-                replacement=data,
-                upsert=True,
-            )
-            if result_object.modified_count:
-                was_replaced = True
-            break
+        # Pick generated object identifier; set DRS URL and hashes
+        set_object_id(obj=data, object_id=candidate_ids[i])
 
-        # Try to insert new object (POST); continue with next iteration if
-        # key exists
+        # Try to insert new object; continue with next iteration if key
+        # exists
         try:
-            db_collection.insert_one(data)
+            storage.insert_object(data)
             break
-        except DuplicateKeyError:
+        except ObjectExists:
             continue
 
     else:
@@ -104,50 +75,215 @@ def register_object(
         )
         raise InternalServerError
 
-    if was_replaced:
-        logger.info(f"Replaced object with id '{data['id']}'.")
-    else:
-        logger.info(f"Added object with id '{data['id']}'.")
+    logger.info(f"Added object with id '{data['id']}'.")
     return data['id']
 
 
-def __add_access_ids(data: List) -> List:
-    """Add access identifiers to posted access methods metadata.
+def replace_object(
+    data: Dict,
+    object_id: str,
+    if_match: Optional[ETags] = None,
+) -> bool:
+    """Replace data object or, if it does not exist, create it.
+
+    Created and changed objects are written with a single database round
+    trip. If the object is the same as when it was last registered, apart
+    from the generated access identifiers, it is not written at all and
+    keeps its access identifiers; finding this out takes a second round
+    trip.
 
     Args:
-        data: List of access method metadata objects.
+        data: Request object of type `DrsObjectRegister`.
+        object_id: DRS object identifier.
+        if_match: Entity tags of which the existing object needs to match
+            one in order to be replaced, as passed in an `If-Match` header.
+            If empty or not supplied, the object is replaced or created
+            unconditionally.
 
     Returns:
-        Access methods metadata complete with unique access identifiers.
+        Whether the object was created.
+
+    Raises:
+        drs_filer.errors.exceptions.PreconditionFailed: The existing object
+            does not match `if_match`, or no object exists.
     """
-    id_charset = eval(
-        current_app.config['FOCA'].endpoints['access_methods']['id_charset']
+    # Add access identifiers and complete size and checksums of bundles
+    prepare_objects(objects=[data])
+
+    # Set object identifier, DRS URL and hashes
+    set_object_id(obj=data, object_id=object_id)
+
+    # Replace or create object; if entity tags are given, only replace an
+    # existing, matching object
+    result = get_storage().upsert_object(
+        obj=data,
+        create=not if_match,
+        hashes=(
+            if_match.as_set()
+            if if_match and not if_match.star_tag else None
+        ),
     )
-    id_length = (
-        current_app.config['FOCA'].endpoints['access_methods']['id_length']
+    if result is None:
+        logger.error(
+            f"Object with id '{object_id}' does not exist or does not match "
+            "any of the given entity tags."
+        )
+        raise PreconditionFailed
+    if result == UNCHANGED:
+        logger.info(f"Object with id '{object_id}' is unchanged.")
+        return False
+
+    get_object_cache().invalidate(object_id)
+    update_parent_aggregates(object_ids=[object_id])
+    if result == CREATED:
+        logger.info(f"Added object with id '{object_id}'.")
+    else:
+        logger.info(f"Replaced object with id '{object_id}'.")
+    return result == CREATED
+
+
+def register_bulk_objects(
+    data: List[Dict],
+    retries: int = 9,
+) -> List[str]:
+    """Register multiple data objects.
+
+    Identifiers are generated for all objects, which are then written with a
+    single bulk insert. Only objects whose identifiers collided with existing
+    ones are assigned new identifiers and inserted again.
+
+    Args:
+        data: List of request objects of type `DrsObjectRegister`.
+        retries: How many times should the generation of random identifiers
+            and insertion into the database be retried for objects whose
+            identifiers collided with existing ones.
+
+    Returns:
+        Unique identifiers of the objects, in the order of `data`.
+    """
+    storage = get_storage()
+    id_generator = get_id_generator('objects')
+
+    # Add access identifiers and complete size and checksums of bundles
+    prepare_objects(objects=data)
+
+    # Try to generate unique IDs and insert objects into database
+    pending = list(range(len(data)))
+    for i in range(retries + 1):
+        logger.debug(
+            f"Trying to insert {len(pending)} objects: try {i}"
+        )
+        set_span_attributes({'drs.retries': i})
+
+        # Generate object identifiers that are unique within the batch
+        ids = id_generator.generate(count=len(pending))
+        for index, object_id in zip(pending, ids):
+            set_object_id(obj=data[index], object_id=object_id)
+
+        # Insert objects; retry those whose identifiers exist already
+        duplicates = storage.insert_objects([data[index] for index in pending])
+        if not duplicates:
+            break
+        pending = [pending[index] for index in duplicates]
+
+    else:
+        logger.error(
+            f"Could not generate unique identifiers for {len(pending)} "
+            f"objects. Tried {retries + 1} times."
+        )
+        raise InternalServerError
+
+    logger.info(f"Added {len(data)} objects.")
+    return [obj['id'] for obj in data]
+
+
+def prepare_objects(objects: List[Dict]) -> None:
+    """Prepare objects for registration.
+
+    Access identifiers are added to access methods that do not have one yet,
+    and the size and checksums of bundles are validated and completed, with a
+    single database query for all objects. Identifiers, DRS URLs and hashes
+    are set with `set_object_id()` afterwards.
+
+    Args:
+        objects: Objects of type `DrsObjectRegister`; modified in place.
+
+    Raises:
+        drs_filer.errors.exceptions.BundleAggregatesMismatch: The size or any
+            checksum supplied for a bundle does not match the one computed
+            from its contents.
+    """
+    for obj in objects:
+        if 'access_methods' in obj:
+            obj['access_methods'] = __add_access_ids(
+                data=obj['access_methods']
+            )
+    set_bundle_aggregates(objects=objects)
+
+
+def set_object_id(
+    obj: Dict,
+    object_id: str,
+) -> None:
+    """Set identifier, DRS URL, content hash and registration hash of an
+    object prepared with `prepare_objects()`.
+
+    Args:
+        obj: Object of type `DrsObjectRegister`; modified in place.
+        object_id: DRS object identifier.
+    """
+    obj['id'] = object_id
+    obj['self_uri'] = get_self_uri(object_id=object_id)
+    set_content_hash(obj)
+    set_register_hash(obj)
+
+
+def get_self_uri(object_id: str) -> str:
+    """Build DRS URL of data object.
+
+    Args:
+        object_id: DRS object identifier.
+
+    Returns:
+        DRS URL of data object.
+    """
+    conf = current_app.config['FOCA'].endpoints
+    return (
+        f"{conf['url_prefix']}://{conf['external_host']}:"
+        f"{conf['external_port']}/{conf['api_path']}/{object_id}"
     )
-    access_ids = []
-    for method in data:
-        access_id = generate_id(id_charset, id_length)
-        if access_id not in access_ids:
-            method['access_id'] = access_id
-            access_ids.append(access_id)
 
-    return data
 
+def __add_access_ids(data: List) -> List:
+    """Add access identifiers to posted access methods metadata.
 
-def generate_id(
-    charset: str = ''.join([string.ascii_letters, string.digits]),
-    length: int = 6
-) -> str:
-    """Generate random string based on allowed set of characters.
+    Access methods that have an identifier already keep it; all others are
+    assigned identifiers that are distinct from those.
 
     Args:
-        charset: String of allowed characters.
-        length: Length of returned string.
+        data: List of access method metadata objects.
 
     Returns:
-        Random string of specified length and composed of defined set of
-        allowed characters.
+        Access methods metadata complete with unique access identifiers.
+
+    Raises:
+        ValueError: More identifiers are needed than possible.
     """
-    return ''.join(choice(charset) for __ in range(length))
+    id_generator = get_id_generator('access_methods')
+    existing = {
+        method['access_id'] for method in data if 'access_id' in method
+    }
+    missing = [method for method in data if 'access_id' not in method]
+    if len(existing) + len(missing) > id_generator.space:
+        raise ValueError(
+            f"cannot generate {len(missing)} unique access identifiers; "
+            f"only {id_generator.space - len(existing)} are left"
+        )
+    while missing:
+        access_ids = id_generator.generate(count=len(missing))
+        for method, access_id in zip(missing, access_ids):
+            if access_id not in existing:
+                method['access_id'] = access_id
+                existing.add(access_id)
+        missing = [method for method in missing if 'access_id' not in method]
+    return data
@@ -2,16 +2,57 @@
 
 import logging
 
-from flask import current_app
-from typing import Dict
+from flask import (current_app, Flask)
+from typing import (Dict, Optional)
 
+from drs_filer.database.backends import get_storage
+from drs_filer.database.sessions import read_your_writes
 from drs_filer.errors.exceptions import (
     NotFound,
     ValidationError,
 )
+from drs_filer.ga4gh.drs.endpoints.object_cache import ObjectCache
 
 logger = logging.getLogger(__name__)
 
+# key of the service info entry in the service info cache
+CACHE_KEY = 'service_info'
+
+
+def get_service_info_cache(app: Optional[Flask] = None) -> ObjectCache:
+    """Get service info cache of an app, creating it on first use.
+
+    The cache holds a single entry, the latest service info and its version.
+    The cache is configured via `endpoints.service_info_cache` in the app
+    configuration. The entry expires after `ttl` seconds and is used without
+    querying the database until then, so that changes made by other workers
+    are picked up within `ttl` seconds. If `ttl` is `0`, the entry does not
+    expire, but its version is compared to the one in the database on every
+    request, so that such changes are picked up immediately. If that section
+    is missing, a disabled cache is returned.
+
+    Args:
+        app: Flask app; defaults to the current app.
+
+    Returns:
+        Service info cache of the app.
+    """
+    app = app or current_app
+    cache = app.extensions.get('drs_filer_service_info_cache')
+    if cache is None:
+        try:
+            conf = app.config['FOCA'].endpoints['service_info_cache']
+        except (AttributeError, KeyError):
+            conf = None
+        cache = app.extensions.setdefault(
+            'drs_filer_service_info_cache',
+            ObjectCache(
+                size=0 if conf is None else 1,
+                ttl=(conf or {}).get('ttl', 0),
+            ),
+        )
+    return cache
+
 
 class RegisterServiceInfo:
     """Tool class for registering service info.
@@ -31,7 +72,7 @@ class RegisterServiceInfo:
                 constructing tool and version `url` properties.
             api_path: Base path at which API endpoints can be reached. For
                 constructing tool and version `url` properties.
-            db_coll_info: Database collection storing service info objects.
+            storage: Storage backend storing service info objects.
             conf_info: Service info details as per enpoints config.
         """
         conf = current_app.config['FOCA'].endpoints
@@ -40,24 +81,48 @@ class RegisterServiceInfo:
         self.external_port = conf['external_port']
         self.api_path = conf['api_path']
         self.conf_info = conf['service_info']
-        self.db_coll_info = (
-            current_app.config['FOCA'].db.dbs['drsStore']
-            .collections['service_info'].client
-        )
+        self.storage = get_storage()
 
     def get_service_info(self) -> Dict:
-        """Get latest service info from database.
+        """Get latest service info, from the cache if it is current.
 
         Returns:
             Latest service info details.
         """
-        try:
-            return self.db_coll_info.find(
-                {},
-                {'_id': False}
-            ).sort([('_id', -1)]).limit(1).next()
-        except StopIteration:
+        cache = get_service_info_cache()
+        if not cache.enabled or read_your_writes():
+            return self._find_service_info()
+        entry = cache.get(CACHE_KEY)
+        if (
+            entry is not None and not cache.ttl and
+            entry['version'] != self.storage.get_service_info_version()
+        ):
+            entry = None
+        if entry is None:
+            generation = cache.generation
+            entry = {
+                'version': self.storage.get_service_info_version(),
+                'service_info': self._find_service_info(),
+            }
+            cache.set(CACHE_KEY, entry, generation=generation)
+        return entry['service_info']
+
+    def _find_service_info(
+            self,
+            for_update: bool = False,
+    ) -> Dict:
+        """Get latest service info from storage.
+
+        Args:
+            for_update: Whether a write depends on the result.
+
+        Returns:
+            Latest service info details.
+        """
+        data = self.storage.get_service_info(for_update=for_update)
+        if data is None:
             raise NotFound
+        return data
 
     def set_service_info_from_config(
             self,
@@ -98,12 +163,9 @@ class RegisterServiceInfo:
             self,
             data: Dict,
     ) -> None:
-        """Insert or updated service info document."""
-        self.db_coll_info.replace_one(
-            filter={'id': data['id']},
-            replacement=data,
-            upsert=True,
-        )
+        """Insert or updated service info document and drop cached copy."""
+        self.storage.upsert_service_info(data=data)
+        get_service_info_cache().invalidate(CACHE_KEY)
 
     def set_service_info_from_app_context(
         self,
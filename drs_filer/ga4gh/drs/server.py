@@ -1,51 +1,112 @@
 """Controllers for DRS endpoints."""
 
 import logging
-from typing import (Dict, Tuple)
+from typing import (Dict, Optional, Tuple)
 
 from flask import (current_app, request)
-from foca.utils.logging import log_traffic
 
+from drs_filer.database.backends import get_storage
+from drs_filer.database.sessions import read_your_writes
 from drs_filer.errors.exceptions import (
     AccessMethodNotFound,
     InternalServerError,
     ObjectNotFound,
-    URLNotFound,
     BadRequest,
 )
+from drs_filer.ga4gh.drs.endpoints.access_urls import select_access_url
+from drs_filer.ga4gh.drs.endpoints.bundles import (
+    expand_bundle,
+)
+from drs_filer.ga4gh.drs.endpoints.conditional import (
+    compute_etag,
+    etag_header,
+    not_modified,
+    pop_content_hash,
+)
+from drs_filer.ga4gh.drs.endpoints.get_access_urls import (
+    get_access_urls,
+)
+from drs_filer.ga4gh.drs.endpoints.get_objects import (
+    get_objects,
+)
+from drs_filer.ga4gh.drs.endpoints.list_objects import (
+    list_objects,
+)
+from drs_filer.ga4gh.drs.endpoints.object_cache import (
+    get_object_cache,
+)
 from drs_filer.ga4gh.drs.endpoints.register_objects import (
+    register_bulk_objects,
     register_object,
+    replace_object,
 )
 from drs_filer.ga4gh.drs.endpoints.service_info import (
+    get_service_info_cache,
     RegisterServiceInfo,
 )
+from drs_filer.tracing import (
+    set_span_attributes,
+    traced,
+)
+from drs_filer.traffic_logging import log_traffic
 
 logger = logging.getLogger(__name__)
 
 
 @log_traffic
-def GetObject(object_id: str) -> Dict:
+@traced
+def GetObject(
+    object_id: str,
+    expand: bool = False,
+) -> Tuple[Optional[Dict], int, Dict]:
     """Get DRS object.
 
     Args:
         object_id: Identifier of DRS object to be retrieved.
+        expand: Whether the contents of bundles should be expanded
+            recursively.
 
     Returns:
-        DRS object as dictionary, JSONified if returned in app context.
+        DRS object as dictionary, JSONified if returned in app context, with
+        its entity tag in the response headers; an empty 304 response if the
+        client's copy, as identified by the `If-None-Match` header, is
+        current.
     """
-    db_collection = (
-        current_app.config['FOCA'].db.dbs['drsStore'].
-        collections['objects'].client
-    )
-    obj = db_collection.find_one({"id": object_id})
-    if not obj:
-        raise ObjectNotFound
-    del obj["_id"]
-    return obj
+    cache = get_object_cache()
+    obj = None if read_your_writes() else cache.get(object_id)
+    set_span_attributes({'drs.cache_hit': obj is not None})
+    if obj is None:
+        # cached objects are read from the primary, so that they are never
+        # older than the writes of this worker, which invalidate them
+        generation = cache.generation
+        obj = get_storage().get_object(object_id, for_update=cache.enabled)
+        if not obj:
+            raise ObjectNotFound
+        cache.set(object_id, obj, generation=generation)
+    etag = pop_content_hash(obj)
+
+    # Entity tags of expanded bundles depend on the expanded contents
+    if expand and 'contents' in obj:
+        conf = current_app.config['FOCA'].endpoints['objects']
+        obj = expand_bundle(
+            obj=obj,
+            max_depth=conf['expand_max_depth'],
+            max_nodes=conf['expand_max_nodes'],
+        )
+        etag = compute_etag(obj)
+
+    headers = {'ETag': etag_header(etag)}
+    if not_modified(etag):
+        return None, 304, headers
+    return obj, 200, headers
 
 
 @log_traffic
-def GetAccessURL(object_id: str, access_id: str) -> Dict:
+@traced
+def GetAccessURL(
+    object_id: str,
+    access_id: str,
+) -> Tuple[Optional[Dict], int, Dict]:
     """Get access URL of DRS object.
 
     Args:
@@ -55,40 +116,178 @@ def GetAccessURL(object_id: str, access_id: str) -> Dict:
     Returns:
         Object with access information for DRS object, containing a URL and
         any relevant header information; response is JSONified if returned in
-        app context.
+        app context. The entity tag of the DRS object is returned in the
+        response headers; an empty 304 response is returned if the client's
+        copy, as identified by the `If-None-Match` header, is current.
+    """
+    # Use cached object if available; otherwise, retrieve only the matching
+    # access methods
+    obj = None if read_your_writes() else get_object_cache().get(object_id)
+    set_span_attributes({'drs.cache_hit': obj is not None})
+    if obj is None:
+        obj = get_storage().get_access_method(
+            object_id=object_id,
+            access_id=access_id,
+        )
+        if obj is None:
+            raise ObjectNotFound
+    etag = pop_content_hash(obj)
+    access_url = select_access_url(obj=obj, access_id=access_id)
+    headers = {'ETag': etag_header(etag)}
+    if not_modified(etag):
+        return None, 304, headers
+    return access_url, 200, headers
+
+
+@log_traffic
+@traced
+def GetBulkObjects() -> Dict:
+    """Get multiple DRS objects.
+
+    Returns:
+        Found DRS objects, in the order of the requested identifiers, and
+        identifiers of requested DRS objects that were not found; response is
+        JSONified if returned in app context.
+    """
+    max_size = (
+        current_app.config['FOCA'].endpoints['objects']['bulk_max_size']
+    )
+    object_ids = list(dict.fromkeys(request.json['bulk_object_ids']))
+    if len(object_ids) > max_size:
+        logger.error(
+            f"Requested {len(object_ids)} objects; at most {max_size} "
+            "objects can be requested at once."
+        )
+        raise BadRequest
+
+    objs = get_objects(object_ids)
+    return {
+        'resolved_drs_objects': [
+            objs[object_id] for object_id in object_ids
+            if object_id in objs
+        ],
+        'unresolved_object_ids': [
+            object_id for object_id in object_ids
+            if object_id not in objs
+        ],
+    }
+
+
+@log_traffic
+@traced
+def GetBulkAccessURLs() -> Dict:
+    """Get access URLs of multiple DRS objects.
+
+    Returns:
+        Resolved access URLs and errors of access URLs that could not be
+        resolved, each in the order in which they were requested; response
+        is JSONified if returned in app context.
     """
-    obj = GetObject.__wrapped__(object_id)
-    try:
-        access_methods = obj["access_methods"]
-        access_urls = [
-            d['access_url'] for d in access_methods
-            if d['access_id'] == access_id
-        ]
-    # An access methods dictionary is required for every object and it needs
-    # to contain a list of dictionaries wth keys `access_url` and `access_id`
-    except KeyError:
-        raise InternalServerError
-    if not access_urls:
-        raise URLNotFound
-    elif len(access_urls) == 1:
-        return access_urls[0]
-    # Access IDs should be unique
-    else:
-        raise InternalServerError
+    max_size = (
+        current_app.config['FOCA'].endpoints['objects']['bulk_max_size']
+    )
+    items = list(dict.fromkeys(
+        (item['object_id'], item.get('access_id'))
+        for item in request.json['bulk_access_ids']
+    ))
+    if len(items) > max_size:
+        logger.error(
+            f"Requested {len(items)} access URLs; at most {max_size} access "
+            "URLs can be requested at once."
+        )
+        raise BadRequest
+
+    resolved, unresolved = get_access_urls(
+        items=items,
+        access_type=request.json.get('access_type'),
+    )
+    return {
+        'resolved_access_urls': resolved,
+        'unresolved_access_urls': unresolved,
+    }
 
 
 @log_traffic
-def getServiceInfo() -> Dict:
+@traced
+def ListObjects(
+    page_size: Optional[int] = None,
+    page_token: Optional[str] = None,
+    name: Optional[str] = None,
+    mime_type: Optional[str] = None,
+    checksum: Optional[str] = None,
+    access_type: Optional[str] = None,
+    created_after: Optional[str] = None,
+    created_before: Optional[str] = None,
+) -> Dict:
+    """List DRS objects, optionally filtered, page by page.
+
+    Args:
+        page_size: Maximum number of objects per page; defaults to, and may
+            not exceed, the configured page sizes.
+        page_token: Token returned with the previous page, if any.
+        name: Name of the objects.
+        mime_type: MIME type of the objects.
+        checksum: Value of any of the objects' checksums.
+        access_type: Type of any of the objects' access methods.
+        created_after: Earliest creation time of the objects, inclusive.
+        created_before: Latest creation time of the objects, exclusive.
+
+    Returns:
+        Page of DRS objects and, unless it is the last page, the token of the
+        next page; response is JSONified if returned in app context.
+    """
+    conf = current_app.config['FOCA'].endpoints['objects']
+    max_size = conf['list_max_page_size']
+    if page_size is None:
+        page_size = conf['list_page_size']
+    if page_size > max_size:
+        logger.error(
+            f"Requested {page_size} objects per page; at most {max_size} "
+            "objects can be listed at once."
+        )
+        raise BadRequest
+
+    objs, next_page_token = list_objects(
+        page_size=page_size,
+        page_token=page_token,
+        name=name,
+        mime_type=mime_type,
+        checksum=checksum,
+        access_type=access_type,
+        created_after=created_after,
+        created_before=created_before,
+    )
+    response: Dict = {'drs_objects': objs}
+    if next_page_token is not None:
+        response['next_page_token'] = next_page_token
+    return response
+
+
+@log_traffic
+@traced
+def getServiceInfo() -> Tuple[Optional[Dict], int, Dict]:
     """Show information about this service.
 
     Returns:
-        An empty 201 response with headers.
+        Service info, with an entity tag and caching directives in the
+        response headers; an empty 304 response if the client's copy, as
+        identified by the `If-None-Match` header, is current.
     """
     service_info = RegisterServiceInfo()
-    return service_info.get_service_info()
+    data = service_info.get_service_info()
+    etag = compute_etag(data)
+    ttl = get_service_info_cache().ttl
+    headers = {
+        'ETag': etag_header(etag),
+        'Cache-Control': f'max-age={int(ttl)}' if ttl else 'no-cache',
+    }
+    if not_modified(etag):
+        return None, 304, headers
+    return data, 200, headers
 
 
 @log_traffic
+@traced
 def postServiceInfo() -> Tuple[None, str, Dict]:
     """Show information about this service.
 
@@ -101,6 +300,7 @@ def postServiceInfo() -> Tuple[None, str, Dict]:
 
 
 @log_traffic
+@traced
 def DeleteObject(object_id):
     """Delete DRS object.
 
@@ -110,20 +310,14 @@ def DeleteObject(object_id):
     Returns:
         `object_id` of deleted object.
     """
-
-    db_collection = (
-        current_app.config['FOCA'].db.dbs['drsStore'].
-        collections['objects'].client
-    )
-    obj = db_collection.find_one({"id": object_id})
-    if not obj:
+    if not get_storage().delete_object(object_id):
         raise ObjectNotFound
-    else:
-        db_collection.delete_one({"id": object_id})
-        return object_id
+    get_object_cache().invalidate(object_id)
+    return object_id
 
 
 @log_traffic
+@traced
 def DeleteAccessMethod(object_id: str, access_id: str) -> str:
     """Delete DRS object's Access Method.
 
@@ -136,13 +330,19 @@ def DeleteAccessMethod(object_id: str, access_id: str) -> str:
         `BadRequest/400` error response is returned if attempting to delete
         the only remaining access method.
     """
-
-    db_collection = (
-        current_app.config['FOCA'].db.dbs['drsStore'].
-        collections['objects'].client
+    storage = get_storage()
+    modified = storage.pull_access_method(
+        object_id=object_id,
+        access_id=access_id,
     )
+    get_object_cache().invalidate(object_id)
+    if modified:
+        return access_id
 
-    obj = GetObject.__wrapped__(object_id=object_id)
+    # find out why the access method was not removed
+    obj = storage.get_object(object_id, for_update=True)
+    if not obj:
+        raise ObjectNotFound
     access_methods = obj['access_methods']
 
     if access_id not in [m.get('access_id', None) for m in access_methods]:
@@ -155,39 +355,65 @@ def DeleteAccessMethod(object_id: str, access_id: str) -> str:
         )
         raise BadRequest
 
-    del_access_methods = db_collection.update_one(
-        filter={'id': object_id},
-        update={
-            '$pull': {
-                'access_methods': {'access_id': access_id},
-            },
-        },
-    )
-
-    if del_access_methods.modified_count:
-        return access_id
-    else:
-        raise InternalServerError
+    raise InternalServerError
 
 
 @log_traffic
+@traced
 def PostObject() -> str:
     """Register new DRS object."""
     return register_object(data=request.json)
 
 
 @log_traffic
-def PutObject(object_id: str):
+@traced
+def PostBulkObjects() -> Dict:
+    """Register multiple new DRS objects.
+
+    Returns:
+        Identifiers of created objects, mapped to the position of the
+        respective object in the request; response is JSONified if returned
+        in app context.
+    """
+    max_size = (
+        current_app.config['FOCA'].endpoints['objects']['bulk_max_size']
+    )
+    objects = request.json['drs_objects']
+    if len(objects) > max_size:
+        logger.error(
+            f"Submitted {len(objects)} objects; at most {max_size} objects "
+            "can be registered at once."
+        )
+        raise BadRequest
+    object_ids = register_bulk_objects(data=objects)
+    return {
+        'registered_objects': [
+            {'index': index, 'object_id': object_id}
+            for index, object_id in enumerate(object_ids)
+        ],
+    }
+
+
+@log_traffic
+@traced
+def PutObject(object_id: str) -> Tuple[str, int]:
     """Add/replace DRS object with a user-supplied ID.
 
     Args:
         object_id: Identifier of DRS object to be created/updated.
 
     Returns:
-        Identifier of created/updated DRS object.
+        Identifier of created/updated DRS object, with status 201 if it was
+        created and 200 if it was replaced or is unchanged.
 
+    Raises:
+        drs_filer.errors.exceptions.PreconditionFailed: An `If-Match` header
+            was passed and the existing object does not match it, or no
+            object exists.
     """
-    return register_object(
+    created = replace_object(
         data=request.json,
         object_id=object_id,
+        if_match=request.if_match,
     )
+    return object_id, 201 if created else 200
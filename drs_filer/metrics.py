@@ -0,0 +1,460 @@
+"""Collection and export of metrics in the Prometheus text format."""
+
+from functools import wraps
+import logging
+import os
+from threading import Lock
+from time import perf_counter
+from typing import (
+    Any,
+    Callable,
+    Dict,
+    Iterator,
+    Optional,
+    Sequence,
+    Tuple,
+)
+
+from flask import (current_app, Flask, g, request, Response)
+from prometheus_client import (
+    CollectorRegistry,
+    CONTENT_TYPE_LATEST,
+    Counter,
+    Gauge,
+    generate_latest,
+    Histogram,
+)
+from prometheus_client.core import (GaugeMetricFamily, Metric)
+from prometheus_client.multiprocess import (
+    mark_process_dead,
+    MultiProcessCollector,
+)
+from pymongo.monitoring import CommandListener
+
+from drs_filer.database.mongo_client import get_pool_monitor
+from drs_filer.ga4gh.drs.endpoints.object_cache import get_object_cache
+from drs_filer.ga4gh.drs.endpoints.service_info import get_service_info_cache
+
+logger = logging.getLogger(__name__)
+
+# upper bounds of latency histogram buckets, in seconds
+DEFAULT_BUCKETS = (
+    0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0,
+)
+CONTENT_TYPE = CONTENT_TYPE_LATEST
+# environment variable setting the directory in which the worker processes
+# of a server share their metrics, as read by `prometheus_client`
+MULTIPROCESS_DIR_VARIABLE = 'PROMETHEUS_MULTIPROC_DIR'
+
+
+class CacheHitRatioCollector:
+    """Collector adding cache hit ratios, computed from the counts of cache
+    lookups, to the metrics of another collector.
+
+    Args:
+        source: Collector of all other metrics, including
+            `drs_filer_cache_requests_total`.
+    """
+
+    def __init__(self, source: Any) -> None:
+        """Class constructor."""
+        self.source = source
+
+    def collect(self) -> Iterator[Metric]:
+        """Collect metrics of the source and cache hit ratios.
+
+        Yields:
+            Metric families.
+        """
+        hits: Dict[str, float] = {}
+        lookups: Dict[str, float] = {}
+        for family in self.source.collect():
+            yield family
+            for sample in family.samples:
+                if sample.name != 'drs_filer_cache_requests_total':
+                    continue
+                cache = sample.labels['cache']
+                lookups[cache] = lookups.get(cache, 0) + sample.value
+                if sample.labels['result'] == 'hit':
+                    hits[cache] = hits.get(cache, 0) + sample.value
+        ratios = GaugeMetricFamily(
+            'drs_filer_cache_hit_ratio',
+            'Fraction of cache lookups answered from the cache.',
+            labels=['cache'],
+        )
+        for cache, count in sorted(lookups.items()):
+            ratios.add_metric([cache], hits.get(cache, 0) / count)
+        yield ratios
+
+
+class CommandTimer(CommandListener):
+    """Command listener recording the duration of database commands.
+
+    Args:
+        histogram: Histogram to which durations are added, labelled by
+            command name.
+        failures: Counter of failed commands, labelled by command name.
+    """
+
+    def __init__(
+        self,
+        histogram: Histogram,
+        failures: Counter,
+    ) -> None:
+        """Class constructor."""
+        self.histogram = histogram
+        self.failures = failures
+
+    def started(self, event) -> None:
+        """Ignore event; durations are reported by the driver."""
+
+    def succeeded(self, event) -> None:
+        """Record duration of successful command."""
+        self.histogram.labels(event.command_name).observe(
+            event.duration_micros / 1e6,
+        )
+
+    def failed(self, event) -> None:
+        """Record duration of failed command."""
+        self.histogram.labels(event.command_name).observe(
+            event.duration_micros / 1e6,
+        )
+        self.failures.labels(event.command_name).inc()
+
+
+class Metrics:
+    """Metrics of an app.
+
+    Metrics are kept per process, unless the environment variable
+    `PROMETHEUS_MULTIPROC_DIR` names a directory in which the worker
+    processes of a server share their values, as supported by
+    `prometheus_client`; metrics are then reported for all workers
+    combined, whichever worker serves them.
+
+    Args:
+        buckets: Upper bounds of latency histogram buckets, in seconds.
+
+    Attributes:
+        registry: Registry of the metrics of the current process.
+        multiprocess: Whether worker processes share their metrics.
+        requests: Counter of requests by operation, method and status code.
+        request_duration: Histogram of request latencies by operation.
+        errors: Counter of error responses by operation, status code and
+            exception, as listed in the app's exception map.
+        db_command_duration: Histogram of database command latencies by
+            command name.
+        db_command_failures: Counter of failed database commands by command
+            name.
+        cache_requests: Counter of cache lookups by cache and result.
+        pool_checkouts: Counter of database connection checkouts by result.
+        pool_wait: Counter of time spent waiting for database connections,
+            in seconds.
+        pool_wait_max: Gauge of the longest time spent waiting for a
+            database connection, in seconds.
+        pool_connections: Gauge of open database connections.
+        command_listener: Listener recording database command latencies, to
+            be passed to the database client.
+    """
+
+    def __init__(
+        self,
+        buckets: Sequence[float] = DEFAULT_BUCKETS,
+    ) -> None:
+        """Class constructor."""
+        registry = self.registry = CollectorRegistry()
+        self.multiprocess = bool(os.environ.get(MULTIPROCESS_DIR_VARIABLE))
+        self.requests = Counter(
+            'drs_filer_requests_total',
+            'Number of requests.',
+            ('operation', 'method', 'status'),
+            registry=registry,
+        )
+        self.request_duration = Histogram(
+            'drs_filer_request_duration_seconds',
+            'Request latency in seconds.',
+            ('operation',),
+            buckets=buckets,
+            registry=registry,
+        )
+        self.errors = Counter(
+            'drs_filer_errors_total',
+            'Number of error responses.',
+            ('operation', 'status', 'exception'),
+            registry=registry,
+        )
+        self.db_command_duration = Histogram(
+            'drs_filer_db_command_duration_seconds',
+            'Database command latency in seconds.',
+            ('command',),
+            buckets=buckets,
+            registry=registry,
+        )
+        self.db_command_failures = Counter(
+            'drs_filer_db_command_failures_total',
+            'Number of failed database commands.',
+            ('command',),
+            registry=registry,
+        )
+        self.cache_requests = Counter(
+            'drs_filer_cache_requests_total',
+            'Number of cache lookups by result.',
+            ('cache', 'result'),
+            registry=registry,
+        )
+        self.pool_checkouts = Counter(
+            'drs_filer_db_pool_checkouts_total',
+            'Number of database connection checkouts by result.',
+            ('result',),
+            registry=registry,
+        )
+        self.pool_wait = Counter(
+            'drs_filer_db_pool_wait_seconds_total',
+            'Time spent waiting for database connections, in seconds.',
+            registry=registry,
+        )
+        self.pool_wait_max = Gauge(
+            'drs_filer_db_pool_wait_max_seconds',
+            'Longest time spent waiting for a database connection, in '
+            'seconds.',
+            multiprocess_mode='max',
+            registry=registry,
+        )
+        self.pool_connections = Gauge(
+            'drs_filer_db_pool_connections',
+            'Number of open database connections.',
+            multiprocess_mode='livesum',
+            registry=registry,
+        )
+        self.command_listener = CommandTimer(
+            histogram=self.db_command_duration,
+            failures=self.db_command_failures,
+        )
+        self._operations: Dict[str, str] = {}
+        self._totals: Dict[Tuple[Counter, Tuple[str, ...]], float] = {}
+        self._lock = Lock()
+
+    def update(self, app: Flask) -> None:
+        """Copy statistics kept by caches and the database client of the
+        current process to the metrics.
+
+        Counters are increased by the amount the statistics have grown by
+        since the last update.
+
+        Args:
+            app: Flask app.
+        """
+        totals: Dict[Tuple[Counter, Tuple[str, ...]], float] = {}
+        for name, cache in (
+            ('objects', get_object_cache(app=app)),
+            ('service_info', get_service_info_cache(app=app)),
+        ):
+            stats = cache.stats()
+            totals[(self.cache_requests, (name, 'hit'))] = stats['hits']
+            totals[(self.cache_requests, (name, 'miss'))] = stats['misses']
+        monitor = get_pool_monitor(app=app)
+        if monitor is not None:
+            stats = monitor.stats()
+            totals[(self.pool_checkouts, ('success',))] = stats['checkouts']
+            totals[(self.pool_checkouts, ('failure',))] = stats['failures']
+            totals[(self.pool_wait, ())] = stats['wait_total']
+            self.pool_wait_max.set(stats['wait_max'])
+            self.pool_connections.set(stats['connections'])
+        with self._lock:
+            for key, total in totals.items():
+                increase = total - self._totals.get(key, 0)
+                if increase <= 0:
+                    continue
+                counter, labels = key
+                (counter.labels(*labels) if labels else counter).inc(increase)
+                self._totals[key] = total
+
+    def close(self) -> None:
+        """Discard gauge values of live processes recorded by the current
+        process, which is about to exit, if metrics are shared."""
+        if self.multiprocess:
+            mark_process_dead(os.getpid())
+
+    def expose(self) -> bytes:
+        """Render all metrics in the Prometheus text format.
+
+        Returns:
+            Metrics in the Prometheus text exposition format, of all worker
+            processes if they share their metrics.
+        """
+        source = (
+            MultiProcessCollector(None) if self.multiprocess
+            else self.registry
+        )
+        return generate_latest(CacheHitRatioCollector(source=source))
+
+    def record_request(
+        self,
+        operation: str,
+        method: str,
+        status: int,
+        duration: float,
+        exception: str = '',
+    ) -> None:
+        """Record metrics of a request.
+
+        Args:
+            operation: Operation identifier.
+            method: HTTP method.
+            status: Response status code.
+            duration: Duration of request, in seconds.
+            exception: Name of the exception causing an error response, if
+                any, as returned by `get_exception_label()`.
+        """
+        self.requests.labels(operation, method, str(status)).inc()
+        self.request_duration.labels(operation).observe(duration)
+        if status >= 400:
+            self.errors.labels(operation, str(status), exception).inc()
+
+    def get_operation(self, endpoint: Optional[str]) -> str:
+        """Get operation identifier of an endpoint.
+
+        Args:
+            endpoint: Flask endpoint name.
+
+        Returns:
+            Name of the view function, which for API endpoints is the
+            `operationId`, or an empty string for unmatched requests.
+        """
+        if endpoint is None:
+            return ''
+        operation = self._operations.get(endpoint)
+        if operation is None:
+            view = current_app.view_functions.get(endpoint)
+            operation = self._operations[endpoint] = getattr(
+                view, '__name__', endpoint,
+            )
+        return operation
+
+
+def register_metrics(app: Flask) -> Optional[Metrics]:
+    """Collect request metrics and serve them in the Prometheus text format.
+
+    Metrics are configured in the custom `metrics` section of the app
+    configuration: `enabled` switches collection on or off, `path` sets the
+    route under which metrics are served (default: `/metrics`) and `buckets`
+    the upper bounds of latency histogram buckets, in seconds. If the
+    environment variable `PROMETHEUS_MULTIPROC_DIR` is set, the worker
+    processes of a server share their values via files in that directory,
+    which is cleared by `clear_metrics()` before a server starts. Requests
+    are attributed to the view functions registered so far, i.e., to the
+    operations of APIs added before, by `operationId`. Database command
+    latencies are recorded by database clients created afterwards with
+    `create_mongo_client()`.
+
+    Args:
+        app: Flask app.
+
+    Returns:
+        Metrics, or `None` if metrics are disabled.
+    """
+    conf = getattr(app.config['FOCA'], 'metrics', None) or {}
+    if not conf.get('enabled', False):
+        logger.info("Metrics disabled.")
+        return None
+    metrics = Metrics(buckets=conf.get('buckets', DEFAULT_BUCKETS))
+    app.extensions['drs_filer_metrics'] = metrics
+    app.before_request(_start_timer)
+    app.after_request(_record_request)
+    for endpoint, view in app.view_functions.items():
+        app.view_functions[endpoint] = _record_exception(view)
+    app.add_url_rule(
+        conf.get('path', '/metrics'),
+        'drs_filer_metrics',
+        _serve_metrics,
+    )
+    logger.info(f"Serving metrics at '{conf.get('path', '/metrics')}'.")
+    return metrics
+
+
+def clear_metrics() -> None:
+    """Remove metrics shared by the worker processes of a previous server run,
+    if the environment variable `PROMETHEUS_MULTIPROC_DIR` is set; the
+    directory is created if missing."""
+    directory = os.environ.get(MULTIPROCESS_DIR_VARIABLE)
+    if not directory:
+        return
+    os.makedirs(directory, exist_ok=True)
+    for entry in os.scandir(directory):
+        if entry.name.endswith('.db'):
+            os.remove(entry.path)
+    logger.info(f"Cleared metrics shared via '{directory}'.")
+
+
+def get_metrics(app: Flask) -> Optional[Metrics]:
+    """Get metrics of an app.
+
+    Args:
+        app: Flask app.
+
+    Returns:
+        Metrics, or `None` if metrics are not registered.
+    """
+    return app.extensions.get('drs_filer_metrics')
+
+
+def get_exception_label(app: Flask, exception: Exception) -> str:
+    """Get label under which an exception is recorded.
+
+    Args:
+        app: Flask app.
+        exception: Exception raised while handling a request.
+
+    Returns:
+        Name of the exception's type if it is listed in the app's exception
+        map, `Exception`, under which FOCA handles them, otherwise.
+    """
+    mapping = app.config['FOCA'].exceptions.mapping
+    return (
+        type(exception).__name__ if type(exception) in mapping
+        else Exception.__name__
+    )
+
+
+def _start_timer() -> None:
+    """Record start time of request."""
+    g.drs_filer_request_start = perf_counter()
+
+
+def _record_request(response: Response) -> Response:
+    """Record request metrics."""
+    start = g.pop('drs_filer_request_start', None)
+    if start is None:
+        return response
+    metrics = current_app.extensions['drs_filer_metrics']
+    metrics.record_request(
+        operation=metrics.get_operation(request.endpoint),
+        method=request.method,
+        status=response.status_code,
+        duration=perf_counter() - start,
+        exception=g.pop('drs_filer_exception', ''),
+    )
+    if metrics.multiprocess:
+        metrics.update(app=current_app)
+    return response
+
+
+def _record_exception(view: Callable) -> Callable:
+    """Wrap view function to record the type of exceptions it raises."""
+    @wraps(view)
+    def wrapper(*args, **kwargs) -> Any:
+        try:
+            return view(*args, **kwargs)
+        except Exception as exception:
+            g.drs_filer_exception = get_exception_label(
+                app=current_app,
+                exception=exception,
+            )
+            raise
+    return wrapper
+
+
+def _serve_metrics() -> Response:
+    """Serve metrics of current app."""
+    metrics = current_app.extensions['drs_filer_metrics']
+    metrics.update(app=current_app)
+    return Response(metrics.expose(), content_type=CONTENT_TYPE)
@@ -0,0 +1,133 @@
+"""Serialization and validation of API responses."""
+
+import logging
+from random import random
+from typing import Any
+
+from connexion.apis.flask_api import FlaskApi
+from connexion.decorators.response import ResponseValidator
+from connexion.jsonifier import Jsonifier
+from connexion.operations.abstract import VALIDATOR_MAP
+from flask import (current_app, Flask, json)
+
+from drs_filer.tracing import start_span
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+logger = logging.getLogger(__name__)
+
+
+class StdlibJSON:
+    """JSON library based on the standard library, via Flask.
+
+    Responses are serialized compactly, with the app's JSON encoder.
+    """
+
+    @staticmethod
+    def dumps(data: Any, **kwargs) -> str:
+        """Serialize data to JSON."""
+        kwargs.pop('indent', None)
+        return json.dumps(data, separators=(',', ':'), **kwargs)
+
+    @staticmethod
+    def loads(data: Any) -> Any:
+        """Deserialize JSON data."""
+        return json.loads(data)
+
+
+class OrJSON:
+    """JSON library based on `orjson`.
+
+    Types not supported by `orjson` are serialized with the app's JSON
+    encoder.
+    """
+
+    @staticmethod
+    def dumps(data: Any, **kwargs) -> str:
+        """Serialize data to JSON."""
+        return orjson.dumps(data, default=_default).decode()
+
+    @staticmethod
+    def loads(data: Any) -> Any:
+        """Deserialize JSON data."""
+        return orjson.loads(data)
+
+
+# JSON libraries available for serializing responses
+JSON_LIBRARIES = {
+    'json': StdlibJSON,
+    'orjson': OrJSON,
+}
+
+
+class SampledResponseValidator(ResponseValidator):
+    """Response validator that validates only a sample of responses.
+
+    The fraction of validated responses is configured per environment (as
+    set in `server.environment`) via `responses.validation_sample_rates` in
+    the app configuration; in environments that are not listed, all
+    responses are validated. Responses are only validated at all for specs
+    with `validate_responses` set.
+    """
+
+    def validate_response(self, data, status_code, headers, url) -> bool:
+        """Validate response, if sampled."""
+        if random() >= get_validation_sample_rate():
+            return True
+        with start_span('validate response'):
+            return super().validate_response(
+                data, status_code, headers, url,
+            )
+
+
+def get_validation_sample_rate() -> float:
+    """Get fraction of responses validated in the current environment.
+
+    Returns:
+        Fraction of responses to validate.
+    """
+    conf = current_app.config['FOCA']
+    rates = (getattr(conf, 'responses', None) or {}).get(
+        'validation_sample_rates'
+    ) or {}
+    return rates.get(conf.server.environment, 1)
+
+
+def register_response_validator() -> None:
+    """Use `SampledResponseValidator` for all subsequently added APIs."""
+    VALIDATOR_MAP['response'] = SampledResponseValidator
+
+
+def register_json_library(app: Flask) -> str:
+    """Set the JSON library used for serializing responses.
+
+    The library is configured via `responses.json_library` in the app
+    configuration and applies to all APIs; if the configured library is not
+    installed, the standard library is used.
+
+    Args:
+        app: Flask app.
+
+    Returns:
+        Name of the JSON library used.
+    """
+    conf = getattr(app.config['FOCA'], 'responses', None) or {}
+    name = conf.get('json_library', 'json')
+    if name not in JSON_LIBRARIES:
+        raise ValueError(f"unknown JSON library: '{name}'")
+    if name == 'orjson' and orjson is None:
+        logger.warning(
+            "JSON library 'orjson' is not installed; using 'json' instead."
+        )
+        name = 'json'
+    FlaskApi.jsonifier = Jsonifier(JSON_LIBRARIES[name])
+    logger.info(f"Serializing responses with JSON library '{name}'.")
+    return name
+
+
+def _default(obj: Any) -> Any:
+    """Serialize objects of types not supported by `orjson`."""
+    return current_app.json_encoder().default(obj)
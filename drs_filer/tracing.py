@@ -0,0 +1,280 @@
+"""Tracing of requests, controllers and database commands."""
+
+from contextlib import contextmanager
+from functools import wraps
+import logging
+from threading import Lock
+from typing import (Any, Callable, Dict, Iterator, Optional, Tuple)
+
+from flask import (current_app, Flask, has_app_context, request)
+from pymongo.monitoring import CommandListener
+
+try:
+    from opentelemetry import trace
+    from opentelemetry.sdk.resources import Resource
+    from opentelemetry.sdk.trace import TracerProvider
+    from opentelemetry.sdk.trace.export import (
+        BatchSpanProcessor,
+        ConsoleSpanExporter,
+        SimpleSpanProcessor,
+    )
+    from opentelemetry.sdk.trace.export.in_memory_span_exporter import (
+        InMemorySpanExporter,
+    )
+    from opentelemetry.trace import (SpanKind, Status, StatusCode)
+except ImportError:
+    trace = None
+
+logger = logging.getLogger(__name__)
+
+# span exporters; spans are exported as they end by `console` and `memory`,
+# which are meant for local testing, and in batches by `otlp`
+EXPORTERS = ('console', 'memory', 'otlp')
+
+
+class CommandTracer(CommandListener):
+    """Database command listener tracing every command in a span.
+
+    Commands are run, and listeners notified, in the thread issuing them, so
+    spans are children of the span that is current when a command starts.
+
+    Args:
+        tracer: OpenTelemetry tracer.
+
+    Attributes:
+        tracer: OpenTelemetry tracer.
+    """
+
+    def __init__(self, tracer: Any) -> None:
+        """Class constructor."""
+        self.tracer = tracer
+        self._spans: Dict[Tuple[int, Any], Any] = {}
+        self._lock = Lock()
+
+    def started(self, event) -> None:
+        """Start span of command."""
+        command = event.command.get(event.command_name)
+        attributes = {
+            'db.system': 'mongodb',
+            'db.name': event.database_name,
+            'db.operation': event.command_name,
+        }
+        if isinstance(command, str):
+            attributes['db.mongodb.collection'] = command
+        span = self.tracer.start_span(
+            f"mongodb.{event.command_name}",
+            kind=SpanKind.CLIENT,
+            attributes=attributes,
+        )
+        with self._lock:
+            self._spans[(event.request_id, event.connection_id)] = span
+
+    def succeeded(self, event) -> None:
+        """End span of successful command."""
+        span = self._pop_span(event)
+        if span is not None:
+            span.end()
+
+    def failed(self, event) -> None:
+        """End span of failed command."""
+        span = self._pop_span(event)
+        if span is not None:
+            span.set_status(Status(StatusCode.ERROR, str(event.failure)))
+            span.end()
+
+    def _pop_span(self, event) -> Any:
+        """Remove and return span of command, if any."""
+        with self._lock:
+            return self._spans.pop(
+                (event.request_id, event.connection_id),
+                None,
+            )
+
+
+class Tracing:
+    """Tracer of an app and the means of exporting its spans.
+
+    Spans are kept per process and exported by each worker process.
+
+    Args:
+        provider: OpenTelemetry tracer provider, with a span processor
+            attached.
+        exporter: Span exporter, e.g., to read spans recorded in memory.
+
+    Attributes:
+        provider: OpenTelemetry tracer provider.
+        exporter: Span exporter.
+        tracer: OpenTelemetry tracer.
+        command_listener: Listener tracing database commands, to be passed to
+            the database client.
+    """
+
+    def __init__(self, provider: Any, exporter: Any) -> None:
+        """Class constructor."""
+        self.provider = provider
+        self.exporter = exporter
+        self.tracer = provider.get_tracer(__name__)
+        self.command_listener = CommandTracer(tracer=self.tracer)
+
+
+def register_tracing(app: Flask) -> Optional[Tracing]:
+    """Trace requests with OpenTelemetry.
+
+    Every request is traced in a span, with child spans for request and
+    response validation, the controller and every database command. Tracing
+    is configured in the custom `tracing` section of the app configuration:
+    `enabled` switches it on or off, `service_name` sets the name under which
+    spans are reported and `exporter` how they are exported, i.e., to
+    standard output (`console`), into memory (`memory`) or to an
+    OpenTelemetry collector (`otlp`) at `endpoint`. Requests are traced for
+    the view functions registered so far, i.e., for the operations of APIs
+    added before. Database commands are traced for database clients created
+    afterwards with `create_mongo_client()`.
+
+    Args:
+        app: Flask app.
+
+    Returns:
+        Tracing, or `None` if tracing is disabled or OpenTelemetry is not
+        installed.
+
+    Raises:
+        ValueError: The configured exporter is unknown.
+    """
+    conf = getattr(app.config['FOCA'], 'tracing', None) or {}
+    if not conf.get('enabled', False):
+        return None
+    name = conf.get('exporter', 'console')
+    if name not in EXPORTERS:
+        raise ValueError(f"unknown span exporter: '{name}'")
+    if trace is None:
+        logger.warning("OpenTelemetry is not installed; tracing disabled.")
+        return None
+    exporter = _create_exporter(name=name, endpoint=conf.get('endpoint'))
+    if exporter is None:
+        return None
+    provider = TracerProvider(resource=Resource.create({
+        'service.name': conf.get('service_name', 'drs-filer'),
+    }))
+    provider.add_span_processor(
+        BatchSpanProcessor(exporter) if name == 'otlp'
+        else SimpleSpanProcessor(exporter)
+    )
+    tracing = Tracing(provider=provider, exporter=exporter)
+    app.extensions['drs_filer_tracing'] = tracing
+    for endpoint, view in app.view_functions.items():
+        app.view_functions[endpoint] = _trace_request(view)
+    logger.info(f"Tracing requests with span exporter '{name}'.")
+    return tracing
+
+
+def get_tracing(app: Flask) -> Optional[Tracing]:
+    """Get tracing of an app.
+
+    Args:
+        app: Flask app.
+
+    Returns:
+        Tracing, or `None` if tracing is not registered.
+    """
+    return app.extensions.get('drs_filer_tracing')
+
+
+@contextmanager
+def start_span(
+    name: str,
+    attributes: Optional[Dict] = None,
+) -> Iterator[None]:
+    """Trace a block of code in a child span of the current span.
+
+    Does nothing outside an app context or if tracing is not registered for
+    the current app.
+
+    Args:
+        name: Name of the span.
+        attributes: Attributes of the span.
+    """
+    tracing = (
+        current_app.extensions.get('drs_filer_tracing')
+        if has_app_context() else None
+    )
+    if tracing is None:
+        yield
+        return
+    with tracing.tracer.start_as_current_span(name, attributes=attributes):
+        yield
+
+
+def set_span_attributes(attributes: Dict) -> None:
+    """Set attributes of the current span, if it is recorded.
+
+    Args:
+        attributes: Attributes of the span.
+    """
+    if trace is None:
+        return
+    span = trace.get_current_span()
+    if span.is_recording():
+        span.set_attributes(attributes)
+
+
+def traced(fn: Callable) -> Callable:
+    """Decorator tracing a controller in a span named after it.
+
+    The identifiers of the DRS object and access method a controller is
+    called for, if any, are set as attributes of the span.
+
+    Args:
+        fn: Controller.
+
+    Returns:
+        Decorated controller.
+    """
+    @wraps(fn)
+    def wrapper(*args, **kwargs) -> Any:
+        attributes = {
+            f"drs.{key}": kwargs[key]
+            for key in ('object_id', 'access_id')
+            if key in kwargs
+        }
+        with start_span(fn.__name__, attributes=attributes):
+            return fn(*args, **kwargs)
+    return wrapper
+
+
+def _create_exporter(name: str, endpoint: Optional[str] = None) -> Any:
+    """Create span exporter, or return `None` if it is not installed."""
+    if name == 'memory':
+        return InMemorySpanExporter()
+    if name == 'console':
+        return ConsoleSpanExporter()
+    try:
+        from opentelemetry.exporter.otlp.proto.http.trace_exporter import (
+            OTLPSpanExporter,
+        )
+    except ImportError:
+        logger.warning(
+            "OTLP span exporter is not installed; tracing disabled."
+        )
+        return None
+    return OTLPSpanExporter(endpoint=endpoint)
+
+
+def _trace_request(view: Callable) -> Callable:
+    """Wrap view function to trace requests, including their validation."""
+    @wraps(view)
+    def wrapper(*args, **kwargs) -> Any:
+        tracer = current_app.extensions['drs_filer_tracing'].tracer
+        with tracer.start_as_current_span(
+            f"{request.method} {request.url_rule}",
+            kind=SpanKind.SERVER,
+            attributes={
+                'http.method': request.method,
+                'http.route': str(request.url_rule),
+                'drs.operation': view.__name__,
+            },
+        ) as span:
+            response = current_app.make_response(view(*args, **kwargs))
+            span.set_attribute('http.status_code', response.status_code)
+            return response
+    return wrapper
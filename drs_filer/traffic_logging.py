@@ -0,0 +1,214 @@
+"""Structured, asynchronous logging of requests."""
+
+import atexit
+from functools import wraps
+import json
+import logging
+from logging.handlers import (QueueHandler, QueueListener)
+from queue import SimpleQueue
+from random import random
+import sys
+from time import perf_counter
+from typing import (Any, Callable, Dict, Optional)
+
+from flask import (current_app, Flask, g, request, Response)
+
+# logger of request summaries; its records are written by a background thread
+logger = logging.getLogger('drs_filer.traffic')
+
+
+class JSONFormatter(logging.Formatter):
+    """Formatter writing log records as JSON lines.
+
+    The fields passed in the `traffic` attribute of a record, e.g., via
+    `extra={'traffic': {...}}`, are included at the top level.
+    """
+
+    def format(self, record: logging.LogRecord) -> str:
+        """Format log record as a single line of JSON."""
+        entry = {
+            'time': self.formatTime(record),
+            'level': record.levelname,
+            'logger': record.name,
+            'message': record.getMessage(),
+        }
+        entry.update(getattr(record, 'traffic', {}))
+        return json.dumps(entry, default=str, separators=(',', ':'))
+
+
+class TrafficLogger:
+    """Settings and background thread for logging request summaries.
+
+    Args:
+        sample_rate: Fraction of successful requests that are logged;
+            requests with error responses are always logged.
+        payloads: Whether request and response payloads are logged.
+        max_payload_length: Number of characters after which logged payloads
+            are truncated.
+
+    Attributes:
+        sample_rate: Fraction of successful requests that are logged.
+        payloads: Whether request and response payloads are logged.
+        max_payload_length: Number of characters after which logged payloads
+            are truncated.
+        listener: Listener writing queued log records, if started.
+    """
+
+    def __init__(
+        self,
+        sample_rate: float = 1,
+        payloads: bool = False,
+        max_payload_length: int = 1000,
+    ) -> None:
+        """Class constructor."""
+        self.sample_rate = sample_rate
+        self.payloads = payloads
+        self.max_payload_length = max_payload_length
+        self.listener: Optional[QueueListener] = None
+
+    def start(self) -> None:
+        """Start writing log records in a background thread.
+
+        Any previously started listener is discarded without being stopped,
+        as its thread does not survive forking.
+        """
+        queue: SimpleQueue = SimpleQueue()
+        handler = logging.StreamHandler(sys.stderr)
+        handler.setFormatter(JSONFormatter())
+        for previous in [
+            h for h in logger.handlers if isinstance(h, QueueHandler)
+        ]:
+            logger.removeHandler(previous)
+        logger.addHandler(QueueHandler(queue))
+        logger.setLevel(logging.INFO)
+        logger.propagate = False
+        self.listener = QueueListener(queue, handler)
+        self.listener.start()
+
+    def stop(self) -> None:
+        """Write remaining log records and stop background thread."""
+        if self.listener is not None:
+            self.listener.stop()
+            self.listener = None
+
+    def truncate(self, payload: Any) -> str:
+        """Serialize and truncate payload.
+
+        Args:
+            payload: Payload.
+
+        Returns:
+            Payload serialized to JSON, truncated to `max_payload_length`
+            characters.
+        """
+        text = payload if isinstance(payload, str) else json.dumps(
+            payload, default=str,
+        )
+        if len(text) > self.max_payload_length:
+            return f"{text[:self.max_payload_length]}... [truncated]"
+        return text
+
+
+def register_traffic_logging(app: Flask) -> Optional[TrafficLogger]:
+    """Log a structured summary of every request.
+
+    Summaries are written as JSON lines to standard error by a background
+    thread and comprise the operation, object identifier, status code and
+    duration of a request. Traffic logging is configured in the custom
+    `traffic_logging` section of the app configuration: `enabled` switches it
+    on or off, `sample_rate` sets the fraction of successful requests that
+    are logged, `payloads` whether request and response payloads are logged
+    and `max_payload_length` the number of characters after which payloads
+    are truncated.
+
+    Args:
+        app: Flask app.
+
+    Returns:
+        Traffic logger, or `None` if traffic logging is disabled.
+    """
+    conf = getattr(app.config['FOCA'], 'traffic_logging', None) or {}
+    if not conf.get('enabled', False):
+        return None
+    traffic = TrafficLogger(
+        sample_rate=conf.get('sample_rate', 1),
+        payloads=conf.get('payloads', False),
+        max_payload_length=conf.get('max_payload_length', 1000),
+    )
+    traffic.start()
+    atexit.register(traffic.stop)
+    app.extensions['drs_filer_traffic_logger'] = traffic
+    app.before_request(_start_timer)
+    app.after_request(_log_request)
+    return traffic
+
+
+def get_traffic_logger(app: Flask) -> Optional[TrafficLogger]:
+    """Get traffic logger of an app.
+
+    Args:
+        app: Flask app.
+
+    Returns:
+        Traffic logger, or `None` if traffic logging is not registered.
+    """
+    return app.extensions.get('drs_filer_traffic_logger')
+
+
+def log_traffic(fn: Callable) -> Callable:
+    """Decorator recording the response of a controller for traffic logging.
+
+    The response is only recorded if payloads are logged; otherwise, the
+    decorator does nothing.
+
+    Args:
+        fn: Controller.
+
+    Returns:
+        Decorated controller.
+    """
+    @wraps(fn)
+    def wrapper(*args, **kwargs) -> Any:
+        response = fn(*args, **kwargs)
+        traffic = current_app.extensions.get('drs_filer_traffic_logger')
+        if traffic is not None and traffic.payloads:
+            g.drs_filer_traffic_response = response
+        return response
+    return wrapper
+
+
+def _start_timer() -> None:
+    """Record start time of request."""
+    g.drs_filer_traffic_start = perf_counter()
+
+
+def _log_request(response: Response) -> Response:
+    """Log summary of request, if sampled."""
+    start = g.pop('drs_filer_traffic_start', None)
+    traffic = current_app.extensions['drs_filer_traffic_logger']
+    if start is None or (
+        response.status_code < 400 and random() >= traffic.sample_rate
+    ):
+        return response
+    view = current_app.view_functions.get(request.endpoint)
+    entry: Dict = {
+        'operation': getattr(view, '__name__', ''),
+        'method': request.method,
+        'path': request.path,
+        'object_id': (request.view_args or {}).get('object_id'),
+        'status': response.status_code,
+        'duration_ms': round((perf_counter() - start) * 1000, 3),
+    }
+    if traffic.payloads:
+        if request.content_length:
+            entry['request'] = traffic.truncate(
+                request.get_data(as_text=True)
+            )
+        if 'drs_filer_traffic_response' in g:
+            payload = g.pop('drs_filer_traffic_response')
+            # controllers may return a tuple of body, status and headers
+            if isinstance(payload, tuple):
+                payload = payload[0]
+            entry['response'] = traffic.truncate(payload)
+    logger.info('request', extra={'traffic': entry})
+    return response
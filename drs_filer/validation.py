@@ -0,0 +1,207 @@
+"""Validation of request bodies with precompiled validators."""
+
+import json
+import logging
+from threading import Lock
+from typing import (Any, Callable, Dict, List, Optional)
+
+from connexion.decorators.validation import RequestBodyValidator
+from connexion.exceptions import BadRequestProblem
+from connexion.operations.abstract import VALIDATOR_MAP
+from connexion.utils import is_null
+from jsonschema import draft4_format_checker
+
+from drs_filer.tracing import start_span
+
+try:
+    import fastjsonschema
+except ImportError:
+    fastjsonschema = None
+
+logger = logging.getLogger(__name__)
+
+# Swagger 2.0 schemas are a variant of JSON Schema draft 4
+DRAFT4 = 'http://json-schema.org/draft-04/schema#'
+
+# formats known to `fastjsonschema` or OpenAPI; values are checked like
+# connexion does, with the draft 4 format checker of `jsonschema`, which
+# ignores OpenAPI formats and those whose optional libraries are not
+# installed, e.g., `date-time` without `rfc3339-validator`
+FORMATS = (
+    'date-time', 'email', 'hostname', 'ipv4', 'ipv6', 'regex', 'uri',
+    'int32', 'int64', 'float', 'double', 'byte', 'binary', 'password',
+)
+
+# keywords whose OpenAPI semantics are only implemented by connexion's own
+# validator
+UNSUPPORTED_KEYWORDS = frozenset(['nullable', 'readOnly', 'x-nullable'])
+
+# keywords whose values are a subschema, a list of subschemas or a mapping of
+# names to subschemas, respectively
+SCHEMA_KEYWORDS = frozenset([
+    'additionalItems', 'additionalProperties', 'items', 'not',
+])
+SCHEMA_LIST_KEYWORDS = frozenset(['allOf', 'anyOf', 'items', 'oneOf'])
+SCHEMA_MAP_KEYWORDS = frozenset([
+    'definitions', 'dependencies', 'patternProperties', 'properties',
+])
+
+_compiled: Dict[str, Optional[Callable]] = {}
+_lock = Lock()
+
+
+class CompiledRequestBodyValidator(RequestBodyValidator):
+    """Request body validator using validators compiled at app startup.
+
+    Validators are compiled with `fastjsonschema` for JSON Schema draft 4
+    when the API is added, check formats like connexion's validator and are
+    cached per schema, so that operations with the same request body
+    schema, like `PostObject` and `PutObject`, share a validator. Connexion's
+    `jsonschema`-based validator is used instead if `fastjsonschema` is not
+    installed or if the schema cannot be compiled.
+    """
+
+    def __init__(self, schema, *args, **kwargs) -> None:
+        """Class constructor."""
+        super().__init__(schema, *args, **kwargs)
+        self.compiled = get_compiled_validator(schema)
+
+    def validate_schema(self, data, url) -> None:
+        """Validate request body against schema."""
+        with start_span('validate request body'):
+            if self.compiled is None:
+                return super().validate_schema(data, url)
+            if self.is_null_value_valid and is_null(data):
+                return None
+            try:
+                self.compiled(data)
+            except fastjsonschema.JsonSchemaValueException as exception:
+                logger.error(
+                    f"{url} validation error: {exception.message}",
+                    extra={'validator': 'body'},
+                )
+                raise BadRequestProblem(detail=exception.message)
+            return None
+
+
+def get_compiled_validator(schema: Dict) -> Optional[Callable]:
+    """Get compiled validator for a schema, compiling it on first use.
+
+    Args:
+        schema: JSON schema, with references resolved; may be recursive.
+
+    Returns:
+        Compiled validator, or `None` if `fastjsonschema` is not installed or
+        the schema cannot be compiled.
+    """
+    if fastjsonschema is None:
+        return None
+    acyclic = to_acyclic_schema(schema)
+    key = json.dumps(acyclic, sort_keys=True, default=str)
+    with _lock:
+        if key not in _compiled:
+            if _uses_keywords(acyclic, UNSUPPORTED_KEYWORDS):
+                _compiled[key] = None
+            else:
+                try:
+                    _compiled[key] = fastjsonschema.compile(
+                        dict(acyclic, **{'$schema': DRAFT4}),
+                        formats={
+                            name: _get_format_check(name) for name in FORMATS
+                        },
+                    )
+                except fastjsonschema.JsonSchemaDefinitionException as e:
+                    logger.warning(f"Could not compile request schema: {e}")
+                    _compiled[key] = None
+        return _compiled[key]
+
+
+def to_acyclic_schema(schema: Dict) -> Dict:
+    """Replace repeated subschemas with references.
+
+    Connexion resolves references in place, so that recursive schemas, like
+    that of `ContentsObject`, contain cycles. Every subschema that is reached
+    more than once is moved to `definitions` and referenced instead.
+
+    Args:
+        schema: JSON schema, with references resolved.
+
+    Returns:
+        Equivalent JSON schema without cycles.
+    """
+    counts: Dict[int, int] = {}
+
+    def count(node: Any) -> None:
+        if not isinstance(node, dict):
+            return
+        counts[id(node)] = counts.get(id(node), 0) + 1
+        if counts[id(node)] == 1:
+            for subschema in _subschemas(node):
+                count(subschema)
+
+    count(schema)
+    names: Dict[int, str] = {}
+    definitions: Dict[str, Dict] = {}
+
+    def build(node: Any) -> Any:
+        if not isinstance(node, dict):
+            return node
+        if counts[id(node)] == 1:
+            return _map_subschemas(node, build)
+        if id(node) not in names:
+            names[id(node)] = name = f"schema{len(names)}"
+            definitions[name] = _map_subschemas(node, build)
+        return {'$ref': f"#/definitions/{names[id(node)]}"}
+
+    root = build(schema)
+    if definitions:
+        root = {'allOf': [root], 'definitions': definitions}
+    return root
+
+
+def register_request_validator() -> None:
+    """Use `CompiledRequestBodyValidator` for all subsequently added APIs."""
+    VALIDATOR_MAP['body'] = CompiledRequestBodyValidator
+
+
+def _get_format_check(name: str) -> Callable[[Any], bool]:
+    """Get check of a format as done by connexion's validator."""
+    return lambda value: draft4_format_checker.conforms(value, name)
+
+
+def _subschemas(schema: Dict) -> List[Dict]:
+    """Get the immediate subschemas of a schema."""
+    subschemas = []
+    for key, value in schema.items():
+        if key in SCHEMA_KEYWORDS and isinstance(value, dict):
+            subschemas.append(value)
+        elif key in SCHEMA_LIST_KEYWORDS and isinstance(value, list):
+            subschemas.extend(value)
+        elif key in SCHEMA_MAP_KEYWORDS and isinstance(value, dict):
+            subschemas.extend(value.values())
+    return subschemas
+
+
+def _map_subschemas(schema: Dict, func: Callable[[Any], Any]) -> Dict:
+    """Copy a schema, applying a function to its immediate subschemas."""
+    copy = {}
+    for key, value in schema.items():
+        if key in SCHEMA_KEYWORDS and isinstance(value, dict):
+            value = func(value)
+        elif key in SCHEMA_LIST_KEYWORDS and isinstance(value, list):
+            value = [func(item) for item in value]
+        elif key in SCHEMA_MAP_KEYWORDS and isinstance(value, dict):
+            value = {name: func(item) for name, item in value.items()}
+        copy[key] = value
+    return copy
+
+
+def _uses_keywords(node: Any, keywords: frozenset) -> bool:
+    """Check whether a schema uses any of the given keywords."""
+    if isinstance(node, dict):
+        return any(key in keywords for key in node) or any(
+            _uses_keywords(value, keywords) for value in node.values()
+        )
+    if isinstance(node, list):
+        return any(_uses_keywords(value, keywords) for value in node)
+    return False
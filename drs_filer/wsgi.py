@@ -0,0 +1,140 @@
+"""Production server with a pool of worker processes."""
+
+import logging
+from typing import (Any, Dict, Optional)
+
+from connexion import App
+from gunicorn.app.base import BaseApplication
+
+from drs_filer.app import init_app
+from drs_filer.database.backends import (
+    close_storage,
+    uses_mongo,
+)
+from drs_filer.database.mongo_client import (
+    close_mongo_client,
+    create_mongo_client,
+)
+from drs_filer.metrics import (
+    clear_metrics,
+    get_metrics,
+)
+from drs_filer.traffic_logging import get_traffic_logger
+
+logger = logging.getLogger(__name__)
+
+
+class WSGIServer(BaseApplication):
+    """Gunicorn application serving the app with a pool of worker processes.
+
+    The app is created, and the service info registered, exactly once in the
+    master process (preloading); workers are then forked from the master and
+    each open their own database connections.
+
+    Args:
+        app: Connexion app instance.
+        options: Gunicorn settings, e.g., `workers`, `threads` or
+            `graceful_timeout`. Unknown settings are ignored.
+
+    Attributes:
+        application: Connexion app instance.
+        options: Gunicorn settings.
+    """
+
+    def __init__(
+        self,
+        app: App,
+        options: Optional[Dict[str, Any]] = None,
+    ) -> None:
+        """Class constructor."""
+        self.application = app
+        self.options = options or {}
+        super().__init__()
+
+    def load_config(self) -> None:
+        """Apply settings and server hooks."""
+        for key, value in self.options.items():
+            if key not in self.cfg.settings:
+                logger.warning(f"Ignoring unknown server setting '{key}'.")
+                continue
+            self.cfg.set(key, value)
+        self.cfg.set('preload_app', True)
+        self.cfg.set('post_fork', post_fork)
+        self.cfg.set('worker_exit', worker_exit)
+
+    def load(self) -> Any:
+        """Return WSGI app."""
+        return self.application.app
+
+
+def post_fork(server: Any, worker: Any) -> None:
+    """Open new database connections in a freshly forked worker.
+
+    Database clients are not fork-safe, so those created in the master
+    process must neither be used nor closed by workers. Likewise, the thread
+    writing traffic logs does not survive forking and is restarted.
+
+    Args:
+        server: Gunicorn arbiter.
+        worker: Gunicorn worker.
+    """
+    if uses_mongo(app=worker.app.application.app):
+        create_mongo_client(
+            app=worker.app.application.app,
+            close_previous=False,
+        )
+    traffic = get_traffic_logger(app=worker.app.application.app)
+    if traffic is not None:
+        traffic.start()
+
+
+def worker_exit(server: Any, worker: Any) -> None:
+    """Close database connections, write remaining traffic logs and discard
+    the worker's shared live gauges when a worker shuts down.
+
+    Args:
+        server: Gunicorn arbiter.
+        worker: Gunicorn worker.
+    """
+    close_mongo_client(app=worker.app.application.app)
+    close_storage(app=worker.app.application.app)
+    traffic = get_traffic_logger(app=worker.app.application.app)
+    if traffic is not None:
+        traffic.stop()
+    metrics = get_metrics(app=worker.app.application.app)
+    if metrics is not None:
+        metrics.close()
+
+
+def get_options(app: App) -> Dict[str, Any]:
+    """Get server settings from app configuration.
+
+    Settings are read from the custom `wsgi` section of the app
+    configuration, which takes any Gunicorn setting; the bind address is
+    taken from the `server` section.
+
+    Args:
+        app: Connexion app instance.
+
+    Returns:
+        Gunicorn settings.
+    """
+    conf = app.app.config['FOCA']
+    options = {'bind': f"{conf.server.host}:{conf.server.port}"}
+    options.update(getattr(conf, 'wsgi', None) or {})
+    return options
+
+
+def main() -> None:
+    """Create app and serve it with a pool of worker processes.
+
+    Metrics shared by the workers of a previous run are removed first.
+    """
+    clear_metrics()
+    app = init_app()
+    app.app.debug = False
+    WSGIServer(app=app, options=get_options(app=app)).run()
+
+
+if __name__ == '__main__':
+    main()
@@ -17,6 +17,11 @@ setup(
     license='Apache License 2.0',
     url='https://github.com/elixir-cloud-aai/drs-filer.git',
     packages=find_packages(),
+    entry_points={
+        'console_scripts': [
+            'drs-filer=drs_filer.cli:main',
+        ],
+    },
     keywords=(
         'ga4gh drs elixir rest restful api app server openapi '
         'swagger mongodb python flask'
@@ -31,5 +36,14 @@ setup(
         'Programming Language :: Python :: 3.7',
         'Programming Language :: Python :: 3.8',
     ],
-    install_requires=[],
+    install_requires=['prometheus-client>=0.10'],
+    extras_require={
+        'asgi': ['motor>=2.1,<3', 'uvicorn'],
+        'fastjsonschema': ['fastjsonschema'],
+        'opentelemetry': [
+            'opentelemetry-sdk',
+            'opentelemetry-exporter-otlp-proto-http',
+        ],
+        'orjson': ['orjson'],
+    },
 )
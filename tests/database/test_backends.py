@@ -0,0 +1,58 @@
+"""Test cases for the selection of the storage backend."""
+
+from flask import Flask
+from foca.models.config import Config
+import pytest
+
+from drs_filer.database.backends import (
+    close_storage,
+    create_storage,
+    get_storage,
+    uses_mongo,
+)
+from drs_filer.database.mongo_storage import MongoStorage
+from drs_filer.database.sqlite_storage import SQLiteStorage
+
+
+def create_app(storage=None) -> Flask:
+    """Create app with the given storage configuration."""
+    app = Flask(__name__)
+    app.config['FOCA'] = Config(storage=storage)
+    return app
+
+
+def test_create_storage_default():
+    """Test that MongoDB is used by default."""
+    app = create_app()
+    assert isinstance(create_storage(app=app), MongoStorage)
+    assert uses_mongo(app=app)
+
+
+def test_create_storage_sqlite(tmp_path):
+    """Test for creating the embedded storage backend."""
+    app = create_app(storage={
+        'backend': 'sqlite',
+        'sqlite': {'path': str(tmp_path / 'drs.sqlite'), 'mmap_size': 0},
+    })
+    storage = create_storage(app=app)
+    assert isinstance(storage, SQLiteStorage)
+    assert storage.mmap_size == 0
+    assert not uses_mongo(app=app)
+    with app.app_context():
+        assert get_storage() is storage
+    close_storage(app=app)
+    assert 'drs_filer_storage' not in app.extensions
+
+
+def test_create_storage_unknown():
+    """Test that an error is raised for unknown backends."""
+    with pytest.raises(ValueError):
+        create_storage(app=create_app(storage={'backend': 'unknown'}))
+
+
+def test_get_storage_default():
+    """Test that MongoDB is used if no backend was created."""
+    app = create_app()
+    storage = get_storage(app=app)
+    assert isinstance(storage, MongoStorage)
+    assert get_storage(app=app) is storage
@@ -0,0 +1,190 @@
+"""Test cases for database client handling."""
+
+from unittest.mock import MagicMock
+
+from flask import Flask
+from foca.models.config import (Config, MongoConfig)
+import mongomock
+from pymongo import MongoClient
+
+from drs_filer.database.mongo_client import (
+    close_mongo_client,
+    create_mongo_client,
+    get_collection,
+    get_pool_monitor,
+    PoolWaitMonitor,
+)
+from drs_filer.metrics import Metrics
+
+INDEX_CONFIG = {'keys': [('id', 1)]}
+COLLECTION_CONFIG = {'indexes': [INDEX_CONFIG]}
+DB_CONFIG = {
+    'collections': {
+        'objects': COLLECTION_CONFIG,
+        'service_info': COLLECTION_CONFIG,
+    },
+}
+MONGO_CONFIG = {
+    'host': 'mongodb',
+    'port': 27017,
+    'dbs': {
+        'drsStore': DB_CONFIG,
+    },
+}
+CLIENT_CONFIG = {
+    'maxPoolSize': 20,
+    'minPoolSize': 2,
+    'waitQueueTimeoutMS': 500,
+    'readPreference': 'secondaryPreferred',
+    'w': 'majority',
+    'pool_wait_warning_ms': 50,
+}
+
+
+def test_create_mongo_client(monkeypatch):
+    """Test that a single client is shared by all collections."""
+    monkeypatch.setenv('MONGO_USERNAME', 'user')
+    monkeypatch.setenv('MONGO_PASSWORD', 'pass')
+    app = Flask(__name__)
+    app.config['FOCA'] = Config(db=MongoConfig(**MONGO_CONFIG))
+    client = create_mongo_client(app=app)
+    assert isinstance(client, MongoClient)
+    collections = app.config['FOCA'].db.dbs['drsStore'].collections
+    assert collections['objects'].client.database.client is client
+    assert collections['service_info'].client.database.client is client
+    assert collections['objects'].client.full_name == 'drsStore.objects'
+    close_mongo_client(app=app)
+    assert 'drs_filer_mongo_client' not in app.extensions
+
+
+def test_create_mongo_client_replace():
+    """Test that a previously created client is replaced."""
+    app = Flask(__name__)
+    app.config['FOCA'] = Config(db=MongoConfig(**MONGO_CONFIG))
+    first = create_mongo_client(app=app)
+    second = create_mongo_client(app=app)
+    assert first is not second
+    assert app.extensions['drs_filer_mongo_client'] is second
+    close_mongo_client(app=app)
+
+
+def test_create_mongo_client_injected(monkeypatch):
+    """Test that an injected client is attached and indexed."""
+    monkeypatch.setenv('MONGO_DBNAME', 'drsStoreTest')
+    app = Flask(__name__)
+    app.config['FOCA'] = Config(db=MongoConfig(**MONGO_CONFIG))
+    injected = mongomock.MongoClient()
+    client = create_mongo_client(app=app, client=injected)
+    assert client is injected
+    collections = app.config['FOCA'].db.dbs['drsStore'].collections
+    assert collections['objects'].client.full_name == 'drsStoreTest.objects'
+    assert 'id_1' in injected.drsStoreTest.objects.index_information()
+    with app.app_context():
+        assert get_pool_monitor() is None
+    injected.close = MagicMock()
+    create_mongo_client(app=app, client=injected)
+    injected.close.assert_not_called()
+
+
+def test_create_mongo_client_options():
+    """Test that client options are applied."""
+    app = Flask(__name__)
+    app.config['FOCA'] = Config(
+        db=MongoConfig(**MONGO_CONFIG),
+        db_client=CLIENT_CONFIG,
+    )
+    client = create_mongo_client(app=app)
+    assert client.max_pool_size == 20
+    assert client.min_pool_size == 2
+    assert client.read_preference.mongos_mode == 'secondaryPreferred'
+    assert client.write_concern.document == {'w': 'majority'}
+    with app.app_context():
+        assert get_pool_monitor().warning_threshold == 0.05
+        assert get_collection('objects').database.client is client
+    close_mongo_client(app=app)
+
+
+def test_create_mongo_client_metrics(monkeypatch):
+    """Test that database commands are timed if metrics are registered."""
+    app = Flask(__name__)
+    app.config['FOCA'] = Config(db=MongoConfig(**MONGO_CONFIG))
+    metrics = app.extensions['drs_filer_metrics'] = Metrics()
+    mock_client = MagicMock()
+    monkeypatch.setattr(
+        'drs_filer.database.mongo_client.MongoClient',
+        mock_client,
+    )
+    create_mongo_client(app=app)
+    listeners = mock_client.call_args[1]['event_listeners']
+    assert metrics.command_listener in listeners
+
+
+def test_create_mongo_client_close_previous():
+    """Test that previously attached clients are closed, unless disabled."""
+    app = Flask(__name__)
+    app.config['FOCA'] = Config(db=MongoConfig(**MONGO_CONFIG))
+    previous = MagicMock()
+    app.config['FOCA'].db.dbs['drsStore'].client = previous
+    create_mongo_client(app=app, close_previous=False)
+    previous.client.close.assert_not_called()
+    app.config['FOCA'].db.dbs['drsStore'].client = previous
+    create_mongo_client(app=app)
+    previous.client.close.assert_called_once()
+    close_mongo_client(app=app)
+
+
+def test_pool_wait_monitor():
+    """Test recording of connection checkouts."""
+    monitor = PoolWaitMonitor(warning_threshold=0.000001)
+    event = MagicMock(address=('mongodb', 27017))
+    monitor.connection_created(event)
+    monitor.connection_check_out_started(event)
+    monitor.connection_checked_out(event)
+    monitor.connection_checked_in(event)
+    monitor.connection_check_out_started(event)
+    monitor.connection_check_out_failed(event)
+    stats = monitor.stats()
+    assert stats['checkouts'] == 1
+    assert stats['failures'] == 1
+    assert stats['connections'] == 1
+    assert stats['wait_max'] > 0
+    assert stats['wait_total'] == stats['wait_max']
+
+
+def test_get_collection_read():
+    """Test that reads are routed as configured."""
+    app = Flask(__name__)
+    app.config['FOCA'] = Config(
+        db=MongoConfig(**MONGO_CONFIG),
+        db_reads={
+            'read_preference': 'secondaryPreferred',
+            'max_staleness_seconds': 90,
+        },
+    )
+    create_mongo_client(app=app)
+    with app.app_context():
+        read = get_collection('objects', read=True)
+        assert read.read_preference.mongos_mode == 'secondaryPreferred'
+        assert read.read_preference.max_staleness == 90
+        write = get_collection('objects')
+        assert write.read_preference.mongos_mode == 'primary'
+    close_mongo_client(app=app)
+
+
+def test_get_collection_read_primary():
+    """Test that the maximum staleness is ignored for reads from the
+    primary."""
+    app = Flask(__name__)
+    app.config['FOCA'] = Config(
+        db=MongoConfig(**MONGO_CONFIG),
+        db_reads={
+            'read_preference': 'primary',
+            'max_staleness_seconds': 90,
+        },
+    )
+    create_mongo_client(app=app)
+    with app.app_context():
+        read = get_collection('objects', read=True)
+        assert read.read_preference.mongos_mode == 'primary'
+        assert read.read_preference.max_staleness == -1
+    close_mongo_client(app=app)
@@ -0,0 +1,79 @@
+"""Test cases for asynchronous database client handling."""
+
+import asyncio
+from typing import (Any, Awaitable)
+
+from flask import Flask
+from foca.models.config import (Config, MongoConfig)
+import pytest
+
+from drs_filer.database import motor_client
+from drs_filer.database.motor_client import (
+    close_motor_client,
+    create_motor_client,
+    get_motor_collection,
+)
+from drs_filer.metrics import register_metrics
+
+pytest.importorskip('motor')
+
+MONGO_CONFIG = {
+    'host': 'mongodb',
+    'port': 27017,
+    'dbs': {
+        'drsStore': {'collections': {'objects': {'indexes': []}}},
+    },
+}
+
+
+def run_until_complete(coroutine: Awaitable) -> Any:
+    """Run coroutine to completion, as `asyncio.run()` does on Python 3.7+."""
+    return asyncio.get_event_loop().run_until_complete(coroutine)
+
+
+def create_app() -> Flask:
+    """Create app with database and read routing configuration."""
+    app = Flask(__name__)
+    app.config['FOCA'] = Config(
+        db=MongoConfig(**MONGO_CONFIG),
+        db_client={'maxPoolSize': 20, 'pool_wait_warning_ms': 50},
+        db_reads={
+            'read_preference': 'secondaryPreferred',
+            'max_staleness_seconds': 90,
+        },
+        metrics={'enabled': True},
+    )
+    register_metrics(app=app)
+    return app
+
+
+def test_create_motor_client():
+    """Test that the client is configured like the synchronous client and
+    that reads are routed as configured."""
+    app = create_app()
+
+    async def run():
+        client = create_motor_client(app=app)
+        assert app.extensions['drs_filer_motor_client'] is client
+        assert client.max_pool_size == 20
+        collection = get_motor_collection(app=app, name='objects')
+        assert collection.full_name == 'drsStore.objects'
+        assert collection.read_preference.mongos_mode == 'secondaryPreferred'
+        assert collection.read_preference.max_staleness == 90
+        collection = get_motor_collection(
+            app=app,
+            name='objects',
+            read=False,
+        )
+        assert collection.read_preference.mongos_mode == 'primary'
+        close_motor_client(app=app)
+
+    run_until_complete(run())
+    assert 'drs_filer_motor_client' not in app.extensions
+
+
+def test_create_motor_client_not_installed(monkeypatch):
+    """Test that an error is raised if Motor is not installed."""
+    monkeypatch.setattr(motor_client, 'AsyncIOMotorClient', None)
+    with pytest.raises(RuntimeError):
+        create_motor_client(app=create_app())
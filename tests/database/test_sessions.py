@@ -0,0 +1,95 @@
+"""Test cases for causally consistent database sessions."""
+
+from unittest.mock import MagicMock
+
+from bson.timestamp import Timestamp
+from flask import (Flask, Response)
+from foca.models.config import (Config, MongoConfig)
+import pytest
+
+from drs_filer.database.sessions import (
+    get_session,
+    read_your_writes,
+    register_sessions,
+    TOKEN_HEADER,
+)
+from drs_filer.errors.exceptions import BadRequest
+
+MONGO_CONFIG = {
+    'host': 'mongodb',
+    'port': 27017,
+    'dbs': {},
+}
+CLUSTER_TIME = {'clusterTime': Timestamp(1600000000, 1)}
+OPERATION_TIME = Timestamp(1600000000, 1)
+
+
+def create_app(causal_consistency: bool = True) -> Flask:
+    """Create app with mock database client."""
+    app = Flask(__name__)
+    app.config['FOCA'] = Config(
+        db=MongoConfig(**MONGO_CONFIG),
+        db_reads={'causal_consistency': causal_consistency},
+    )
+    app.extensions['drs_filer_mongo_client'] = MagicMock()
+    register_sessions(app=app)
+
+    @app.route('/')
+    def index():
+        session = get_session()
+        session.cluster_time = CLUSTER_TIME
+        session.operation_time = OPERATION_TIME
+        return Response()
+
+    return app
+
+
+def test_get_session_disabled():
+    """Test that no session is used if disabled."""
+    app = create_app(causal_consistency=False)
+    with app.test_request_context(headers={TOKEN_HEADER: 'token'}):
+        assert get_session() is None
+        assert not read_your_writes()
+
+
+def test_get_session_no_request():
+    """Test that no session is used outside of requests."""
+    app = create_app()
+    with app.app_context():
+        assert get_session() is None
+        assert not read_your_writes()
+
+
+def test_get_session():
+    """Test that a single session is used per request."""
+    app = create_app()
+    client = app.extensions['drs_filer_mongo_client']
+    with app.test_request_context():
+        session = get_session()
+        assert get_session() is session
+        assert not read_your_writes()
+    client.start_session.assert_called_once_with(causal_consistency=True)
+
+
+def test_token_round_trip():
+    """Test that tokens returned by responses advance later sessions."""
+    app = create_app()
+    client = app.extensions['drs_filer_mongo_client']
+    res = app.test_client().get('/')
+    token = res.headers[TOKEN_HEADER]
+    client.start_session.return_value.end_session.assert_called_once()
+    with app.test_request_context(headers={TOKEN_HEADER: token}):
+        assert read_your_writes()
+        session = get_session()
+        session.advance_cluster_time.assert_called_once_with(CLUSTER_TIME)
+        session.advance_operation_time.assert_called_once_with(
+            OPERATION_TIME
+        )
+
+
+def test_get_session_invalid_token():
+    """Test that invalid tokens are rejected."""
+    app = create_app()
+    with app.test_request_context(headers={TOKEN_HEADER: 'invalid'}):
+        with pytest.raises(BadRequest):
+            get_session()
@@ -0,0 +1,222 @@
+"""Test cases for the embedded SQLite storage backend."""
+
+from copy import deepcopy
+import os
+import sqlite3
+
+import pytest
+
+from drs_filer.database.sqlite_storage import SQLiteStorage
+from drs_filer.database.storage import (
+    CREATED,
+    ObjectExists,
+    REPLACED,
+    UNCHANGED,
+)
+from drs_filer.errors.exceptions import BadRequest
+from drs_filer.ga4gh.drs.endpoints.conditional import compute_etag
+
+OBJECT = {
+    'id': 'a001',
+    'name': 'a.fa',
+    'mime_type': 'text/plain',
+    'created_time': '2021-01-01T00:00:00Z',
+    'checksums': [{'type': 'md5', 'checksum': 'abc'}],
+    'access_methods': [
+        {'type': 'https', 'access_id': '1'},
+        {'type': 'ftp', 'access_id': '2'},
+    ],
+    '_hash': 'hash1',
+}
+
+
+def create_object(object_id: str, **fields) -> dict:
+    """Create object with the given identifier and fields."""
+    obj = deepcopy(OBJECT)
+    obj['id'] = object_id
+    obj.update(fields)
+    return obj
+
+
+@pytest.fixture
+def storage(tmp_path):
+    """Storage backend on an empty database."""
+    storage = SQLiteStorage(path=str(tmp_path / 'drs.sqlite'))
+    yield storage
+    storage.close()
+
+
+def test_init(storage):
+    """Test that the database is run in WAL mode and memory-mapped."""
+    conn = sqlite3.connect(storage.path)
+    assert conn.execute('PRAGMA journal_mode').fetchone()[0] == 'wal'
+    assert storage._connect().execute(
+        'PRAGMA mmap_size'
+    ).fetchone()[0] == storage.mmap_size
+
+
+def test_insert_get_objects(storage):
+    """Test for inserting and getting objects."""
+    storage.insert_object(create_object('a001'))
+    with pytest.raises(ObjectExists):
+        storage.insert_object(create_object('a001'))
+    assert storage.insert_objects([
+        create_object('a002'),
+        create_object('a001'),
+        create_object('a003'),
+    ]) == [1]
+    assert storage.get_object('a001') == OBJECT
+    assert storage.get_object('a004') is None
+    assert sorted(
+        obj['id'] for obj in storage.get_objects(['a001', 'a003', 'a004'])
+    ) == ['a001', 'a003']
+    assert storage.get_objects(['a002'], fields=['id', 'size']) == [
+        {'id': 'a002'},
+    ]
+    assert storage.get_access_method('a001', '1') == OBJECT
+    assert storage.get_access_methods(['a003', 'a004']) == [{
+        'id': 'a003',
+        'access_methods': OBJECT['access_methods'],
+    }]
+    assert storage.count_objects() == 3
+
+
+def test_upsert_object(storage):
+    """Test for replacing and creating objects."""
+    assert storage.upsert_object(create_object('a001')) == CREATED
+    assert storage.upsert_object(
+        create_object('a001', name='b.fa', _hash='hash2'),
+        create=False,
+        hashes=['hash3'],
+    ) is None
+    assert storage.upsert_object(
+        create_object('a001', name='b.fa', _hash='hash2'),
+        create=False,
+        hashes=['hash1'],
+    ) == REPLACED
+    assert storage.get_object('a001')['name'] == 'b.fa'
+    obj = create_object('a002')
+    del obj['_hash']
+    storage.insert_object(obj)
+    assert storage.upsert_object(
+        create_object('a002', name='b.fa'),
+        create=False,
+        hashes=[compute_etag(obj)],
+    ) == REPLACED
+    assert storage.upsert_object(
+        create_object('a003', _register_hash='reg1'),
+    ) == CREATED
+    assert storage.upsert_object(
+        create_object('a003', name='b.fa', _register_hash='reg1'),
+    ) == UNCHANGED
+    assert storage.get_object('a003')['name'] == 'a.fa'
+    assert storage.upsert_object(
+        create_object('a004'),
+        create=False,
+    ) is None
+    assert storage.get_object('a004') is None
+
+
+def test_bundles(storage):
+    """Test for getting and updating bundles containing objects."""
+    storage.insert_objects([
+        create_object('a001'),
+        create_object('b001', contents=[{'name': 'a', 'id': 'a001'}]),
+    ])
+    storage.upsert_object(
+        create_object('b002', contents=[{'name': 'b', 'id': 'b001'}]),
+    )
+    assert [obj['id'] for obj in storage.get_bundles(['a001'])] == ['b001']
+    assert [obj['id'] for obj in storage.get_bundles(['b001'])] == ['b002']
+    storage.update_object('b001', {'size': 10, '_hash': 'hash2'})
+    assert storage.get_object('b001')['size'] == 10
+    storage.upsert_object(create_object('b002'))
+    assert storage.get_bundles(['b001']) == []
+    storage.delete_object('b001')
+    assert storage.get_bundles(['a001']) == []
+
+
+def test_list_objects(storage):
+    """Test for listing filtered objects page by page."""
+    storage.insert_objects([
+        create_object('a001'),
+        create_object('a002', name='b.fa'),
+        create_object('a003', created_time='2022-01-01T00:00:00Z'),
+        create_object('a004', checksums=[{'type': 'md5', 'checksum': 'x'}]),
+    ])
+    objs, token = storage.list_objects(page_size=2)
+    assert [obj['id'] for obj in objs] == ['a001', 'a002']
+    objs, token = storage.list_objects(page_size=2, page_token=token)
+    assert [obj['id'] for obj in objs] == ['a003', 'a004']
+    assert token is None
+    for filters, expected in [
+        ({'name': 'b.fa'}, ['a002']),
+        ({'mime_type': 'text/html'}, []),
+        ({'checksum': 'x'}, ['a004']),
+        ({'access_type': 'ftp'}, ['a001', 'a002', 'a003', 'a004']),
+        ({'created_after': '2021-06-01'}, ['a003']),
+        ({'created_before': '2021-06-01'}, ['a001', 'a002', 'a004']),
+    ]:
+        objs, __ = storage.list_objects(page_size=10, **filters)
+        assert [obj['id'] for obj in objs] == expected
+    with pytest.raises(BadRequest):
+        storage.list_objects(page_size=2, page_token='invalid')
+
+
+def test_delete_object(storage):
+    """Test for deleting objects."""
+    storage.insert_object(create_object('a001'))
+    assert storage.delete_object('a001') is True
+    assert storage.delete_object('a001') is False
+    assert storage.get_object('a001') is None
+
+
+def test_pull_access_method(storage):
+    """Test for removing access methods."""
+    storage.insert_object(create_object('a001'))
+    assert storage.pull_access_method('a001', '1') is True
+    obj = storage.get_object('a001')
+    assert obj['access_methods'] == [OBJECT['access_methods'][1]]
+    assert obj.pop('_hash') == compute_etag(obj)
+    assert storage.pull_access_method('a001', '1') is False
+    assert storage.pull_access_method('a001', '2') is False
+    assert storage.pull_access_method('a002', '1') is False
+
+
+def test_service_info(storage):
+    """Test for adding and replacing service info."""
+    assert storage.get_service_info() is None
+    storage.upsert_service_info({'id': 'a', 'version': '1'})
+    storage.upsert_service_info({'id': 'b', 'version': '1'})
+    storage.upsert_service_info({'id': 'a', 'version': '2'})
+    assert storage.get_service_info() == {'id': 'b', 'version': '1'}
+
+
+def test_service_info_version(storage):
+    """Test that the version of service info changes with every write."""
+    assert storage.get_service_info_version() is None
+    storage.upsert_service_info({'id': 'a', 'version': '1'})
+    version = storage.get_service_info_version()
+    assert version is not None
+    storage.upsert_service_info({'id': 'a', 'version': '1'})
+    assert storage.get_service_info_version() not in (None, version)
+
+
+def test_rollback(storage, monkeypatch):
+    """Test that failed writes are rolled back."""
+    monkeypatch.setattr(
+        SQLiteStorage,
+        '_set_contents',
+        staticmethod(lambda conn, obj: conn.execute('INVALID')),
+    )
+    with pytest.raises(sqlite3.OperationalError):
+        storage.insert_object(create_object('a001'))
+    assert storage.get_object('a001') is None
+
+
+def test_fork(storage, monkeypatch):
+    """Test that connections are not reused by forked processes."""
+    conn = storage._connect()
+    pid = os.getpid()
+    monkeypatch.setattr(os, 'getpid', lambda: pid + 1)
+    assert storage._connect() is not conn
@@ -0,0 +1,272 @@
+"""Test cases for bundle helpers."""
+
+from copy import deepcopy
+import hashlib
+from typing import (Dict, List)
+
+from flask import Flask
+from foca.models.config import (Config, MongoConfig)
+import mongomock
+import pytest
+
+from drs_filer.errors.exceptions import (
+    BundleAggregatesMismatch,
+    BundleTooDeep,
+)
+from drs_filer.ga4gh.drs.endpoints import bundles
+from drs_filer.ga4gh.drs.endpoints.bundles import (
+    compute_bundle_aggregates,
+    expand_bundle,
+    set_bundle_aggregates,
+    update_parent_aggregates,
+)
+from drs_filer.ga4gh.drs.endpoints.conditional import compute_etag
+
+INDEX_CONFIG = {'keys': [('id', 1)]}
+COLLECTION_CONFIG = {'indexes': [INDEX_CONFIG]}
+DB_CONFIG = {'collections': {'objects': COLLECTION_CONFIG}}
+MONGO_CONFIG = {
+    'host': 'mongodb',
+    'port': 27017,
+    'dbs': {
+        'drsStore': DB_CONFIG,
+    },
+}
+BUNDLE_OBJECTS = [
+    {
+        "id": "b001",
+        "contents": [
+            {"name": "b002", "id": "b002"},
+            {"name": "a001", "id": "a001"},
+        ],
+    },
+    {
+        "id": "b002",
+        "contents": [
+            {"name": "b003", "id": "b003"},
+            {"name": "external", "drs_uri": ["drs://drs.example.org/1"]},
+        ],
+    },
+    {
+        "id": "b003",
+        "contents": [
+            {"name": "a001", "id": "a001"},
+            {"name": "b001", "id": "b001"},
+        ],
+    },
+    {"id": "a001"},
+]
+BLOB_OBJECTS = [
+    {
+        "id": "c001",
+        "size": 10,
+        "checksums": [
+            {"type": "md5", "checksum": "72794b6d"},
+            {"type": "etag", "checksum": "1"},
+        ],
+    },
+    {
+        "id": "c002",
+        "size": 20,
+        "checksums": [{"type": "md5", "checksum": "5E089D29"}],
+    },
+]
+BUNDLE_CONTENTS = [
+    {"name": "c001", "id": "c001"},
+    {"name": "c002", "id": "c002"},
+]
+BUNDLE_MD5 = hashlib.md5(b"5e089d2972794b6d").hexdigest()
+
+
+def create_app() -> Flask:
+    """Create app with mock database containing nested bundles."""
+    app = Flask(__name__)
+    app.config['FOCA'] = Config(db=MongoConfig(**MONGO_CONFIG))
+    collection = mongomock.MongoClient().db.collection
+    for obj in BUNDLE_OBJECTS:
+        collection.insert_one(dict(obj))
+    app.config['FOCA'].db.dbs['drsStore']. \
+        collections['objects'].client = collection
+    return app
+
+
+def test_expand_bundle():
+    """Test for expanding nested bundles, including a cycle."""
+    app = create_app()
+    with app.app_context():
+        res = expand_bundle(
+            obj={"id": "b001", "contents": BUNDLE_OBJECTS[0]['contents']},
+            max_depth=3,
+            max_nodes=10,
+        )
+    assert res['contents'] == [
+        {
+            "name": "b002",
+            "id": "b002",
+            "contents": [
+                {
+                    "name": "b003",
+                    "id": "b003",
+                    "contents": [
+                        {"name": "a001", "id": "a001"},
+                        {"name": "b001", "id": "b001"},
+                    ],
+                },
+                {"name": "external", "drs_uri": ["drs://drs.example.org/1"]},
+            ],
+        },
+        {"name": "a001", "id": "a001"},
+    ]
+
+
+def test_expand_bundle_too_deep():
+    """Test for expanding a bundle with more levels than allowed."""
+    app = create_app()
+    with app.app_context():
+        with pytest.raises(BundleTooDeep):
+            expand_bundle(
+                obj={"id": "b002", "contents": BUNDLE_OBJECTS[1]['contents']},
+                max_depth=1,
+                max_nodes=10,
+            )
+
+
+def test_expand_bundle_blob():
+    """Test that blobs are returned unchanged."""
+    app = create_app()
+    with app.app_context():
+        assert expand_bundle(
+            obj={"id": "a001"},
+            max_depth=1,
+            max_nodes=10,
+        ) == {"id": "a001"}
+
+
+def create_diamond(width: int, depth: int) -> List[Dict]:
+    """Create bundles of `depth` levels, each level with `width` bundles
+    that contain all bundles of the next level, and the last level with
+    `width` blobs."""
+    objs = []
+    for level in range(depth):
+        for index in range(width):
+            objs.append({
+                "id": f"d{level}_{index}",
+                "contents": [
+                    {"name": f"{i}", "id": f"d{level + 1}_{i}"}
+                    for i in range(width)
+                ],
+            })
+    objs.extend({"id": f"d{depth}_{index}"} for index in range(width))
+    return objs
+
+
+def test_expand_bundle_diamond(monkeypatch):
+    """Test that bundles referenced on many paths are retrieved and
+    expanded once."""
+    app = create_app()
+    app.config['FOCA'].db.dbs['drsStore'].collections['objects'].client. \
+        insert_many(create_diamond(width=20, depth=5))
+    lookups = []
+    get_objects_orig = bundles.get_objects
+
+    def get_objects(object_ids):
+        object_ids = list(object_ids)
+        lookups.append(object_ids)
+        return get_objects_orig(object_ids)
+
+    monkeypatch.setattr(
+        'drs_filer.ga4gh.drs.endpoints.bundles.get_objects',
+        get_objects,
+    )
+    with app.app_context():
+        obj = {"id": "d0_0", "contents": create_diamond(20, 5)[0]['contents']}
+        with pytest.raises(BundleTooDeep):
+            expand_bundle(obj=deepcopy(obj), max_depth=5, max_nodes=10000)
+        lookups.clear()
+        res = expand_bundle(obj=deepcopy(obj), max_depth=5, max_nodes=10 ** 7)
+    assert [len(object_ids) for object_ids in lookups] == [20] * 5
+    first, second = res['contents'][:2]
+    assert first['contents'][0]['contents'] is \
+        second['contents'][0]['contents']
+    assert len(first['contents'][0]['contents'][0]['contents']) == 20
+
+
+def test_compute_bundle_aggregates():
+    """Test for computing size and checksums of a bundle."""
+    res = compute_bundle_aggregates(
+        contents=BUNDLE_CONTENTS,
+        children={obj['id']: obj for obj in BLOB_OBJECTS},
+    )
+    assert res == {
+        'size': 30,
+        'checksums': [{'type': 'md5', 'checksum': BUNDLE_MD5}],
+    }
+
+
+def test_compute_bundle_aggregates_unavailable():
+    """Test that no aggregates are computed if contents are missing."""
+    res = compute_bundle_aggregates(
+        contents=BUNDLE_CONTENTS,
+        children={"c001": BLOB_OBJECTS[0]},
+    )
+    assert res is None
+
+
+def test_set_bundle_aggregates():
+    """Test for validating and completing aggregates of a new bundle."""
+    app = create_app()
+    app.config['FOCA'].db.dbs['drsStore']. \
+        collections['objects'].client.insert_many(deepcopy(BLOB_OBJECTS))
+    bundle = {
+        "size": 30,
+        "checksums": [{"type": "crc32c", "checksum": "abc"}],
+        "contents": BUNDLE_CONTENTS,
+    }
+    with app.app_context():
+        set_bundle_aggregates(objects=[bundle, {"size": 1}])
+    assert bundle['checksums'] == [
+        {"type": "md5", "checksum": BUNDLE_MD5},
+        {"type": "crc32c", "checksum": "abc"},
+    ]
+
+
+def test_set_bundle_aggregates_mismatch():
+    """Test for registering a bundle with a wrong size or checksum."""
+    app = create_app()
+    app.config['FOCA'].db.dbs['drsStore']. \
+        collections['objects'].client.insert_many(deepcopy(BLOB_OBJECTS))
+    with app.app_context():
+        with pytest.raises(BundleAggregatesMismatch):
+            set_bundle_aggregates(objects=[{
+                "size": 31,
+                "checksums": [{"type": "md5", "checksum": BUNDLE_MD5}],
+                "contents": BUNDLE_CONTENTS,
+            }])
+        with pytest.raises(BundleAggregatesMismatch):
+            set_bundle_aggregates(objects=[{
+                "size": 30,
+                "checksums": [{"type": "md5", "checksum": "0"}],
+                "contents": BUNDLE_CONTENTS,
+            }])
+
+
+def test_update_parent_aggregates():
+    """Test that aggregates are propagated to all enclosing bundles."""
+    app = create_app()
+    collection = app.config['FOCA'].db.dbs['drsStore']. \
+        collections['objects'].client
+    collection.insert_many(deepcopy(BLOB_OBJECTS))
+    collection.insert_many([
+        {"id": "d001", "size": 30, "contents": BUNDLE_CONTENTS},
+        {"id": "d002", "size": 30, "contents": [{"name": "d", "id": "d001"}]},
+    ])
+    collection.update_one({"id": "c002"}, {"$set": {"size": 25}})
+    with app.app_context():
+        update_parent_aggregates(object_ids=["c002"])
+    assert collection.find_one({"id": "d001"})['size'] == 35
+    assert collection.find_one({"id": "d001"})['checksums'] == [
+        {"type": "md5", "checksum": BUNDLE_MD5},
+    ]
+    assert collection.find_one({"id": "d002"})['size'] == 35
+    obj = collection.find_one({"id": "d002"}, {"_id": False})
+    assert obj.pop('_hash') == compute_etag(obj)
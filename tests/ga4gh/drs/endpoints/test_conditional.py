@@ -0,0 +1,48 @@
+"""Unit tests for conditional request helpers."""
+
+from flask import Flask
+
+from drs_filer.ga4gh.drs.endpoints.conditional import (
+    compute_etag,
+    etag_header,
+    not_modified,
+    pop_content_hash,
+    set_content_hash,
+    set_register_hash,
+)
+
+
+def test_compute_etag():
+    """Test that entity tags do not depend on key order."""
+    assert compute_etag({'a': 1, 'b': 2}) == compute_etag({'b': 2, 'a': 1})
+    assert compute_etag({'a': 1}) != compute_etag({'a': 2})
+
+
+def test_not_modified():
+    """Test matching of `If-None-Match` header."""
+    app = Flask(__name__)
+    etag = compute_etag({'a': 1})
+    with app.test_request_context(
+        headers={'If-None-Match': f'"other", {etag_header(etag)}'},
+    ):
+        assert not_modified(etag)
+    with app.test_request_context(headers={'If-None-Match': '*'}):
+        assert not_modified(etag)
+    with app.test_request_context(headers={'If-None-Match': '"other"'}):
+        assert not not_modified(etag)
+    with app.test_request_context():
+        assert not not_modified(etag)
+
+
+def test_set_register_hash():
+    """Test that registration hashes leave out access identifiers."""
+    obj = {'id': 'a', 'access_methods': [{'type': 's3', 'access_id': '1'}]}
+    set_content_hash(obj)
+    register_hash = set_register_hash(obj)
+    other = {'id': 'a', 'access_methods': [{'type': 's3', 'access_id': '2'}]}
+    assert set_register_hash(other) == register_hash
+    assert set_content_hash(other) != obj['_hash']
+    obj['name'] = 'b'
+    assert set_register_hash(obj) != register_hash
+    pop_content_hash(obj)
+    assert '_register_hash' not in obj
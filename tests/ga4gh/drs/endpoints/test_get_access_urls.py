@@ -0,0 +1,147 @@
+"""Test cases for bulk access URL resolution helpers."""
+
+import json
+
+from flask import Flask
+from foca.models.config import (Config, MongoConfig)
+import mongomock
+
+from drs_filer.ga4gh.drs.endpoints.get_access_urls import get_access_urls
+from drs_filer.ga4gh.drs.endpoints.get_objects import get_objects
+from drs_filer.ga4gh.drs.endpoints.object_cache import get_object_cache
+
+data_objects_path = "tests/data_objects.json"
+INDEX_CONFIG = {'keys': [('id', 1)]}
+COLLECTION_CONFIG = {'indexes': [INDEX_CONFIG]}
+DB_CONFIG = {'collections': {'objects': COLLECTION_CONFIG}}
+MONGO_CONFIG = {
+    'host': 'mongodb',
+    'port': 27017,
+    'dbs': {
+        'drsStore': DB_CONFIG,
+    },
+}
+ENDPOINT_CONFIG = {
+    "objects": {
+        "cache": {"size": 10, "ttl": 0},
+    },
+}
+OBJECT = {
+    "id": "b001",
+    "access_methods": [
+        {"type": "ftp", "access_id": "1", "access_url": {"url": "ftp://a"}},
+        {"type": "https", "access_id": "2", "access_url": {"url": "https://"}},
+    ],
+}
+
+
+def create_app() -> Flask:
+    """Create app with a populated database."""
+    app = Flask(__name__)
+    app.config['FOCA'] = Config(
+        db=MongoConfig(**MONGO_CONFIG),
+        endpoints=ENDPOINT_CONFIG,
+    )
+    app.config['FOCA'].db.dbs['drsStore']. \
+        collections['objects'].client = mongomock.MongoClient().db.collection
+    objects = json.loads(open(data_objects_path, "r").read())
+    objects.append(OBJECT)
+    app.config['FOCA'].db.dbs['drsStore']. \
+        collections['objects'].client.insert_many(objects)
+    return app
+
+
+def test_get_access_urls():
+    """Test for getting access URLs, some of which are not available."""
+    app = create_app()
+    objects = json.loads(open(data_objects_path, "r").read())
+    with app.app_context():
+        resolved, unresolved = get_access_urls(items=[
+            ("a011", "2"),
+            ("unavailable", "1"),
+            ("a001", "1"),
+            ("a011", "9"),
+            ("a003", "3"),
+        ])
+    assert resolved == [
+        {
+            'object_id': "a011",
+            'access_id': "2",
+            'access_url': objects[10]['access_methods'][1]['access_url'],
+        },
+        {
+            'object_id': "a001",
+            'access_id': "1",
+            'access_url': objects[0]['access_methods'][0]['access_url'],
+        },
+    ]
+    assert unresolved == [
+        {
+            'object_id': "unavailable",
+            'access_id': "1",
+            'error': {
+                'msg': "The requested `DrsObject` wasn't found.",
+                'status_code': 404,
+            },
+        },
+        {
+            'object_id': "a011",
+            'access_id': "9",
+            'error': {
+                'msg': "The requested access URL wasn't found.",
+                'status_code': 404,
+            },
+        },
+        {
+            'object_id': "a003",
+            'access_id': "3",
+            'error': {
+                'msg': "An unexpected error occurred",
+                'status_code': 500,
+            },
+        },
+    ]
+
+
+def test_get_access_urls_access_type():
+    """Test for selecting access methods by their type."""
+    app = create_app()
+    with app.app_context():
+        for access_type, access_id in [
+            ("https", "2"),
+            ("s3", "1"),
+            (None, "1"),
+        ]:
+            resolved, unresolved = get_access_urls(
+                items=[("b001", None), ("a010", None)],
+                access_type=access_type,
+            )
+            assert [
+                (res['object_id'], res['access_id']) for res in resolved
+            ] == [("b001", access_id)]
+            assert unresolved == [{
+                'object_id': "a010",
+                'error': {
+                    'msg': "The requested access URL wasn't found.",
+                    'status_code': 404,
+                },
+            }]
+
+
+def test_get_access_urls_cached():
+    """Test that cached objects are not retrieved from the database."""
+    app = create_app()
+    with app.app_context():
+        get_objects(["b001"])
+        app.config['FOCA'].db.dbs['drsStore']. \
+            collections['objects'].client.drop()
+        resolved, unresolved = get_access_urls(
+            items=[("b001", "2"), ("a001", "1")],
+        )
+        assert resolved == [{
+            'object_id': "b001",
+            'access_id': "2",
+            'access_url': {"url": "https://"},
+        }]
+        assert [res['object_id'] for res in unresolved] == ["a001"]
+        assert get_object_cache().stats()['hits'] == 1
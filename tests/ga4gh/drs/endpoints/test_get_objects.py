@@ -0,0 +1,54 @@
+"""Test cases for object retrieval helpers."""
+
+import json
+
+from flask import Flask
+from foca.models.config import (Config, MongoConfig)
+import mongomock
+
+from drs_filer.ga4gh.drs.endpoints.get_objects import get_objects
+from drs_filer.ga4gh.drs.endpoints.object_cache import get_object_cache
+
+data_objects_path = "tests/data_objects.json"
+INDEX_CONFIG = {'keys': [('id', 1)]}
+COLLECTION_CONFIG = {'indexes': [INDEX_CONFIG]}
+DB_CONFIG = {'collections': {'objects': COLLECTION_CONFIG}}
+MONGO_CONFIG = {
+    'host': 'mongodb',
+    'port': 27017,
+    'dbs': {
+        'drsStore': DB_CONFIG,
+    },
+}
+ENDPOINT_CONFIG = {
+    "objects": {
+        "cache": {"size": 10, "ttl": 0},
+    },
+}
+
+
+def test_get_objects():
+    """Test for getting multiple objects from cache and database."""
+    app = Flask(__name__)
+    app.config['FOCA'] = Config(
+        db=MongoConfig(**MONGO_CONFIG),
+        endpoints=ENDPOINT_CONFIG,
+    )
+    app.config['FOCA'].db.dbs['drsStore']. \
+        collections['objects'].client = mongomock.MongoClient().db.collection
+    objects = json.loads(open(data_objects_path, "r").read())
+    for obj in objects:
+        app.config['FOCA'].db.dbs['drsStore']. \
+            collections['objects'].client.insert_one(
+                dict(obj, _hash='hash')
+            )
+    with app.app_context():
+        assert get_objects(["a001"]) == {"a001": objects[0]}
+        res = get_objects(["a001", "a002", "unavailable"])
+        assert res == {"a001": objects[0], "a002": objects[1]}
+        assert get_object_cache().stats() == {
+            'entries': 2,
+            'hits': 1,
+            'misses': 3,
+        }
+        assert get_objects(["a001"]) == {"a001": objects[0]}
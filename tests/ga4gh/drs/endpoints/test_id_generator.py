@@ -0,0 +1,123 @@
+"""Test cases for identifier generation."""
+
+import logging
+import string
+
+from flask import Flask
+from foca.models.config import (Config, MongoConfig)
+import mongomock
+import pytest
+
+from drs_filer.ga4gh.drs.endpoints.id_generator import (
+    create_id_generators,
+    generate_id,
+    get_id_generator,
+    IdGenerator,
+    parse_charset,
+)
+
+INDEX_CONFIG = {'keys': [('id', 1)]}
+COLLECTION_CONFIG = {'indexes': [INDEX_CONFIG]}
+DB_CONFIG = {'collections': {'objects': COLLECTION_CONFIG}}
+MONGO_CONFIG = {
+    'host': 'mongodb',
+    'port': 27017,
+    'dbs': {
+        'drsStore': DB_CONFIG,
+    },
+}
+ENDPOINT_CONFIG = {
+    "objects": {
+        "id_charset": 'string.digits',
+        "id_length": 2
+    },
+    "access_methods": {
+        "id_charset": 'abc',
+        "id_length": 3
+    },
+}
+
+
+def create_app() -> Flask:
+    """Create app with mock database."""
+    app = Flask(__name__)
+    app.config['FOCA'] = Config(
+        db=MongoConfig(**MONGO_CONFIG),
+        endpoints=ENDPOINT_CONFIG,
+    )
+    app.config['FOCA'].db.dbs['drsStore']. \
+        collections['objects'].client = mongomock.MongoClient().db.collection
+    return app
+
+
+def test_id_generator():
+    """Test that identifiers are unique and drawn from the character set."""
+    generator = IdGenerator(charset='abcabc', length=4)
+    assert generator.charset == 'abc'
+    assert generator.space == 81
+    ids = generator.generate(count=81)
+    assert len(set(ids)) == 81
+    assert all(len(i) == 4 and set(i) <= set('abc') for i in ids)
+
+
+def test_id_generator_non_ascii():
+    """Test identifiers drawn from a non-ASCII character set."""
+    generator = IdGenerator(charset='äöü', length=5)
+    assert set(generator.generate()[0]) <= set('äöü')
+
+
+def test_id_generator_exhausted():
+    """Test that no more identifiers are generated than possible."""
+    with pytest.raises(ValueError):
+        IdGenerator(charset='ab', length=2).generate(count=5)
+
+
+def test_id_generator_invalid():
+    """Test that empty character sets are rejected."""
+    with pytest.raises(ValueError):
+        IdGenerator(charset='', length=6)
+
+
+def test_collision_probability():
+    """Test collision probability estimate."""
+    generator = IdGenerator(charset=string.digits, length=3)
+    assert generator.collision_probability(10) == 0.01
+    assert generator.collision_probability(2000) == 1
+
+
+def test_parse_charset():
+    """Test for 'parse_charset()'."""
+    assert parse_charset('string.digits') == string.digits
+    assert parse_charset('cbaab') == 'abc'
+
+
+def test_generate_id():
+    """Test for 'generate_id()'."""
+    random_id = generate_id()
+    assert isinstance(random_id, str)
+    assert len(random_id) == 6
+
+
+def test_create_id_generators(caplog):
+    """Test that generators are created once and collisions are estimated.
+    """
+    app = create_app()
+    app.config['FOCA'].db.dbs['drsStore'].collections['objects']. \
+        client.insert_many([{'id': str(i)} for i in range(5)])
+    with caplog.at_level(logging.INFO):
+        generators = create_id_generators(app=app)
+    assert generators['objects'].space == 100
+    assert generators['access_methods'].charset == 'abc'
+    assert 'probability 5.00e-02' in caplog.text
+    assert any(record.levelno == logging.WARNING for record in caplog.records)
+    with app.app_context():
+        assert get_id_generator('objects') is generators['objects']
+
+
+def test_get_id_generator():
+    """Test that generators are created on first use."""
+    app = create_app()
+    with app.app_context():
+        generator = get_id_generator('access_methods')
+        assert generator is get_id_generator('access_methods')
+    assert generator.length == 3
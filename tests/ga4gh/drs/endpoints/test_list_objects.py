@@ -0,0 +1,99 @@
+"""Test cases for object listing helpers."""
+
+from flask import Flask
+from foca.models.config import (Config, MongoConfig)
+import mongomock
+import pytest
+
+from drs_filer.errors.exceptions import BadRequest
+from drs_filer.ga4gh.drs.endpoints.list_objects import list_objects
+
+INDEX_CONFIG = {'keys': [('id', 1)]}
+COLLECTION_CONFIG = {'indexes': [INDEX_CONFIG]}
+DB_CONFIG = {'collections': {'objects': COLLECTION_CONFIG}}
+MONGO_CONFIG = {
+    'host': 'mongodb',
+    'port': 27017,
+    'dbs': {
+        'drsStore': DB_CONFIG,
+    },
+}
+OBJECTS = [
+    {
+        'id': f"obj{index}",
+        'name': 'a.bam' if index % 2 else 'b.bam',
+        'mime_type': 'application/octet-stream',
+        'created_time': f"2020-01-0{index + 1}T00:00:00Z",
+        'checksums': [{'type': 'md5', 'checksum': f"md5-{index}"}],
+        'access_methods': [{'type': 's3' if index < 3 else 'https'}],
+    }
+    for index in range(5)
+]
+
+
+def create_app() -> Flask:
+    """Create app with objects in a mock database."""
+    app = Flask(__name__)
+    app.config['FOCA'] = Config(db=MongoConfig(**MONGO_CONFIG))
+    collection = mongomock.MongoClient().db.collection
+    app.config['FOCA'].db.dbs['drsStore']. \
+        collections['objects'].client = collection
+    for obj in OBJECTS:
+        collection.insert_one(dict(obj, _hash='hash'))
+    return app
+
+
+def test_list_objects_pages():
+    """Test that paging through objects lists every object once."""
+    app = create_app()
+    ids = []
+    page_token = None
+    with app.app_context():
+        while True:
+            objs, page_token = list_objects(page_size=2, page_token=page_token)
+            assert len(objs) <= 2
+            ids.extend(obj['id'] for obj in objs)
+            if page_token is None:
+                break
+    assert ids == [obj['id'] for obj in OBJECTS]
+
+
+def test_list_objects_last_page():
+    """Test that no page token is returned if all objects fit a page."""
+    app = create_app()
+    with app.app_context():
+        objs, page_token = list_objects(page_size=5)
+    assert objs == OBJECTS
+    assert page_token is None
+
+
+def test_list_objects_filters():
+    """Test filtering objects."""
+    app = create_app()
+    with app.app_context():
+        assert [
+            obj['id'] for obj in list_objects(page_size=5, name='a.bam')[0]
+        ] == ['obj1', 'obj3']
+        assert [
+            obj['id'] for obj in list_objects(
+                page_size=5,
+                checksum='md5-2',
+                mime_type='application/octet-stream',
+            )[0]
+        ] == ['obj2']
+        assert [
+            obj['id'] for obj in list_objects(
+                page_size=5,
+                access_type='s3',
+                created_after='2020-01-02T00:00:00Z',
+                created_before='2020-01-05T00:00:00Z',
+            )[0]
+        ] == ['obj1', 'obj2']
+
+
+def test_list_objects_invalid_page_token():
+    """Test that invalid page tokens are rejected."""
+    app = create_app()
+    with app.app_context():
+        with pytest.raises(BadRequest):
+            list_objects(page_size=2, page_token='invalid')
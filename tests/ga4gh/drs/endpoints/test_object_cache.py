@@ -0,0 +1,96 @@
+"""Test cases for the object cache."""
+
+from flask import Flask
+from foca.models.config import Config
+
+from drs_filer.ga4gh.drs.endpoints.object_cache import (
+    get_object_cache,
+    ObjectCache,
+)
+
+MOCK_OBJECT = {"id": "a001", "name": "mock_object"}
+
+
+def test_object_cache_hit_miss():
+    """Test for cache hits and misses being counted."""
+    cache = ObjectCache(size=2, ttl=0)
+    assert cache.get("a001") is None
+    cache.set("a001", MOCK_OBJECT)
+    assert cache.get("a001") == MOCK_OBJECT
+    assert cache.stats() == {'entries': 1, 'hits': 1, 'misses': 1}
+
+
+def test_object_cache_returns_copy():
+    """Test that modifying a returned object does not modify the cache."""
+    cache = ObjectCache(size=2, ttl=0)
+    cache.set("a001", MOCK_OBJECT)
+    cache.get("a001")['name'] = "modified"
+    assert cache.get("a001") == MOCK_OBJECT
+
+
+def test_object_cache_lru_eviction():
+    """Test that the least recently used entry is evicted."""
+    cache = ObjectCache(size=2, ttl=0)
+    cache.set("a001", MOCK_OBJECT)
+    cache.set("a002", MOCK_OBJECT)
+    cache.get("a001")
+    cache.set("a003", MOCK_OBJECT)
+    assert cache.get("a002") is None
+    assert cache.get("a001") == MOCK_OBJECT
+    assert cache.get("a003") == MOCK_OBJECT
+
+
+def test_object_cache_ttl(monkeypatch):
+    """Test that expired entries are not returned."""
+    cache = ObjectCache(size=2, ttl=10)
+    monkeypatch.setattr(
+        'drs_filer.ga4gh.drs.endpoints.object_cache.monotonic',
+        lambda: 100,
+    )
+    cache.set("a001", MOCK_OBJECT)
+    monkeypatch.setattr(
+        'drs_filer.ga4gh.drs.endpoints.object_cache.monotonic',
+        lambda: 111,
+    )
+    assert cache.get("a001") is None
+
+
+def test_object_cache_invalidate():
+    """Test that invalidated entries are removed and that objects read before
+    an invalidation are not cached."""
+    cache = ObjectCache(size=2, ttl=0)
+    cache.set("a001", MOCK_OBJECT)
+    generation = cache.generation
+    cache.invalidate("a001")
+    assert cache.get("a001") is None
+    cache.set("a001", MOCK_OBJECT, generation=generation)
+    assert cache.get("a001") is None
+
+
+def test_object_cache_disabled():
+    """Test that nothing is cached if size is 0."""
+    cache = ObjectCache()
+    cache.set("a001", MOCK_OBJECT)
+    assert cache.get("a001") is None
+    assert cache.stats()['misses'] == 0
+
+
+def test_get_object_cache():
+    """Test for getting the cache configured for the current app."""
+    app = Flask(__name__)
+    app.config['FOCA'] = Config(
+        endpoints={"objects": {"cache": {"size": 5, "ttl": 10}}},
+    )
+    with app.app_context():
+        cache = get_object_cache()
+        assert cache.size == 5
+        assert cache.ttl == 10
+        assert get_object_cache() is cache
+
+
+def test_get_object_cache_not_configured():
+    """Test for getting a disabled cache if none is configured."""
+    app = Flask(__name__)
+    app.config['FOCA'] = Config()
+    with app.app_context():
+        assert not get_object_cache().enabled
@@ -2,20 +2,21 @@
 
 from copy import deepcopy
 import json
-import string  # noqa: F401
 from unittest.mock import MagicMock
 
 from flask import Flask
 from foca.models.config import (Config, MongoConfig)
 import mongomock
-from pymongo.errors import DuplicateKeyError
+from pymongo.errors import (BulkWriteError, DuplicateKeyError)
 import pytest
 from werkzeug.exceptions import InternalServerError
 
+from drs_filer.ga4gh.drs.endpoints.id_generator import IdGenerator
 from drs_filer.ga4gh.drs.endpoints.register_objects import (
     __add_access_ids,
+    get_self_uri,
+    register_bulk_objects,
     register_object,
-    generate_id,
 )
 
 data_objects_path = "tests/data_objects.json"
@@ -107,6 +108,99 @@ def test_register_object_exceed_retries():
             register_object(data=request_data, retries=3)
 
 
+def test_register_bulk_objects(monkeypatch):
+    """Test for registering multiple objects, one of which is assigned an
+    identifier that exists already.
+    """
+    app = Flask(__name__)
+    app.config['FOCA'] = \
+        Config(
+            db=MongoConfig(**MONGO_CONFIG),
+            endpoints=ENDPOINT_CONFIG,
+        )
+    collection = mongomock.MongoClient().db.collection
+    collection.create_index('id', unique=True)
+    collection.insert_one({"id": "000000"})
+    app.config['FOCA'].db.dbs['drsStore']. \
+        collections['objects'].client = collection
+
+    ids = iter(["000000", "000001", "000002"])
+    counts = []
+    request_data = [{"name": "mock_name_1"}, {"name": "mock_name_2"}]
+    monkeypatch.setattr(
+        IdGenerator,
+        'generate',
+        lambda self, count=1: counts.append(count) or [
+            next(ids) for __ in range(count)
+        ],
+    )
+    with app.app_context():
+        res = register_bulk_objects(data=request_data)
+    assert sorted(res) == ["000001", "000002"]
+    assert counts == [2, 1]
+    for object_id in res:
+        obj = collection.find_one({"id": object_id})
+        assert obj['self_uri'].endswith(f"/{object_id}")
+
+
+def test_register_bulk_objects_exceed_retries():
+    """Test for registering multiple objects; exceed retries for generating
+    unique identifiers.
+    """
+    app = Flask(__name__)
+    app.config['FOCA'] = \
+        Config(
+            db=MongoConfig(**MONGO_CONFIG),
+            endpoints=ENDPOINT_CONFIG,
+        )
+    mock_resp = MagicMock(side_effect=BulkWriteError({
+        'writeErrors': [{'index': 0, 'code': 11000}],
+    }))
+    app.config['FOCA'].db.dbs['drsStore'].collections['objects']. \
+        client = MagicMock()
+    app.config['FOCA'].db.dbs['drsStore'].collections['objects']. \
+        client.insert_many = mock_resp
+
+    request_data = [{"name": "mock_name"}]
+    with app.app_context():
+        with pytest.raises(InternalServerError):
+            register_bulk_objects(data=request_data, retries=3)
+    assert mock_resp.call_count == 4
+
+
+def test_register_bulk_objects_write_error():
+    """Test for registering multiple objects when the bulk insert fails for
+    other reasons than duplicate identifiers.
+    """
+    app = Flask(__name__)
+    app.config['FOCA'] = \
+        Config(
+            db=MongoConfig(**MONGO_CONFIG),
+            endpoints=ENDPOINT_CONFIG,
+        )
+    mock_resp = MagicMock(side_effect=BulkWriteError({
+        'writeErrors': [{'index': 0, 'code': 121}],
+    }))
+    app.config['FOCA'].db.dbs['drsStore'].collections['objects']. \
+        client = MagicMock()
+    app.config['FOCA'].db.dbs['drsStore'].collections['objects']. \
+        client.insert_many = mock_resp
+
+    request_data = [{"name": "mock_name"}]
+    with app.app_context():
+        with pytest.raises(InternalServerError):
+            register_bulk_objects(data=request_data)
+    assert mock_resp.call_count == 1
+
+
+def test_get_self_uri():
+    """Test for 'get_self_uri()'."""
+    app = Flask(__name__)
+    app.config['FOCA'] = Config(endpoints=ENDPOINT_CONFIG)
+    with app.app_context():
+        assert get_self_uri("a001") == "http://1.2.3.4:8080/ga4gh/drs/v1/a001"
+
+
 def test_add_access_ids():
     """Test for __add_access_ids()."""
     app = Flask(__name__)
@@ -115,11 +209,6 @@ def test_add_access_ids():
     mock_data = objects[0]['access_methods']
     with app.app_context():
         res = __add_access_ids(mock_data)
-        print(res)
         assert isinstance(res, list)
-
-
-def test_generate_id():
-    """Test for 'generate_id()'."""
-    random_id = generate_id()
-    assert isinstance(random_id, str)
+    access_ids = [method['access_id'] for method in res]
+    assert len(set(access_ids)) == len(res)
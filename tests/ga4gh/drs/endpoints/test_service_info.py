@@ -12,6 +12,7 @@ from pymongo.errors import DuplicateKeyError
 from unittest.mock import MagicMock
 
 from drs_filer.ga4gh.drs.endpoints.service_info import (
+    get_service_info_cache,
     RegisterServiceInfo
 )
 from drs_filer.errors.exceptions import (
@@ -106,6 +107,101 @@ def test_get_service_info():
         assert RegisterServiceInfo().get_service_info() == SERVICE_INFO_CONFIG
 
 
+def test_get_service_info_cached():
+    """Test that service info is cached and refreshed on updates."""
+    endpoint_config = deepcopy(ENDPOINT_CONFIG)
+    endpoint_config['service_info_cache'] = {'ttl': 0}
+    app = Flask(__name__)
+    app.config['FOCA'] = Config(
+        db=MongoConfig(**MONGO_CONFIG),
+        endpoints=endpoint_config,
+    )
+    db_coll = mongomock.MongoClient().db.collection
+    app.config['FOCA'].db.dbs['drsStore'].collections['service_info'] \
+        .client = db_coll
+    db_coll.insert_one(deepcopy(SERVICE_INFO_CONFIG))
+
+    with app.app_context():
+        service_info = RegisterServiceInfo()
+        assert service_info.get_service_info() == SERVICE_INFO_CONFIG
+        db_coll.delete_many({})
+        assert service_info.get_service_info() == SERVICE_INFO_CONFIG
+        assert get_service_info_cache().stats()['hits'] == 1
+        data = deepcopy(SERVICE_INFO_CONFIG)
+        data['version'] = '2.0.0'
+        service_info.set_service_info_from_app_context(data=data)
+        assert service_info.get_service_info() == data
+
+
+def test_get_service_info_cached_other_worker():
+    """Test that changes made by other workers are picked up."""
+    endpoint_config = deepcopy(ENDPOINT_CONFIG)
+    endpoint_config['service_info_cache'] = {'ttl': 0}
+    app = Flask(__name__)
+    app.config['FOCA'] = Config(
+        db=MongoConfig(**MONGO_CONFIG),
+        endpoints=endpoint_config,
+    )
+    app.config['FOCA'].db.dbs['drsStore'].collections['service_info'] \
+        .client = mongomock.MongoClient().db.collection
+
+    with app.app_context():
+        service_info = RegisterServiceInfo()
+        service_info.set_service_info_from_app_context(
+            data=deepcopy(SERVICE_INFO_CONFIG),
+        )
+        assert service_info.get_service_info() == SERVICE_INFO_CONFIG
+        assert service_info.get_service_info() == SERVICE_INFO_CONFIG
+        assert get_service_info_cache().stats()['hits'] == 1
+        data = deepcopy(SERVICE_INFO_CONFIG)
+        data['version'] = '2.0.0'
+        service_info.storage.upsert_service_info(data=data)
+        assert service_info.get_service_info() == data
+
+
+def test_get_service_info_cached_ttl(monkeypatch):
+    """Test that the version is not looked up until the cache expires."""
+    endpoint_config = deepcopy(ENDPOINT_CONFIG)
+    endpoint_config['service_info_cache'] = {'ttl': 30}
+    app = Flask(__name__)
+    app.config['FOCA'] = Config(
+        db=MongoConfig(**MONGO_CONFIG),
+        endpoints=endpoint_config,
+    )
+    app.config['FOCA'].db.dbs['drsStore'].collections['service_info'] \
+        .client = mongomock.MongoClient().db.collection
+
+    with app.app_context():
+        service_info = RegisterServiceInfo()
+        service_info.storage.upsert_service_info(
+            data=deepcopy(SERVICE_INFO_CONFIG),
+        )
+        assert service_info.get_service_info() == SERVICE_INFO_CONFIG
+        data = deepcopy(SERVICE_INFO_CONFIG)
+        data['version'] = '2.0.0'
+        service_info.storage.upsert_service_info(data=data)
+        service_info.storage.get_service_info_version = MagicMock()
+        assert service_info.get_service_info() == SERVICE_INFO_CONFIG
+        service_info.storage.get_service_info_version.assert_not_called()
+        monkeypatch.setattr(
+            'drs_filer.ga4gh.drs.endpoints.object_cache.monotonic',
+            lambda: float('inf'),
+        )
+        assert service_info.get_service_info() == data
+
+
+def test_get_service_info_cache_disabled():
+    """Test that the service info cache is disabled if not configured."""
+    app = Flask(__name__)
+    app.config['FOCA'] = Config(
+        db=MongoConfig(**MONGO_CONFIG),
+        endpoints=ENDPOINT_CONFIG,
+    )
+
+    with app.app_context():
+        assert not get_service_info_cache().enabled
+
+
 def test_get_service_info_na():
     """Test for getting service info if unavailable."""
     app = Flask(__name__)
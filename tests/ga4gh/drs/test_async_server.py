@@ -0,0 +1,209 @@
+"""Test cases for the asynchronous controllers."""
+
+import asyncio
+from copy import deepcopy
+from typing import (Any, Awaitable, Dict, List)
+
+from flask import Flask
+from flask import json
+from foca.models.config import Config
+import mongomock
+import pytest
+from werkzeug.test import EnvironBuilder
+from werkzeug.wrappers import Request
+
+from drs_filer.errors.exceptions import (
+    NotFound,
+    ObjectNotFound,
+    URLNotFound,
+)
+from drs_filer.ga4gh.drs.async_server import (
+    GetAccessURL,
+    GetObject,
+    getServiceInfo,
+)
+from drs_filer.ga4gh.drs.endpoints.object_cache import get_object_cache
+from drs_filer.ga4gh.drs.endpoints.service_info import get_service_info_cache
+
+data_objects_path = "tests/data_objects.json"
+
+SERVICE_INFO = {
+    "id": "org.ga4gh.myservice",
+    "name": "My project",
+    "version": "1.0.0",
+}
+
+
+class MockCursor:
+    """Asynchronous wrapper of a mongomock cursor."""
+
+    def __init__(self, cursor) -> None:
+        self.cursor = cursor
+
+    def sort(self, *args, **kwargs) -> 'MockCursor':
+        self.cursor = self.cursor.sort(*args, **kwargs)
+        return self
+
+    def limit(self, limit: int) -> 'MockCursor':
+        self.cursor = self.cursor.limit(limit)
+        return self
+
+    async def to_list(self, length: int) -> List[Dict]:
+        return list(self.cursor)[:length]
+
+
+class MockCollection:
+    """Asynchronous wrapper of a mongomock collection."""
+
+    def __init__(self, collection) -> None:
+        self.collection = collection
+
+    async def find_one(self, *args, **kwargs) -> Dict:
+        return self.collection.find_one(*args, **kwargs)
+
+    def find(self, *args, **kwargs) -> MockCursor:
+        return MockCursor(self.collection.find(*args, **kwargs))
+
+    def aggregate(self, pipeline: List[Dict]) -> MockCursor:
+        return MockCursor(self.collection.aggregate(pipeline))
+
+
+class MockClient:
+    """Asynchronous wrapper of a mongomock client."""
+
+    def __init__(self) -> None:
+        self.client = mongomock.MongoClient()
+
+    def __getitem__(self, name: str) -> Dict:
+        return {
+            collection: MockCollection(self.client[name][collection])
+            for collection in ['objects', 'service_info']
+        }
+
+
+def run_until_complete(coroutine: Awaitable) -> Any:
+    """Run coroutine to completion, as `asyncio.run()` does on Python 3.7+."""
+    return asyncio.get_event_loop().run_until_complete(coroutine)
+
+
+def create_app(endpoints: Dict = None) -> Flask:
+    """Create app with an asynchronous client on a populated database."""
+    app = Flask(__name__)
+    app.config['FOCA'] = Config(endpoints=endpoints or {})
+    client = MockClient()
+    app.extensions['drs_filer_motor_client'] = client
+    objects = json.loads(open(data_objects_path, "r").read())
+    client.client['drsStore']['objects'].insert_many(objects)
+    client.client['drsStore']['service_info'].insert_one(
+        deepcopy(SERVICE_INFO)
+    )
+    return app
+
+
+def create_request(**kwargs) -> Request:
+    """Create request."""
+    return Request(EnvironBuilder(**kwargs).get_environ())
+
+
+def test_GetObject():
+    """Test for getting DRS object asynchronously."""
+    app = create_app()
+    res, code, headers = run_until_complete(
+        GetObject(app=app, request=create_request(), object_id="a001")
+    )
+    assert res['id'] == "a001"
+    assert code == 200
+    request = create_request(headers={'If-None-Match': headers['ETag']})
+    assert run_until_complete(
+        GetObject(app=app, request=request, object_id="a001")
+    ) == (None, 304, headers)
+    with pytest.raises(ObjectNotFound):
+        run_until_complete(
+            GetObject(app=app, request=create_request(), object_id="a01")
+        )
+
+
+def test_GetObject_cached():
+    """Test that objects are served from the cache."""
+    app = create_app(endpoints={
+        'objects': {'cache': {'size': 10, 'ttl': 0}},
+    })
+    res = run_until_complete(
+        GetObject(app=app, request=create_request(), object_id="a001")
+    )
+    app.extensions['drs_filer_motor_client'].client.drop_database('drsStore')
+    assert run_until_complete(
+        GetObject(app=app, request=create_request(), object_id="a001")
+    ) == res
+    assert get_object_cache(app=app).stats()['hits'] == 1
+
+
+def test_GetAccessURL():
+    """Test for getting access URL of DRS object asynchronously."""
+    app = create_app()
+    res, code, headers = run_until_complete(GetAccessURL(
+        app=app,
+        request=create_request(),
+        object_id="a001",
+        access_id="1",
+    ))
+    assert res == {
+        "url": "ftp://ftp.ensembl.org/pub/release-96/fasta/homo_sapiens/dna//Homo_sapiens.GRCh38.dna.chromosome.19.fa.gz",   # noqa: E501
+        "headers": ["None"],
+    }
+    assert code == 200
+    assert headers['ETag'] == run_until_complete(
+        GetObject(app=app, request=create_request(), object_id="a001")
+    )[2]['ETag']
+    with pytest.raises(URLNotFound):
+        run_until_complete(GetAccessURL(
+            app=app,
+            request=create_request(),
+            object_id="a001",
+            access_id="12",
+        ))
+    with pytest.raises(ObjectNotFound):
+        run_until_complete(GetAccessURL(
+            app=app,
+            request=create_request(),
+            object_id="001",
+            access_id="1",
+        ))
+
+
+def test_getServiceInfo():
+    """Test for getting service info asynchronously."""
+    app = create_app()
+    res, code, headers = run_until_complete(
+        getServiceInfo(app=app, request=create_request())
+    )
+    assert res == SERVICE_INFO
+    assert code == 200
+    assert headers['Cache-Control'] == 'no-cache'
+    request = create_request(headers={'If-None-Match': headers['ETag']})
+    assert run_until_complete(
+        getServiceInfo(app=app, request=request)
+    ) == (None, 304, headers)
+    app.extensions['drs_filer_motor_client'].client.drop_database('drsStore')
+    with pytest.raises(NotFound):
+        run_until_complete(getServiceInfo(app=app, request=create_request()))
+
+
+def test_getServiceInfo_cached():
+    """Test that cached service info is used while its version is current."""
+    app = create_app(endpoints={'service_info_cache': {'ttl': 0}})
+    collection = app.extensions['drs_filer_motor_client'].client['drsStore'][
+        'service_info'
+    ]
+    collection.update_one({}, {'$set': {'_version': '1'}})
+    for __ in range(2):
+        res, __, __ = run_until_complete(
+            getServiceInfo(app=app, request=create_request())
+        )
+        assert res == SERVICE_INFO
+    assert get_service_info_cache(app=app).stats()['hits'] == 1
+    collection.update_one({}, {'$set': {'version': '2', '_version': '2'}})
+    res, __, __ = run_until_complete(
+        getServiceInfo(app=app, request=create_request())
+    )
+    assert res == dict(SERVICE_INFO, version='2')
@@ -2,29 +2,39 @@ import mongomock
 import pytest
 
 from copy import deepcopy
+from unittest.mock import MagicMock
 
 from flask import Flask
 from flask import json
 
 from foca.models.config import Config
 from foca.models.config import MongoConfig
+from pymongo.errors import DuplicateKeyError
 
+from drs_filer.database.backends import create_storage
 from drs_filer.errors.exceptions import (
     AccessMethodNotFound,
     BadRequest,
     URLNotFound,
     ObjectNotFound,
-    InternalServerError)
+    InternalServerError,
+    PreconditionFailed)
 from drs_filer.ga4gh.drs.server import (
     DeleteAccessMethod,
     DeleteObject,
+    GetBulkAccessURLs,
+    GetBulkObjects,
     GetObject,
     GetAccessURL,
     getServiceInfo,
+    ListObjects,
+    PostBulkObjects,
     PostObject,
     postServiceInfo,
     PutObject,
 )
+from drs_filer.ga4gh.drs.endpoints.conditional import compute_etag
+from drs_filer.ga4gh.drs.endpoints.object_cache import get_object_cache
 
 
 MOCK_ID_NA = "unavailable"
@@ -76,7 +86,10 @@ SERVICE_INFO_CONFIG = {
 ENDPOINT_CONFIG = {
     "objects": {
         "id_charset": 'string.digits',
-        "id_length": 6
+        "id_length": 6,
+        "bulk_max_size": 3,
+        "list_page_size": 2,
+        "list_max_page_size": 3
     },
     "access_methods": {
         "id_charset": "string.digits",
@@ -109,9 +122,13 @@ def test_GetObject():
         obj['_id'] = app.config['FOCA'].db.dbs['drsStore']. \
             collections['objects'].client.insert_one(obj).inserted_id
     del objects[0]['_id']
-    with app.app_context():
-        res = GetObject.__wrapped__("a001")
+    with app.test_request_context():
+        res, code, headers = GetObject.__wrapped__("a001")
         assert res == objects[0]
+        assert code == 200
+        etag = headers['ETag']
+    with app.test_request_context(headers={'If-None-Match': etag}):
+        assert GetObject.__wrapped__("a001") == (None, 304, headers)
 
 
 def test_GetObject_Not_Found():
@@ -130,6 +147,83 @@ def test_GetObject_Not_Found():
             GetObject.__wrapped__("a01")
 
 
+def test_GetObject_expand():
+    """Test for getting a bundle with expanded contents."""
+    app = Flask(__name__)
+    endpoint_config = deepcopy(ENDPOINT_CONFIG)
+    endpoint_config['objects']['expand_max_depth'] = 2
+    endpoint_config['objects']['expand_max_nodes'] = 10
+    app.config['FOCA'] = \
+        Config(db=MongoConfig(**MONGO_CONFIG), endpoints=endpoint_config)
+    app.config['FOCA'].db.dbs['drsStore']. \
+        collections['objects'].client = mongomock.MongoClient().db.collection
+    app.config['FOCA'].db.dbs['drsStore']. \
+        collections['objects'].client.insert_many([
+            {"id": "b001", "contents": [{"name": "b002", "id": "b002"}]},
+            {"id": "b002", "contents": [{"name": "a001", "id": "a001"}]},
+            {"id": "a001"},
+        ])
+    with app.test_request_context():
+        res, _, headers = GetObject.__wrapped__("b001")
+        assert res['contents'] == [{"name": "b002", "id": "b002"}]
+        res, _, expanded_headers = GetObject.__wrapped__("b001", expand=True)
+        assert expanded_headers['ETag'] != headers['ETag']
+        assert res['contents'] == [{
+            "name": "b002",
+            "id": "b002",
+            "contents": [{"name": "a001", "id": "a001"}],
+        }]
+
+
+def test_GetObject_cached():
+    """Test that objects are served from the cache and that the cache is
+    invalidated when an object is deleted."""
+    app = Flask(__name__)
+    endpoint_config = deepcopy(ENDPOINT_CONFIG)
+    endpoint_config['objects']['cache'] = {'size': 10, 'ttl': 0}
+    app.config['FOCA'] = \
+        Config(db=MongoConfig(**MONGO_CONFIG), endpoints=endpoint_config)
+    app.config['FOCA'].db.dbs['drsStore']. \
+        collections['objects'].client = mongomock.MongoClient().db.collection
+    objects = json.loads(open(data_objects_path, "r").read())
+    for obj in objects:
+        app.config['FOCA'].db.dbs['drsStore']. \
+            collections['objects'].client.insert_one(obj)
+    with app.test_request_context():
+        res = GetObject.__wrapped__("a001")
+        assert GetObject.__wrapped__("a001") == res
+        assert get_object_cache().stats()['hits'] == 1
+        DeleteObject.__wrapped__("a001")
+        with pytest.raises(ObjectNotFound):
+            GetObject.__wrapped__("a001")
+
+
+def test_GetObject_cached_secondary(monkeypatch):
+    """Test that objects are cached as read from the primary, even if reads
+    are routed to a lagging secondary."""
+    app = Flask(__name__)
+    endpoint_config = deepcopy(ENDPOINT_CONFIG)
+    endpoint_config['objects']['cache'] = {'size': 10, 'ttl': 0}
+    app.config['FOCA'] = \
+        Config(db=MongoConfig(**MONGO_CONFIG), endpoints=endpoint_config)
+    primary = mongomock.MongoClient().db.collection
+    secondary = mongomock.MongoClient().db.collection
+    app.config['FOCA'].db.dbs['drsStore']. \
+        collections['objects'].client = primary
+    monkeypatch.setattr(
+        'drs_filer.database.mongo_storage.get_collection',
+        lambda name, read=False: secondary if read else primary,
+    )
+    for collection in (primary, secondary):
+        collection.insert_one(deepcopy(MOCK_DATA_OBJECT))
+    with app.test_request_context(json={"name": "drsObject2"}):
+        PutObject.__wrapped__("a011")
+    with app.test_request_context():
+        assert GetObject.__wrapped__("a011")[0]['name'] == "drsObject2"
+        assert GetObject.__wrapped__("a011")[0]['name'] == "drsObject2"
+        assert get_object_cache().stats()['hits'] == 1
+
+
 def test_GetAccessURL():
     """Test for getting DRSObject access url using `object_id` and `access_id`
     """
@@ -142,8 +236,10 @@ def test_GetAccessURL():
         obj['_id'] = app.config['FOCA'].db.dbs['drsStore']. \
             collections['objects'].client.insert_one(obj).inserted_id
     del objects[0]['_id']
-    with app.app_context():
-        res = GetAccessURL.__wrapped__("a001", "1")
+    with app.test_request_context():
+        res, code, headers = GetAccessURL.__wrapped__("a001", "1")
+        assert code == 200
+        assert headers['ETag'] == GetObject.__wrapped__("a001")[2]['ETag']
         expected = {
             "url": "ftp://ftp.ensembl.org/pub/release-96/fasta/homo_sapiens/dna//Homo_sapiens.GRCh38.dna.chromosome.19.fa.gz",   # noqa: E501
             "headers": [
@@ -153,6 +249,31 @@ def test_GetAccessURL():
         assert res == expected
 
 
+def test_GetAccessURL_cached(monkeypatch):
+    """Test for getting DRSObject access url from the object cache."""
+    app = Flask(__name__)
+    endpoint_config = deepcopy(ENDPOINT_CONFIG)
+    endpoint_config['objects']['cache'] = {'size': 10, 'ttl': 0}
+    app.config['FOCA'] = \
+        Config(db=MongoConfig(**MONGO_CONFIG), endpoints=endpoint_config)
+    app.config['FOCA'].db.dbs['drsStore']. \
+        collections['objects'].client = mongomock.MongoClient().db.collection
+    objects = json.loads(open(data_objects_path, "r").read())
+    for obj in objects:
+        app.config['FOCA'].db.dbs['drsStore']. \
+            collections['objects'].client.insert_one(obj)
+    with app.test_request_context():
+        GetObject.__wrapped__("a011")
+        monkeypatch.setattr(
+            'mongomock.collection.Collection.aggregate',
+            lambda *args, **kwargs: pytest.fail("database was queried"),
+        )
+        res = GetAccessURL.__wrapped__("a011", "2")[0]
+        assert res == objects[10]['access_methods'][1]['access_url']
+        with pytest.raises(URLNotFound):
+            GetAccessURL.__wrapped__("a011", "3")
+
+
 def test_GetAccessURL_Not_Found():
     """GetAccessURL should raise NotFound exception when access_id is not found
     """
@@ -232,6 +353,137 @@ def test_GetAccessURL_Duplicate_Access_Id():
             GetAccessURL.__wrapped__("a003", "3")
 
 
+def test_GetBulkObjects():
+    """Test for getting multiple objects, some of which are not available."""
+    app = Flask(__name__)
+    app.config['FOCA'] = \
+        Config(db=MongoConfig(**MONGO_CONFIG), endpoints=ENDPOINT_CONFIG)
+    app.config['FOCA'].db.dbs['drsStore']. \
+        collections['objects'].client = mongomock.MongoClient().db.collection
+    objects = json.loads(open(data_objects_path, "r").read())
+    for obj in objects:
+        app.config['FOCA'].db.dbs['drsStore']. \
+            collections['objects'].client.insert_one(deepcopy(obj))
+    request_data = {"bulk_object_ids": ["a002", MOCK_ID_NA, "a001", "a002"]}
+    with app.test_request_context(json=request_data):
+        res = GetBulkObjects.__wrapped__()
+        assert res == {
+            'resolved_drs_objects': [objects[1], objects[0]],
+            'unresolved_object_ids': [MOCK_ID_NA],
+        }
+
+
+def test_GetBulkObjects_BadRequest():
+    """Test for getting more objects than allowed in a single request."""
+    app = Flask(__name__)
+    app.config['FOCA'] = \
+        Config(db=MongoConfig(**MONGO_CONFIG), endpoints=ENDPOINT_CONFIG)
+    app.config['FOCA'].db.dbs['drsStore']. \
+        collections['objects'].client = mongomock.MongoClient().db.collection
+    request_data = {"bulk_object_ids": ["a001", "a002", "a003", "a004"]}
+    with app.test_request_context(json=request_data):
+        with pytest.raises(BadRequest):
+            GetBulkObjects.__wrapped__()
+
+
+def test_GetBulkAccessURLs():
+    """Test for getting multiple access URLs, some of which are not
+    available."""
+    app = Flask(__name__)
+    app.config['FOCA'] = \
+        Config(db=MongoConfig(**MONGO_CONFIG), endpoints=ENDPOINT_CONFIG)
+    app.config['FOCA'].db.dbs['drsStore']. \
+        collections['objects'].client = mongomock.MongoClient().db.collection
+    objects = json.loads(open(data_objects_path, "r").read())
+    app.config['FOCA'].db.dbs['drsStore']. \
+        collections['objects'].client.insert_many(deepcopy(objects))
+    request_data = {
+        "bulk_access_ids": [
+            {"object_id": "a002", "access_id": "2"},
+            {"object_id": MOCK_ID_NA},
+            {"object_id": "a001"},
+            {"object_id": "a002", "access_id": "2"},
+        ],
+        "access_type": "ftp",
+    }
+    with app.test_request_context(json=request_data):
+        res = GetBulkAccessURLs.__wrapped__()
+        assert res == {
+            'resolved_access_urls': [
+                {
+                    'object_id': "a002",
+                    'access_id': "2",
+                    'access_url':
+                        objects[1]['access_methods'][0]['access_url'],
+                },
+                {
+                    'object_id': "a001",
+                    'access_id': "1",
+                    'access_url':
+                        objects[0]['access_methods'][0]['access_url'],
+                },
+            ],
+            'unresolved_access_urls': [{
+                'object_id': MOCK_ID_NA,
+                'error': {
+                    'msg': "The requested `DrsObject` wasn't found.",
+                    'status_code': 404,
+                },
+            }],
+        }
+
+
+def test_GetBulkAccessURLs_BadRequest():
+    """Test for getting more access URLs than allowed in a single
+    request."""
+    app = Flask(__name__)
+    app.config['FOCA'] = \
+        Config(db=MongoConfig(**MONGO_CONFIG), endpoints=ENDPOINT_CONFIG)
+    app.config['FOCA'].db.dbs['drsStore']. \
+        collections['objects'].client = mongomock.MongoClient().db.collection
+    request_data = {
+        "bulk_access_ids": [
+            {"object_id": object_id}
+            for object_id in ["a001", "a002", "a003", "a004"]
+        ],
+    }
+    with app.test_request_context(json=request_data):
+        with pytest.raises(BadRequest):
+            GetBulkAccessURLs.__wrapped__()
+
+
+def test_ListObjects():
+    """Test for listing objects page by page."""
+    app = Flask(__name__)
+    app.config['FOCA'] = \
+        Config(db=MongoConfig(**MONGO_CONFIG), endpoints=ENDPOINT_CONFIG)
+    app.config['FOCA'].db.dbs['drsStore']. \
+        collections['objects'].client = mongomock.MongoClient().db.collection
+    objects = json.loads(open(data_objects_path, "r").read())
+    for obj in objects[:3]:
+        app.config['FOCA'].db.dbs['drsStore']. \
+            collections['objects'].client.insert_one(deepcopy(obj))
+    with app.test_request_context():
+        res = ListObjects.__wrapped__()
+        assert res['drs_objects'] == objects[:2]
+        res = ListObjects.__wrapped__(page_token=res['next_page_token'])
+        assert res == {'drs_objects': objects[2:3]}
+        res = ListObjects.__wrapped__(page_size=3, name=objects[1]['name'])
+        assert res == {'drs_objects': objects[1:2]}
+
+
+def test_ListObjects_BadRequest():
+    """Test for listing more objects per page than allowed."""
+    app = Flask(__name__)
+    app.config['FOCA'] = \
+        Config(db=MongoConfig(**MONGO_CONFIG), endpoints=ENDPOINT_CONFIG)
+    app.config['FOCA'].db.dbs['drsStore']. \
+        collections['objects'].client = mongomock.MongoClient().db.collection
+    with app.test_request_context():
+        with pytest.raises(BadRequest):
+            ListObjects.__wrapped__(page_size=4)
+
+
 def test_DeleteObject():
     """DeleteObject should return the id of the deleted object"""
     app = Flask(__name__)
@@ -284,6 +536,20 @@ def test_DeleteAccessMethod():
     with app.app_context():
         res = DeleteAccessMethod.__wrapped__("a011", "2")
         assert res == "2"
+    obj = app.config['FOCA'].db.dbs['drsStore']. \
+        collections['objects'].client.find_one({"id": "a011"}, {"_id": False})
+    assert '_hash' not in obj
+    assert [m['access_id'] for m in obj['access_methods']] == ["1"]
+    with app.test_request_context():
+        etag = GetObject.__wrapped__("a011")[2]['ETag']
+        assert etag == f'"{compute_etag(obj)}"'
+    with app.test_request_context(
+        json={"name": "drsObject"},
+        headers={'If-Match': etag},
+    ):
+        PutObject.__wrapped__("a011")
+    with app.test_request_context():
+        assert GetObject.__wrapped__("a011")[0]['name'] == "drsObject"
 
 
 def test_DeleteAccessMethod_ObjectNotFound():
@@ -387,6 +653,35 @@ def test_PostObject():
         assert isinstance(res, str)
 
 
+def test_PostBulkObjects():
+    """Test for creating multiple objects with auto-generated identifiers."""
+    app = Flask(__name__)
+    app.config['FOCA'] = \
+        Config(db=MongoConfig(**MONGO_CONFIG), endpoints=ENDPOINT_CONFIG)
+    app.config['FOCA'].db.dbs['drsStore']. \
+        collections['objects'].client = mongomock.MongoClient().db.collection
+
+    request_data = {"drs_objects": [{"name": "drsObject1"}, {"name": "o2"}]}
+    with app.test_request_context(json=request_data):
+        res = PostBulkObjects.__wrapped__()
+        assert [o['index'] for o in res['registered_objects']] == [0, 1]
+        assert len({o['object_id'] for o in res['registered_objects']}) == 2
+
+
+def test_PostBulkObjects_BadRequest():
+    """Test for creating more objects than allowed in a single request."""
+    app = Flask(__name__)
+    app.config['FOCA'] = \
+        Config(db=MongoConfig(**MONGO_CONFIG), endpoints=ENDPOINT_CONFIG)
+    app.config['FOCA'].db.dbs['drsStore']. \
+        collections['objects'].client = mongomock.MongoClient().db.collection
+
+    request_data = {"drs_objects": [{"name": "drsObject"}] * 4}
+    with app.test_request_context(json=request_data):
+        with pytest.raises(BadRequest):
+            PostBulkObjects.__wrapped__()
+
+
 def test_PutObject():
     """Test for creating a new object with a user-supplied identigier."""
     app = Flask(__name__)
@@ -397,7 +692,7 @@ def test_PutObject():
 
     with app.test_request_context(json={"name": "drsObject"}):
         res = PutObject.__wrapped__("a011")
-        assert isinstance(res, str)
+        assert res == ("a011", 201)
 
 
 def test_PutObject_update():
@@ -408,11 +703,114 @@ def test_PutObject_update():
     app.config['FOCA'].db.dbs['drsStore']. \
         collections['objects'].client = mongomock.MongoClient().db.collection
     app.config['FOCA'].db.dbs['drsStore']. \
-        collections['objects'].client.insert_one(MOCK_DATA_OBJECT)
+        collections['objects'].client.insert_one(deepcopy(MOCK_DATA_OBJECT))
 
     with app.test_request_context(json={"name": "drsObject"}):
         res = PutObject.__wrapped__("a011")
-        assert isinstance(res, str)
+        assert res == ("a011", 200)
+
+
+def test_PutObject_unchanged(monkeypatch):
+    """Test that re-registering an unchanged object does not write it."""
+    app = Flask(__name__)
+    app.config['FOCA'] = \
+        Config(db=MongoConfig(**MONGO_CONFIG), endpoints=ENDPOINT_CONFIG)
+    collection = mongomock.MongoClient().db.collection
+    collection.create_index('id', unique=True)
+    app.config['FOCA'].db.dbs['drsStore']. \
+        collections['objects'].client = collection
+    data = {
+        "name": "drsObject",
+        "access_methods": [{"type": "https", "access_url": {"url": "a"}}],
+    }
+
+    with app.test_request_context(json=deepcopy(data)):
+        assert PutObject.__wrapped__("a011") == ("a011", 201)
+    with app.test_request_context():
+        res, _, headers = GetObject.__wrapped__("a011")
+
+    def replace_one(*args, **kwargs):
+        raise AssertionError("object was written")
+
+    find_one_and_replace = MagicMock(wraps=collection.find_one_and_replace)
+    monkeypatch.setattr(collection, 'replace_one', replace_one)
+    monkeypatch.setattr(
+        collection,
+        'find_one_and_replace',
+        find_one_and_replace,
+    )
+    with app.test_request_context(json=deepcopy(data)):
+        assert PutObject.__wrapped__("a011") == ("a011", 200)
+    find_one_and_replace.assert_called_once()
+    with app.test_request_context():
+        assert GetObject.__wrapped__("a011") == (res, 200, headers)
+    assert collection.count_documents({}) == 1
+    monkeypatch.undo()
+
+    data['name'] = "drsObject2"
+    with app.test_request_context(json=deepcopy(data)):
+        assert PutObject.__wrapped__("a011") == ("a011", 200)
+    with app.test_request_context():
+        assert GetObject.__wrapped__("a011")[0]['name'] == "drsObject2"
+
+
+def test_PutObject_created_concurrently(monkeypatch):
+    """Test that an object created by a concurrent request is replaced."""
+    app = Flask(__name__)
+    app.config['FOCA'] = \
+        Config(db=MongoConfig(**MONGO_CONFIG), endpoints=ENDPOINT_CONFIG)
+    collection = mongomock.MongoClient().db.collection
+    collection.create_index('id', unique=True)
+    app.config['FOCA'].db.dbs['drsStore']. \
+        collections['objects'].client = collection
+
+    with app.test_request_context(json={"name": "drsObject"}):
+        assert PutObject.__wrapped__("a011") == ("a011", 201)
+    monkeypatch.setattr(
+        collection,
+        'find_one_and_replace',
+        MagicMock(side_effect=DuplicateKeyError('')),
+    )
+    with app.test_request_context(json={"name": "drsObject2"}):
+        assert PutObject.__wrapped__("a011") == ("a011", 200)
+    with app.test_request_context():
+        assert GetObject.__wrapped__("a011")[0]['name'] == "drsObject2"
+
+
+def test_PutObject_if_match():
+    """Test for updating an object only if it matches a given entity tag."""
+    app = Flask(__name__)
+    app.config['FOCA'] = \
+        Config(db=MongoConfig(**MONGO_CONFIG), endpoints=ENDPOINT_CONFIG)
+    app.config['FOCA'].db.dbs['drsStore']. \
+        collections['objects'].client = mongomock.MongoClient().db.collection
+
+    with app.test_request_context(
+        json={"name": "drsObject"},
+        headers={'If-Match': '*'},
+    ):
+        with pytest.raises(PreconditionFailed):
+            PutObject.__wrapped__("a011")
+    with app.test_request_context(json={"name": "drsObject"}):
+        PutObject.__wrapped__("a011")
+    with app.test_request_context():
+        etag = GetObject.__wrapped__("a011")[2]['ETag']
+    with app.test_request_context(
+        json={"name": "drsObject2"},
+        headers={'If-Match': etag},
+    ):
+        PutObject.__wrapped__("a011")
+    with app.test_request_context(
+        json={"name": "drsObject3"},
+        headers={'If-Match': etag},
+    ):
+        with pytest.raises(PreconditionFailed):
+            PutObject.__wrapped__("a011")
+    with app.test_request_context():
+        res, _, headers = GetObject.__wrapped__("a011")
+        assert res['name'] == "drsObject2"
+        assert '_hash' not in res
+        assert headers['ETag'] != etag
 
 
 # GET /service-info
@@ -429,9 +827,40 @@ def test_getServiceInfo():
     app.config['FOCA'].db.dbs['drsStore'].collections['service_info'] \
         .client.insert_one(mock_resp)
 
-    with app.app_context():
-        res = getServiceInfo.__wrapped__()
+    with app.test_request_context():
+        res, code, headers = getServiceInfo.__wrapped__()
         assert res == SERVICE_INFO_CONFIG
+        assert code == 200
+        assert headers['Cache-Control'] == 'no-cache'
+        etag = headers['ETag']
+
+    with app.test_request_context(headers={'If-None-Match': etag}):
+        res, code, headers = getServiceInfo.__wrapped__()
+        assert res is None
+        assert code == 304
+        assert headers['ETag'] == etag
+
+
+# GET /service-info
+def test_getServiceInfo_cached():
+    """Test for getting cached service info."""
+    endpoint_config = deepcopy(ENDPOINT_CONFIG)
+    endpoint_config['service_info_cache'] = {'ttl': 30}
+    app = Flask(__name__)
+    app.config['FOCA'] = Config(
+        db=MongoConfig(**MONGO_CONFIG),
+        endpoints=endpoint_config,
+    )
+    db_coll = mongomock.MongoClient().db.collection
+    app.config['FOCA'].db.dbs['drsStore'].collections['service_info'] \
+        .client = db_coll
+    db_coll.insert_one(deepcopy(SERVICE_INFO_CONFIG))
+
+    with app.test_request_context():
+        res, code, headers = getServiceInfo.__wrapped__()
+        assert headers['Cache-Control'] == 'max-age=30'
+        db_coll.delete_many({})
+        assert getServiceInfo.__wrapped__()[0] == res
 
 
 # POST /service-info
@@ -447,5 +876,59 @@ def test_postServiceInfo():
 
     with app.test_request_context(json=deepcopy(SERVICE_INFO_CONFIG)):
         postServiceInfo.__wrapped__()
-        res = getServiceInfo.__wrapped__()
+        res = getServiceInfo.__wrapped__()[0]
         assert res == SERVICE_INFO_CONFIG
+
+
+def test_sqlite_storage(tmp_path):
+    """Test for registering, getting, listing and deleting objects with the
+    embedded storage backend."""
+    app = Flask(__name__)
+    app.config['FOCA'] = Config(
+        endpoints=ENDPOINT_CONFIG,
+        storage={
+            'backend': 'sqlite',
+            'sqlite': {'path': str(tmp_path / 'drs.sqlite')},
+        },
+    )
+    create_storage(app=app)
+    obj = {
+        'name': 'mock_object',
+        'access_methods': [
+            {'type': 'https', 'access_url': {'url': 'https://a.org/a'}},
+            {'type': 'https', 'access_url': {'url': 'https://b.org/b'}},
+        ],
+    }
+    with app.test_request_context(json=obj):
+        object_id = PostObject.__wrapped__()
+    with app.test_request_context(json={
+        'name': 'bundle',
+        'contents': [{'name': 'a', 'id': object_id}],
+    }):
+        PutObject.__wrapped__('b001')
+    with app.test_request_context(json=deepcopy(SERVICE_INFO_CONFIG)):
+        postServiceInfo.__wrapped__()
+    with app.test_request_context():
+        res = GetObject.__wrapped__(object_id)[0]
+        access_id = res['access_methods'][0]['access_id']
+        assert GetAccessURL.__wrapped__(object_id, access_id)[0] == \
+            {'url': 'https://a.org/a'}
+    with app.test_request_context(json={
+        'bulk_access_ids': [{'object_id': object_id}],
+        'access_type': 'https',
+    }):
+        assert GetBulkAccessURLs.__wrapped__()['resolved_access_urls'] == [{
+            'object_id': object_id,
+            'access_id': access_id,
+            'access_url': {'url': 'https://a.org/a'},
+        }]
+    with app.test_request_context():
+        assert GetObject.__wrapped__('b001')[0]['size'] == 0
+        assert len(ListObjects.__wrapped__()['drs_objects']) == 2
+        assert getServiceInfo.__wrapped__()[0] == SERVICE_INFO_CONFIG
+        DeleteAccessMethod.__wrapped__(object_id, access_id)
+        res = GetObject.__wrapped__(object_id)[0]
+        assert len(res['access_methods']) == 1
+        DeleteObject.__wrapped__(object_id)
+        with pytest.raises(ObjectNotFound):
+            GetObject.__wrapped__(object_id)
@@ -0,0 +1,167 @@
+"""Test cases for the asynchronous production server."""
+
+import asyncio
+from typing import (Any, Awaitable, Dict, Tuple)
+from unittest.mock import MagicMock
+
+from flask import Flask
+from foca.models.config import Config
+import pytest
+
+from drs_filer import asgi
+from drs_filer.asgi import (
+    ASGIApp,
+    get_options,
+)
+from drs_filer.database.sessions import TOKEN_HEADER
+from drs_filer.errors.exceptions import ObjectNotFound
+from drs_filer.metrics import (
+    get_metrics,
+    register_metrics,
+)
+
+pytest.importorskip('uvicorn')
+
+ASGI_CONFIG = {
+    'workers': 2,
+    'threads': 3,
+}
+
+
+def run_until_complete(coroutine: Awaitable) -> Any:
+    """Run coroutine to completion, as `asyncio.run()` does on Python 3.7+."""
+    return asyncio.get_event_loop().run_until_complete(coroutine)
+
+
+def create_app() -> ASGIApp:
+    """Create ASGI app wrapping a Flask app with a synchronous and an
+    asynchronous operation."""
+    app = MagicMock()
+    app.app = Flask(__name__)
+    app.app.config['FOCA'] = Config(metrics={'enabled': True})
+
+    @app.app.route('/objects/<object_id>', methods=['GET', 'DELETE'])
+    def GetObject(object_id):
+        return 'sync'
+
+    register_metrics(app=app.app)
+    return ASGIApp(app=app, threads=1)
+
+
+async def get_object(app, request, object_id) -> Tuple[Dict, int, Dict]:
+    """Asynchronous controller."""
+    if object_id == 'missing':
+        raise ObjectNotFound
+    return {'id': object_id}, 200, {'ETag': '"etag"'}
+
+
+def send_request(
+    app: ASGIApp,
+    method: str = 'GET',
+    path: str = '/objects/a001',
+    query: bytes = b'',
+    headers: Tuple = (),
+) -> Tuple[int, Dict, bytes]:
+    """Send request to ASGI app and return status, headers and body."""
+    messages = []
+
+    async def receive() -> Dict:
+        return {'type': 'http.request', 'body': b'', 'more_body': False}
+
+    async def send(message: Dict) -> None:
+        messages.append(message)
+
+    scope = {
+        'type': 'http',
+        'http_version': '1.1',
+        'method': method,
+        'path': path,
+        'query_string': query,
+        'headers': [(b'host', b'localhost')] + list(headers),
+    }
+    run_until_complete(app(scope, receive, send))
+    return (
+        messages[0]['status'],
+        {
+            name.decode().lower(): value.decode()
+            for name, value in messages[0]['headers']
+        },
+        b''.join(message.get('body', b'') for message in messages[1:]),
+    )
+
+
+def test_get_options():
+    """Test for getting server settings from app configuration."""
+    conf = Config(asgi=ASGI_CONFIG)
+    assert get_options(conf=conf) == {
+        'host': '0.0.0.0',
+        'port': 8080,
+        'workers': 2,
+    }
+
+
+def test_ASGIApp_async(monkeypatch):
+    """Test that reads are served by asynchronous controllers."""
+    monkeypatch.setitem(asgi.ASYNC_CONTROLLERS, 'GetObject', get_object)
+    app = create_app()
+    status, headers, body = send_request(app)
+    assert status == 200
+    assert headers['etag'] == '"etag"'
+    assert headers['content-type'] == 'application/json'
+    assert body == b'{\n  "id": "a001"\n}\n'
+    registry = get_metrics(app.application.app).registry
+    assert registry.get_sample_value('drs_filer_requests_total', {
+        'operation': 'GetObject', 'method': 'GET', 'status': '200',
+    }) == 1
+
+
+def test_ASGIApp_async_error(monkeypatch):
+    """Test that errors are handled by the WSGI app's error handlers."""
+    monkeypatch.setitem(asgi.ASYNC_CONTROLLERS, 'GetObject', get_object)
+    app = create_app()
+    status, __, __ = send_request(app, path='/objects/missing')
+    assert status == 404
+    registry = get_metrics(app.application.app).registry
+    assert registry.get_sample_value('drs_filer_errors_total', {
+        'operation': 'GetObject', 'status': '404', 'exception': 'Exception',
+    }) == 1
+
+
+def test_ASGIApp_sync(monkeypatch):
+    """Test that other requests are served by the WSGI app."""
+    monkeypatch.setitem(asgi.ASYNC_CONTROLLERS, 'GetObject', get_object)
+    app = create_app()
+    for kwargs in [
+        {'method': 'DELETE'},
+        {'query': b'expand=true'},
+        {'headers': [(TOKEN_HEADER.lower().encode(), b'token')]},
+    ]:
+        status, __, body = send_request(app, **kwargs)
+        assert (status, body) == (200, b'sync')
+    assert send_request(app, path='/unknown')[0] == 404
+
+
+def test_ASGIApp_lifespan(monkeypatch):
+    """Test that the asynchronous database client is created on startup and
+    closed on shutdown."""
+    create = MagicMock()
+    close = MagicMock()
+    monkeypatch.setattr(asgi, 'create_motor_client', create)
+    monkeypatch.setattr(asgi, 'close_motor_client', close)
+    app = create_app()
+    messages = [
+        {'type': 'lifespan.startup'},
+        {'type': 'lifespan.shutdown'},
+    ]
+    sent = []
+
+    async def receive() -> Dict:
+        return messages.pop(0)
+
+    async def send(message: Dict) -> None:
+        sent.append(message['type'])
+
+    run_until_complete(app({'type': 'lifespan'}, receive, send))
+    assert sent == ['lifespan.startup.complete', 'lifespan.shutdown.complete']
+    create.assert_called_once_with(app=app.application.app)
+    close.assert_called_once_with(app=app.application.app)
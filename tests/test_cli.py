@@ -0,0 +1,255 @@
+"""Test cases for the command line interface."""
+
+from io import StringIO
+import json
+from unittest.mock import MagicMock
+
+from flask import Flask
+from foca.models.config import (Config, MongoConfig)
+import mongomock
+import pytest
+
+from drs_filer import cli
+from drs_filer.cli import (
+    batched,
+    export_objects,
+    import_objects,
+    main,
+    read_objects,
+    write_objects,
+)
+from drs_filer.errors.exceptions import BundleAggregatesMismatch
+from drs_filer.ga4gh.drs.endpoints.id_generator import IdGenerator
+from drs_filer.ga4gh.drs.endpoints.register_objects import replace_object
+
+data_objects_path = "tests/data_objects.json"
+INDEX_CONFIG = {'keys': [('id', 1)]}
+COLLECTION_CONFIG = {'indexes': [INDEX_CONFIG]}
+DB_CONFIG = {'collections': {'objects': COLLECTION_CONFIG}}
+MONGO_CONFIG = {
+    'host': 'mongodb',
+    'port': 27017,
+    'dbs': {
+        'drsStore': DB_CONFIG,
+    },
+}
+ENDPOINT_CONFIG = {
+    "objects": {
+        "id_charset": 'string.digits',
+        "id_length": 6
+    },
+    "access_methods": {
+        "id_charset": 'string.digits',
+        "id_length": 6
+    },
+    "url_prefix": "http",
+    "external_host": "1.2.3.4",
+    "external_port": 8080,
+    "api_path": "ga4gh/drs/v1"
+}
+
+
+def create_app() -> Flask:
+    """Create app with mock database and unique index on object
+    identifiers."""
+    app = Flask(__name__)
+    app.config['FOCA'] = Config(
+        db=MongoConfig(**MONGO_CONFIG),
+        endpoints=ENDPOINT_CONFIG,
+    )
+    collection = mongomock.MongoClient().db.collection
+    collection.create_index('id', unique=True)
+    app.config['FOCA'].db.dbs['drsStore']. \
+        collections['objects'].client = collection
+    return app
+
+
+def test_import_export_objects():
+    """Test that exported objects can be imported again unchanged."""
+    app = create_app()
+    objects = json.loads(open(data_objects_path, "r").read())
+    stream = StringIO(
+        "\n".join(json.dumps(obj) for obj in objects) + "\n\n"
+        + json.dumps({"name": "new_object", "access_methods": [{}]})
+    )
+    with app.app_context():
+        assert import_objects(stream=stream, batch_size=4) == 12
+        output = StringIO()
+        assert export_objects(stream=output, batch_size=4) == 12
+
+    exported = [json.loads(line) for line in output.getvalue().splitlines()]
+    assert exported[0]['self_uri'] == "http://1.2.3.4:8080/ga4gh/drs/v1/a001"
+    assert exported[0]['access_methods'] == objects[0]['access_methods']
+    assert len(exported[11]['id']) == 6
+    assert len(exported[11]['access_methods'][0]['access_id']) == 6
+
+    app = create_app()
+    with app.app_context():
+        import_objects(stream=StringIO(output.getvalue()))
+        roundtrip = StringIO()
+        export_objects(stream=roundtrip)
+    assert roundtrip.getvalue() == output.getvalue()
+
+
+def test_import_objects_replace():
+    """Test that imported objects replace objects with the same
+    identifier."""
+    app = create_app()
+    with app.app_context():
+        import_objects(stream=StringIO('{"id": "a001", "name": "old"}'))
+        import_objects(stream=StringIO('{"id": "a001", "name": "new"}'))
+        output = StringIO()
+        assert export_objects(stream=output) == 1
+    assert json.loads(output.getvalue())['name'] == "new"
+
+
+def test_import_objects_bundles():
+    """Test that sizes of imported bundles are validated and updated."""
+    app = create_app()
+    collection = app.config['FOCA'].db.dbs['drsStore']. \
+        collections['objects'].client
+    child = {"id": "c001", "size": 1, "checksums": []}
+    bundle = {"id": "b001", "contents": [{"name": "c", "id": "c001"}]}
+    parent = {"id": "p001", "contents": [{"name": "b", "id": "b001"}]}
+    with app.app_context():
+        import_objects(stream=StringIO("\n".join(
+            json.dumps(obj) for obj in [bundle, child, parent]
+        )))
+        assert collection.find_one({"id": "b001"})['size'] == 1
+        assert collection.find_one({"id": "p001"})['size'] == 1
+        import_objects(stream=StringIO(json.dumps(dict(child, size=2))))
+        assert collection.find_one({"id": "b001"})['size'] == 2
+        assert collection.find_one({"id": "p001"})['size'] == 2
+        with pytest.raises(BundleAggregatesMismatch):
+            import_objects(stream=StringIO(json.dumps(dict(bundle, size=5))))
+
+
+def test_import_objects_replace_unchanged():
+    """Test that an identical object registered via the API is not written
+    again."""
+    app = create_app()
+    obj = {"name": "a", "access_methods": [{"type": "https"}]}
+    with app.app_context():
+        import_objects(stream=StringIO(json.dumps(dict(obj, id="a001"))))
+        assert replace_object(data=obj, object_id="a001") is False
+
+
+def test_write_objects_access_ids(monkeypatch):
+    """Test that added access identifiers differ from existing ones."""
+    app = create_app()
+    ids = iter(["000001", "000002", "000003"])
+    monkeypatch.setattr(
+        IdGenerator,
+        'generate',
+        lambda self, count=1: [next(ids) for __ in range(count)],
+    )
+    obj = {"id": "a001", "access_methods": [
+        {"type": "https", "access_id": "000001"},
+        {"type": "https"},
+    ]}
+    with app.app_context():
+        write_objects([obj])
+    assert [
+        method['access_id'] for method in obj['access_methods']
+    ] == ["000001", "000002"]
+
+
+def test_write_objects_prepared(monkeypatch):
+    """Test that objects are prepared by the public registration helpers."""
+    app = create_app()
+    prepare = MagicMock(wraps=cli.prepare_objects)
+    set_id = MagicMock(wraps=cli.set_object_id)
+    monkeypatch.setattr(cli, 'prepare_objects', prepare)
+    monkeypatch.setattr(cli, 'set_object_id', set_id)
+    objects = [{"id": "a001"}, {"name": "b"}]
+    with app.app_context():
+        write_objects(objects)
+    prepare.assert_called_once_with(objects=objects)
+    assert set_id.call_count == 2
+    assert all('_register_hash' in obj for obj in objects)
+
+
+def test_write_objects_duplicate_id(monkeypatch):
+    """Test that only objects with colliding identifiers are retried."""
+    app = create_app()
+    app.config['FOCA'].db.dbs['drsStore'].collections['objects']. \
+        client.insert_one({"id": "000000"})
+    ids = iter(["000000", "000002", "000001"])
+    monkeypatch.setattr(
+        IdGenerator,
+        'generate',
+        lambda self, count=1: [next(ids) for __ in range(count)],
+    )
+    objects = [{"name": "first"}, {"name": "second"}, {"id": "a001"}]
+    with app.app_context():
+        write_objects(objects)
+    assert [obj['id'] for obj in objects] == ["000001", "000002", "a001"]
+
+
+def test_write_objects_exceed_retries(monkeypatch):
+    """Test for writing objects; exceed retries for generating unique
+    identifiers."""
+    app = create_app()
+    app.config['FOCA'].db.dbs['drsStore'].collections['objects']. \
+        client.insert_one({"id": "000000"})
+    monkeypatch.setattr(
+        IdGenerator,
+        'generate',
+        lambda self, count=1: ["000000"] * count,
+    )
+    with app.app_context():
+        with pytest.raises(RuntimeError):
+            write_objects([{"name": "first"}, {"name": "second"}], retries=2)
+
+
+def test_read_objects_invalid():
+    """Test for reading invalid newline-delimited JSON."""
+    with pytest.raises(ValueError):
+        list(read_objects(StringIO('{"id": "a001"}\n[]')))
+    with pytest.raises(ValueError):
+        list(read_objects(StringIO('{"id": "a001"')))
+
+
+def test_batched():
+    """Test for 'batched()'."""
+    assert list(batched(range(5), size=2)) == [[0, 1], [2, 3], [4]]
+
+
+def test_main_import(monkeypatch, tmp_path):
+    """Test for running import via the command line interface."""
+    app = create_app()
+    monkeypatch.setattr(
+        'drs_filer.cli.create_app',
+        MagicMock(return_value=app),
+    )
+    input_path = tmp_path / "objects.ndjson"
+    input_path.write_text('{"id": "a001"}\n')
+    main(['import', str(input_path)])
+    assert app.config['FOCA'].db.dbs['drsStore']. \
+        collections['objects'].client.count_documents({}) == 1
+
+
+def test_main_import_invalid(monkeypatch, tmp_path):
+    """Test that the command line interface exits with an error for invalid
+    input."""
+    monkeypatch.setattr(
+        'drs_filer.cli.create_app',
+        MagicMock(return_value=create_app()),
+    )
+    input_path = tmp_path / "objects.ndjson"
+    input_path.write_text('invalid\n')
+    with pytest.raises(SystemExit):
+        main(['import', str(input_path)])
+
+
+def test_main_storage_unsupported(monkeypatch, tmp_path):
+    """Test that the command line interface exits with an error for storage
+    backends other than MongoDB."""
+    app = create_app()
+    app.config['FOCA'].storage = {'backend': 'sqlite'}
+    monkeypatch.setattr(
+        'drs_filer.cli.create_app',
+        MagicMock(return_value=app),
+    )
+    with pytest.raises(SystemExit):
+        main(['export', str(tmp_path / "objects.ndjson")])
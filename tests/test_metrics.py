@@ -0,0 +1,171 @@
+"""Test cases for metrics."""
+
+import os
+from types import SimpleNamespace
+
+from flask import Flask
+from foca.models.config import Config
+from prometheus_client import values
+from werkzeug.exceptions import NotFound
+
+from drs_filer.database.mongo_client import PoolWaitMonitor
+from drs_filer.errors.exceptions import ObjectNotFound
+from drs_filer.ga4gh.drs.endpoints.object_cache import get_object_cache
+from drs_filer.metrics import (
+    clear_metrics,
+    CommandTimer,
+    get_metrics,
+    Metrics,
+    MULTIPROCESS_DIR_VARIABLE,
+    register_metrics,
+)
+
+METRICS_CONFIG = {
+    'enabled': True,
+    'path': '/metrics',
+    'buckets': [0.1, 1],
+}
+
+
+def create_app(metrics_config=METRICS_CONFIG) -> Flask:
+    """Create app with metrics and an operation that raises exceptions."""
+    app = Flask(__name__)
+    app.config['FOCA'] = Config(metrics=metrics_config)
+
+    @app.route('/objects/<object_id>')
+    def GetObject(object_id):
+        if object_id == 'missing':
+            raise NotFound
+        if object_id == 'unknown':
+            raise ObjectNotFound
+        return object_id
+
+    register_metrics(app=app)
+    return app
+
+
+def test_command_timer():
+    """Test recording of database command durations."""
+    metrics = Metrics()
+    listener = metrics.command_listener
+    assert isinstance(listener, CommandTimer)
+    listener.succeeded(SimpleNamespace(command_name='find', duration_micros=5))
+    listener.failed(SimpleNamespace(command_name='insert', duration_micros=7))
+    registry = metrics.registry
+    assert registry.get_sample_value(
+        'drs_filer_db_command_failures_total', {'command': 'insert'},
+    ) == 1
+    assert registry.get_sample_value(
+        'drs_filer_db_command_failures_total', {'command': 'find'},
+    ) is None
+    for command in ('find', 'insert'):
+        assert registry.get_sample_value(
+            'drs_filer_db_command_duration_seconds_count',
+            {'command': command},
+        ) == 1
+
+
+def test_register_metrics_disabled():
+    """Test that no metrics are collected if disabled."""
+    app = create_app(metrics_config={'enabled': False})
+    assert get_metrics(app) is None
+    assert app.test_client().get('/metrics').status_code == 404
+
+
+def test_register_metrics():
+    """Test request metrics and their exposition."""
+    app = create_app()
+    client = app.test_client()
+    assert client.get('/objects/a001').status_code == 200
+    assert client.get('/objects/missing').status_code == 404
+    assert client.get('/objects/unknown').status_code == 404
+
+    registry = get_metrics(app).registry
+    for status, count in (('200', 1), ('404', 2)):
+        assert registry.get_sample_value('drs_filer_requests_total', {
+            'operation': 'GetObject', 'method': 'GET', 'status': status,
+        }) == count
+    for exception in ('NotFound', 'Exception'):
+        assert registry.get_sample_value('drs_filer_errors_total', {
+            'operation': 'GetObject', 'status': '404', 'exception': exception,
+        }) == 1
+
+    response = client.get('/metrics')
+    assert response.status_code == 200
+    assert response.content_type.startswith('text/plain; version=0.0.4')
+    text = response.get_data(as_text=True)
+    assert '# TYPE drs_filer_request_duration_seconds histogram' in text
+    assert (
+        'drs_filer_request_duration_seconds_count{operation="GetObject"} 3.0'
+        in text
+    )
+    assert (
+        'drs_filer_request_duration_seconds_bucket{le="+Inf",'
+        'operation="GetObject"} 3.0' in text
+    )
+    assert 'drs_filer_cache_hit_ratio{cache="objects"}' not in text
+
+
+def test_metrics_update():
+    """Test that cache and connection pool statistics are exposed."""
+    app = create_app()
+    pool = app.extensions['drs_filer_pool_monitor'] = PoolWaitMonitor()
+    pool.checkouts = 3
+    pool.wait_total = 0.5
+    pool.connections = 2
+    with app.app_context():
+        cache = get_object_cache()
+        cache.hits = 3
+        cache.misses = 1
+    text = app.test_client().get('/metrics').get_data(as_text=True)
+    assert '# TYPE drs_filer_cache_requests_total counter' in text
+    assert (
+        'drs_filer_cache_requests_total{cache="objects",result="hit"} 3.0'
+        in text
+    )
+    assert 'drs_filer_cache_hit_ratio{cache="objects"} 0.75' in text
+    with app.app_context():
+        cache.hits = 4
+    text = app.test_client().get('/metrics').get_data(as_text=True)
+    assert (
+        'drs_filer_cache_requests_total{cache="objects",result="hit"} 4.0'
+        in text
+    )
+    assert '# TYPE drs_filer_db_pool_checkouts_total counter' in text
+    assert 'drs_filer_db_pool_checkouts_total{result="success"} 3.0' in text
+    assert 'drs_filer_db_pool_wait_seconds_total 0.5' in text
+    assert 'drs_filer_db_pool_connections 2.0' in text
+
+
+def test_register_metrics_multiprocess(monkeypatch, tmpdir):
+    """Test that metrics are reported for all worker processes."""
+    directory = str(tmpdir.join('metrics'))
+    monkeypatch.setenv(MULTIPROCESS_DIR_VARIABLE, directory)
+    monkeypatch.setattr(values, 'ValueClass', values.MultiProcessValue())
+    clear_metrics()
+    app = create_app()
+    client = app.test_client()
+    pid = os.fork()
+    if pid == 0:
+        try:
+            client.get('/objects/a001')
+            get_metrics(app).close()
+        finally:
+            os._exit(0)
+    os.waitpid(pid, 0)
+    assert client.get('/objects/a001').status_code == 200
+    text = client.get('/metrics').get_data(as_text=True)
+    assert (
+        'drs_filer_request_duration_seconds_count{operation="GetObject"} 2.0'
+        in text
+    )
+
+    clear_metrics()
+    assert os.listdir(directory) == []
+
+
+def test_clear_metrics_per_process(monkeypatch):
+    """Test that nothing is removed if metrics are kept per process."""
+    monkeypatch.delenv(MULTIPROCESS_DIR_VARIABLE, raising=False)
+    clear_metrics()
+    assert not Metrics().multiprocess
@@ -0,0 +1,104 @@
+"""Test cases for serialization and validation of responses."""
+
+from datetime import date
+
+from connexion.apis.flask_api import FlaskApi
+from connexion.apps.flask_app import FlaskJSONEncoder
+from connexion.decorators.response import ResponseValidator
+from connexion.jsonifier import Jsonifier
+from connexion.operations.abstract import VALIDATOR_MAP
+from flask import Flask
+from foca.models.config import Config
+import pytest
+
+from drs_filer.serialization import (
+    get_validation_sample_rate,
+    register_json_library,
+    register_response_validator,
+    SampledResponseValidator,
+    StdlibJSON,
+)
+import drs_filer.serialization
+
+RESPONSES_CONFIG = {
+    'json_library': 'orjson',
+    'validation_sample_rates': {
+        'development': 1,
+        'production': 0,
+    },
+}
+
+
+def create_app(environment: str = 'development') -> Flask:
+    """Create app with response configuration."""
+    app = Flask(__name__)
+    app.json_encoder = FlaskJSONEncoder
+    app.config['FOCA'] = Config(responses=RESPONSES_CONFIG)
+    app.config['FOCA'].server.environment = environment
+    return app
+
+
+@pytest.fixture
+def jsonifier():
+    """Restore JSON library after test."""
+    original = FlaskApi.jsonifier
+    yield
+    FlaskApi.jsonifier = original
+
+
+def test_register_json_library(jsonifier, monkeypatch):
+    """Test that the standard library is used if `orjson` is missing."""
+    monkeypatch.setattr(drs_filer.serialization, 'orjson', None)
+    app = create_app()
+    assert register_json_library(app=app) == 'json'
+    assert isinstance(FlaskApi.jsonifier, Jsonifier)
+    assert FlaskApi.jsonifier.json is StdlibJSON
+
+
+def test_register_json_library_unknown(jsonifier):
+    """Test that unknown JSON libraries are rejected."""
+    app = create_app()
+    app.config['FOCA'].responses = {'json_library': 'unknown'}
+    with pytest.raises(ValueError):
+        register_json_library(app=app)
+
+
+def test_stdlib_json():
+    """Test compact serialization with the app's JSON encoder."""
+    app = create_app()
+    with app.app_context():
+        data = StdlibJSON.dumps({'a': [1, 2], 'b': date(2020, 1, 1)})
+        assert data == '{"a":[1,2],"b":"2020-01-01"}'
+        assert StdlibJSON.loads(data) == {'a': [1, 2], 'b': '2020-01-01'}
+
+
+def test_get_validation_sample_rate():
+    """Test sample rates per environment."""
+    with create_app(environment='production').app_context():
+        assert get_validation_sample_rate() == 0
+    with create_app(environment='testing').app_context():
+        assert get_validation_sample_rate() == 1
+
+
+def test_sampled_response_validator(monkeypatch):
+    """Test that responses are only validated if sampled."""
+    calls = []
+    monkeypatch.setattr(
+        ResponseValidator,
+        'validate_response',
+        lambda self, *args: calls.append(args) or True,
+    )
+    validator = SampledResponseValidator(None, 'application/json')
+    with create_app(environment='production').app_context():
+        assert validator.validate_response('{}', 200, {}, '/')
+        assert not calls
+    with create_app(environment='development').app_context():
+        assert validator.validate_response('{}', 200, {}, '/')
+        assert calls == [('{}', 200, {}, '/')]
+
+
+def test_register_response_validator(monkeypatch):
+    """Test that the sampling validator is used for new APIs."""
+    monkeypatch.setitem(VALIDATOR_MAP, 'response', ResponseValidator)
+    register_response_validator()
+    assert VALIDATOR_MAP['response'] is SampledResponseValidator
@@ -0,0 +1,113 @@
+"""Test cases for tracing."""
+
+from types import SimpleNamespace
+
+from flask import Flask
+from foca.models.config import Config
+import pytest
+
+from drs_filer.tracing import (
+    get_tracing,
+    register_tracing,
+    set_span_attributes,
+    start_span,
+    traced,
+)
+
+TRACING_CONFIG = {
+    'enabled': True,
+    'service_name': 'drs-filer-test',
+    'exporter': 'memory',
+}
+
+
+def create_app(tracing_config=TRACING_CONFIG) -> Flask:
+    """Create app with tracing and a traced operation."""
+    app = Flask(__name__)
+    app.config['FOCA'] = Config(tracing=tracing_config)
+
+    @app.route('/objects/<object_id>')
+    @traced
+    def GetObject(object_id):
+        set_span_attributes({'drs.cache_hit': False})
+        with start_span('lookup'):
+            pass
+        return object_id
+
+    register_tracing(app=app)
+    return app
+
+
+def command_event(**kwargs) -> SimpleNamespace:
+    """Create database command event."""
+    event = {
+        'command_name': 'find',
+        'command': {'find': 'objects'},
+        'database_name': 'drsStore',
+        'request_id': 1,
+        'connection_id': ('localhost', 27017),
+    }
+    event.update(kwargs)
+    return SimpleNamespace(**event)
+
+
+def test_register_tracing_disabled():
+    """Test that requests are not traced if disabled."""
+    app = create_app(tracing_config={'enabled': False})
+    assert get_tracing(app) is None
+    assert app.test_client().get('/objects/a001').status_code == 200
+
+
+def test_register_tracing_unknown_exporter():
+    """Test that unknown span exporters are rejected."""
+    with pytest.raises(ValueError):
+        create_app(tracing_config={'enabled': True, 'exporter': 'unknown'})
+
+
+def test_register_tracing():
+    """Test spans of requests and controllers and their attributes."""
+    app = create_app()
+    assert app.test_client().get('/objects/a001').status_code == 200
+    spans = {
+        span.name: span
+        for span in get_tracing(app).exporter.get_finished_spans()
+    }
+    assert set(spans) == {'GET /objects/<object_id>', 'GetObject', 'lookup'}
+    request_span = spans['GET /objects/<object_id>']
+    assert request_span.parent is None
+    assert request_span.attributes['http.status_code'] == 200
+    assert request_span.attributes['drs.operation'] == 'GetObject'
+    assert request_span.resource.attributes['service.name'] == (
+        'drs-filer-test'
+    )
+    controller_span = spans['GetObject']
+    assert controller_span.parent.span_id == request_span.context.span_id
+    assert controller_span.attributes['drs.object_id'] == 'a001'
+    assert controller_span.attributes['drs.cache_hit'] is False
+    assert spans['lookup'].parent.span_id == controller_span.context.span_id
+
+
+def test_command_tracer():
+    """Test that database commands are traced in child spans."""
+    app = create_app()
+    tracing = get_tracing(app)
+    listener = tracing.command_listener
+    with app.app_context(), start_span('parent'):
+        listener.started(command_event())
+        listener.succeeded(command_event())
+        listener.started(command_event(request_id=2))
+        listener.failed(command_event(request_id=2, failure='error'))
+    spans = tracing.exporter.get_finished_spans()
+    assert [span.name for span in spans] == [
+        'mongodb.find', 'mongodb.find', 'parent',
+    ]
+    assert spans[0].parent.span_id == spans[2].context.span_id
+    assert spans[0].attributes['db.mongodb.collection'] == 'objects'
+    assert spans[0].status.is_ok
+    assert not spans[1].status.is_ok
+
+
+def test_start_span_outside_app_context():
+    """Test that spans are not started outside an app context."""
+    with start_span('span'):
+        set_span_attributes({'key': 'value'})
@@ -0,0 +1,91 @@
+"""Test cases for traffic logging."""
+
+import json
+from typing import (Dict, List)
+
+from flask import Flask
+from foca.models.config import Config
+
+from drs_filer.traffic_logging import (
+    get_traffic_logger,
+    log_traffic,
+    register_traffic_logging,
+    TrafficLogger,
+)
+
+TRAFFIC_CONFIG = {
+    'enabled': True,
+    'sample_rate': 1,
+    'payloads': False,
+    'max_payload_length': 10,
+}
+
+
+def create_app(**kwargs) -> Flask:
+    """Create app with traffic logging and a logged operation."""
+    app = Flask(__name__)
+    app.config['FOCA'] = Config(
+        traffic_logging=dict(TRAFFIC_CONFIG, **kwargs),
+    )
+
+    @app.route('/objects/<object_id>', methods=['GET', 'PUT'])
+    @log_traffic
+    def GetObject(object_id):
+        if object_id == 'missing':
+            return {'msg': 'not found'}, 404
+        return {'id': object_id, 'name': 'a' * 20}, 200
+
+    register_traffic_logging(app=app)
+    return app
+
+
+def read_entries(app: Flask, capsys) -> List[Dict]:
+    """Wait for log records to be written and parse them."""
+    get_traffic_logger(app).stop()
+    return [json.loads(line) for line in capsys.readouterr().err.splitlines()]
+
+
+def test_register_traffic_logging_disabled():
+    """Test that traffic logging can be disabled."""
+    app = create_app(enabled=False)
+    assert get_traffic_logger(app) is None
+
+
+def test_register_traffic_logging(capsys):
+    """Test that a summary line is logged per request."""
+    app = create_app()
+    app.test_client().get('/objects/a001')
+    entries = read_entries(app, capsys)
+    assert len(entries) == 1
+    entry = entries[0]
+    assert entry['operation'] == 'GetObject'
+    assert entry['object_id'] == 'a001'
+    assert entry['status'] == 200
+    assert entry['duration_ms'] >= 0
+    assert 'response' not in entry
+
+
+def test_register_traffic_logging_sampled(capsys):
+    """Test that only errors are logged if no requests are sampled."""
+    app = create_app(sample_rate=0)
+    client = app.test_client()
+    client.get('/objects/a001')
+    client.get('/objects/missing')
+    entries = read_entries(app, capsys)
+    assert [entry['status'] for entry in entries] == [404]
+
+
+def test_register_traffic_logging_payloads(capsys):
+    """Test that payloads are logged and truncated."""
+    app = create_app(payloads=True)
+    app.test_client().put('/objects/a001', json={'name': 'b' * 20})
+    entry = read_entries(app, capsys)[0]
+    assert entry['request'] == '{"name": "... [truncated]'
+    assert entry['response'] == '{"id": "a0... [truncated]'
+
+
+def test_truncate():
+    """Test serialization and truncation of payloads."""
+    traffic = TrafficLogger(max_payload_length=5)
+    assert traffic.truncate('abc') == 'abc'
+    assert traffic.truncate([1, 2, 3]) == '[1, 2... [truncated]'
@@ -0,0 +1,143 @@
+"""Test cases for validation of requests."""
+
+from connexion.decorators.validation import RequestBodyValidator
+from connexion.exceptions import BadRequestProblem
+from connexion.operations.abstract import VALIDATOR_MAP
+from jsonschema import draft4_format_checker
+import pytest
+
+from drs_filer.validation import (
+    CompiledRequestBodyValidator,
+    get_compiled_validator,
+    register_request_validator,
+    to_acyclic_schema,
+)
+import drs_filer.validation
+
+
+def create_recursive_schema():
+    """Create schema with a cycle, as resolved by connexion."""
+    properties = {'name': {'type': 'string'}}
+    schema = {
+        'type': 'object',
+        'required': ['name'],
+        'additionalProperties': False,
+        'properties': properties,
+    }
+    properties['contents'] = {'type': 'array', 'items': schema}
+    return schema
+
+
+def test_to_acyclic_schema():
+    """Test that cycles are replaced with references."""
+    acyclic = to_acyclic_schema(create_recursive_schema())
+    assert acyclic['allOf'] == [{'$ref': '#/definitions/schema0'}]
+    definition = acyclic['definitions']['schema0']
+    assert definition['properties']['contents']['items'] == {
+        '$ref': '#/definitions/schema0',
+    }
+
+
+def test_to_acyclic_schema_shared_properties():
+    """Test that only subschemas are replaced with references."""
+    properties = {'name': {'type': 'string'}}
+    schema = {
+        'allOf': [
+            {'properties': properties, 'required': ['name']},
+            {'properties': properties},
+        ],
+    }
+    acyclic = to_acyclic_schema(schema)
+    first, second = acyclic['allOf'][0]['allOf']
+    assert first['properties'] == {'name': {'$ref': '#/definitions/schema0'}}
+    assert second['properties'] == first['properties']
+    assert acyclic['definitions'] == {'schema0': {'type': 'string'}}
+
+
+def test_to_acyclic_schema_without_cycles():
+    """Test that schemas without repeated subschemas are unchanged."""
+    schema = {'type': 'object', 'properties': {'a': {'type': 'string'}}}
+    assert to_acyclic_schema(schema) == schema
+
+
+def test_get_compiled_validator():
+    """Test that validators are compiled once per schema."""
+    pytest.importorskip('fastjsonschema')
+    validator = get_compiled_validator(create_recursive_schema())
+    assert validator is get_compiled_validator(create_recursive_schema())
+    validator({'name': 'a', 'contents': [{'name': 'b', 'contents': []}]})
+
+
+def test_get_compiled_validator_draft4():
+    """Test that schemas are compiled for JSON Schema draft 4."""
+    fastjsonschema = pytest.importorskip('fastjsonschema')
+    validator = get_compiled_validator({
+        'type': 'integer', 'minimum': 0, 'exclusiveMinimum': True,
+    })
+    validator(1)
+    with pytest.raises(fastjsonschema.JsonSchemaValueException):
+        validator(0)
+
+
+def test_get_compiled_validator_formats():
+    """Test that formats are checked like connexion does."""
+    fastjsonschema = pytest.importorskip('fastjsonschema')
+    validator = get_compiled_validator({
+        'type': 'string', 'format': 'date-time',
+    })
+    for value in ('2020-01-01T00:00:00Z', 'yesterday'):
+        try:
+            validator(value)
+        except fastjsonschema.JsonSchemaValueException:
+            assert not draft4_format_checker.conforms(value, 'date-time')
+        else:
+            assert draft4_format_checker.conforms(value, 'date-time')
+    validator = get_compiled_validator({'type': 'string', 'format': 'int64'})
+    validator('not a number')
+
+
+def test_get_compiled_validator_unsupported():
+    """Test that schemas with unsupported keywords are not compiled."""
+    schema = {'type': 'string', 'nullable': True}
+    assert get_compiled_validator(schema) is None
+
+
+def test_get_compiled_validator_not_installed(monkeypatch):
+    """Test that nothing is compiled if `fastjsonschema` is missing."""
+    monkeypatch.setattr(drs_filer.validation, 'fastjsonschema', None)
+    assert get_compiled_validator(create_recursive_schema()) is None
+
+
+def test_compiled_request_body_validator():
+    """Test validation of request bodies with compiled validator."""
+    pytest.importorskip('fastjsonschema')
+    validator = CompiledRequestBodyValidator(
+        create_recursive_schema(),
+        ['application/json'],
+        None,
+    )
+    assert validator.compiled is not None
+    assert validator.validate_schema({'name': 'a'}, '/') is None
+    with pytest.raises(BadRequestProblem):
+        validator.validate_schema({'name': 'a', 'contents': [{}]}, '/')
+
+
+def test_compiled_request_body_validator_fallback(monkeypatch):
+    """Test fallback to connexion's validator."""
+    monkeypatch.setattr(drs_filer.validation, 'fastjsonschema', None)
+    validator = CompiledRequestBodyValidator(
+        create_recursive_schema(),
+        ['application/json'],
+        None,
+    )
+    assert validator.compiled is None
+    assert validator.validate_schema({'name': 'a'}, '/') is None
+    with pytest.raises(BadRequestProblem):
+        validator.validate_schema({'name': 1}, '/')
+
+
+def test_register_request_validator(monkeypatch):
+    """Test that the compiled validator is used for new APIs."""
+    monkeypatch.setitem(VALIDATOR_MAP, 'body', RequestBodyValidator)
+    register_request_validator()
+    assert VALIDATOR_MAP['body'] is CompiledRequestBodyValidator
@@ -0,0 +1,76 @@
+"""Test cases for the production server."""
+
+from unittest.mock import MagicMock
+
+from flask import Flask
+from foca.models.config import (Config, MongoConfig)
+
+from drs_filer.wsgi import (
+    get_options,
+    post_fork,
+    worker_exit,
+    WSGIServer,
+)
+
+MONGO_CONFIG = {
+    'host': 'mongodb',
+    'port': 27017,
+    'dbs': {
+        'drsStore': {'collections': {'objects': {'indexes': []}}},
+    },
+}
+WSGI_CONFIG = {
+    'workers': 2,
+    'threads': 3,
+    'graceful_timeout': 10,
+}
+
+
+def create_app(**kwargs) -> MagicMock:
+    """Create mock Connexion app wrapping a Flask app."""
+    app = MagicMock()
+    app.app = Flask(__name__)
+    app.app.config['FOCA'] = Config(db=MongoConfig(**MONGO_CONFIG), **kwargs)
+    return app
+
+
+def test_get_options():
+    """Test for getting server settings from app configuration."""
+    app = create_app(wsgi=WSGI_CONFIG)
+    assert get_options(app=app) == {
+        'bind': '0.0.0.0:8080',
+        'workers': 2,
+        'threads': 3,
+        'graceful_timeout': 10,
+    }
+
+
+def test_get_options_not_configured():
+    """Test for getting server settings without `wsgi` section."""
+    assert get_options(app=create_app()) == {'bind': '0.0.0.0:8080'}
+
+
+def test_WSGIServer():
+    """Test that settings and hooks are applied and the app is preloaded."""
+    app = create_app()
+    options = dict(WSGI_CONFIG, unknown_setting=True)
+    server = WSGIServer(app=app, options=options)
+    assert server.cfg.workers == 2
+    assert server.cfg.threads == 3
+    assert server.cfg.graceful_timeout == 10
+    assert server.cfg.preload_app is True
+    assert server.cfg.post_fork is post_fork
+    assert server.load() is app.app
+
+
+def test_post_fork_worker_exit():
+    """Test that workers open and close their own database client."""
+    app = create_app()
+    worker = MagicMock()
+    worker.app.application = app
+    post_fork(server=MagicMock(), worker=worker)
+    client = app.app.extensions['drs_filer_mongo_client']
+    assert app.app.config['FOCA'].db.dbs['drsStore'].collections['objects']. \
+        client.database.client is client
+    worker_exit(server=MagicMock(), worker=worker)
+    assert 'drs_filer_mongo_client' not in app.app.extensions